@@ -120,7 +120,7 @@ class AsyncBotDemo:
         logger.info("")
         logger.info("🔢 ОСНОВНЫЕ МЕТРИКИ:")
         logger.info(f"  📈 Торговых пар: {status['total_pairs']}")
-        logger.info(f"  ⚙️ Активных задач: {status['total_tasks']}")
+        logger.info(f"  ⚙️ Пар/таймфреймов в анализе: {status['pair_timeframes']}")
         logger.info(f"  🔍 Всего анализов: {status['total_analyses']}")
         logger.info(f"  🎯 Найдено сигналов: {status['total_signals']}")
         logger.info("")
@@ -24,7 +24,8 @@ from src.data.ws_client import (
     MexcWebSocketClient, 
     WSMessage, 
     SubscriptionType,
-    create_websocket_client
+    create_websocket_client,
+    run_with_uvloop
 )
 from src.data.pairs_fetcher import get_pairs_fetcher
 from src.signals.detector import VolumeSpikeDetector
@@ -331,7 +332,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run_with_uvloop(main())
     except KeyboardInterrupt:
         logger.info("👋 До свидания!")
     except Exception as e:
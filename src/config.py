@@ -29,6 +29,9 @@ TIMEFRAMES = [
 # Настройки для получения данных
 MEXC_API_BASE_URL = "https://contract.mexc.com/api/v1"
 KLINE_LIMIT = 50  # Количество свечей для анализа
+MEXC_API_RATE_LIMIT = 10   # Лимит публичных запросов к API (запросов в секунду, 20 за 2 секунды)
+MEXC_API_RATE_BURST = 20   # Допустимый всплеск запросов сверх среднего лимита
+MEXC_API_MAX_INFLIGHT = 10  # Максимум одновременных REST-запросов в асинхронном анализе
 
 # Настройки для фетчера торговых пар
 PAIRS_FETCHER_CONFIG = {
@@ -85,6 +88,8 @@ LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DATABASE_CONFIG = {
     "type": "sqlite",  # sqlite или postgresql
     "path": "signals_history.db",  # Путь к SQLite файлу
+    "read_mmap_size": 536870912,   # mmap для read-only подключения истории/аналитики (512 МБ)
+    "wal_autocheckpoint": 1000,    # Автоматический checkpoint WAL каждые N страниц
     # Для PostgreSQL (если нужно в будущем):
     # "host": os.getenv("DB_HOST", "localhost"),
     # "port": os.getenv("DB_PORT", 5432),
@@ -96,8 +101,11 @@ DATABASE_CONFIG = {
 # Настройки write-back кэша для сигналов
 CACHE_CONFIG = {
     "buffer_size": 100,      # Максимальный размер буфера перед сбросом в БД
-    "flush_interval": 300,   # Интервал принудительного сброса в секундах (5 минут)
+    "flush_interval": 300,   # Максимальный интервал сброса в секундах (5 минут)
+    "min_flush_interval": 0.5,  # Минимальный интервал адаптивного сброса при высоком темпе сигналов
     "batch_size": 50,        # Размер пакета для записи в БД
+    "checkpoint_every": 20,  # PRAGMA wal_checkpoint(TRUNCATE) каждые N сбросов из потока сброса
+    "dedup_window": 1000,    # Сколько последних ключей сигналов помнить для отсева дубликатов
     "enable_cache": True     # Включение/выключение кэширования
 }
 
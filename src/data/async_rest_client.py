@@ -6,14 +6,15 @@
 import aiohttp
 import asyncio
 import logging
-from typing import List, Dict, Optional, Union, Tuple
+from typing import List, Dict, Optional, Union, Tuple, Sequence
 from dataclasses import dataclass
 from src.config import MEXC_API_BASE_URL
+from src.utils import fast_json
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestResult:
     """Результат асинхронного запроса"""
     success: bool
@@ -37,8 +38,8 @@ class AsyncMexcRestClient:
     """
     
     def __init__(self, 
-                 max_connections: int = 100,
-                 max_connections_per_host: int = 30,
+                 max_connections: int = 256,
+                 max_connections_per_host: int = 64,
                  request_timeout: int = 10,
                  max_retries: int = 3):
         """
@@ -54,13 +55,24 @@ class AsyncMexcRestClient:
         self.request_timeout = request_timeout
         self.max_retries = max_retries
         
-        # Настройка коннектора с пулом соединений
-        self.connector = aiohttp.TCPConnector(
+        # Настройки коннектора с пулом соединений. Сам коннектор создаётся вместе
+        # с сессией внутри работающего цикла событий (см. _ensure_session)
+        self._connector_settings = dict(
             limit=max_connections,
             limit_per_host=max_connections_per_host,
             ttl_dns_cache=300,
             use_dns_cache=True,
+            # Держим соединения дольше стандартных 15с, чтобы циклы опроса
+            # не повторяли TCP+TLS рукопожатие на каждой итерации
+            keepalive_timeout=90,
+            force_close=False,
+            enable_cleanup_closed=True,
         )
+        self.connector: Optional[aiohttp.TCPConnector] = None
+        
+        # Запросы сверх лимита соединений на хост ждут на семафоре, а не в очереди коннектора
+        self.max_connections_per_host = max_connections_per_host
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
         
         # Таймауты
         self.timeout = aiohttp.ClientTimeout(
@@ -69,7 +81,7 @@ class AsyncMexcRestClient:
             sock_read=request_timeout
         )
         
-        # Сессия будет создана при первом использовании
+        # Сессия будет создана при первом использовании (или в open)
         self._session: Optional[aiohttp.ClientSession] = None
         self._closed = False
         
@@ -84,11 +96,15 @@ class AsyncMexcRestClient:
                 'Accept': 'application/json'
             }
             
+            # Новые коннектор и семафор на каждую сессию: закрытие сессии закрывает
+            # её коннектор, а новая сессия может работать уже в другом цикле событий
+            self.connector = aiohttp.TCPConnector(**self._connector_settings)
             self._session = aiohttp.ClientSession(
                 connector=self.connector,
                 timeout=self.timeout,
                 headers=headers
             )
+            self._request_semaphore = asyncio.Semaphore(self.max_connections_per_host)
             logger.debug("Создана новая aiohttp сессия")
     
     async def _make_request(self, url: str, params: Dict = None) -> RequestResult:
@@ -106,21 +122,26 @@ class AsyncMexcRestClient:
         
         for attempt in range(self.max_retries + 1):
             try:
-                async with self._session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return RequestResult(success=True, data=data)
-                    elif response.status == 429:
-                        # Rate limit - ждем и повторяем
-                        wait_time = min(2 ** attempt, 10)
-                        logger.warning(f"Rate limit, ждем {wait_time}s (попытка {attempt + 1})")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    else:
-                        error_msg = f"HTTP {response.status}: {await response.text()}"
-                        if attempt == self.max_retries:
-                            return RequestResult(success=False, error=error_msg)
-                        logger.warning(f"HTTP ошибка {response.status}, повтор {attempt + 1}")
+                async with self._request_semaphore:
+                    async with self._session.get(url, params=params) as response:
+                        status = response.status
+                        if status == 200:
+                            # Разбор прямо из байтов: без декодирования тела в str
+                            data = fast_json.loads(await response.read())
+                            return RequestResult(success=True, data=data)
+                        if status != 429:
+                            error_msg = f"HTTP {status}: {await response.text()}"
+                
+                if status == 429:
+                    # Rate limit - ждем (не занимая слот семафора) и повторяем
+                    wait_time = min(2 ** attempt, 10)
+                    logger.warning(f"Rate limit, ждем {wait_time}s (попытка {attempt + 1})")
+                    await asyncio.sleep(wait_time)
+                    continue
+                
+                if attempt == self.max_retries:
+                    return RequestResult(success=False, error=error_msg)
+                logger.warning(f"HTTP ошибка {status}, повтор {attempt + 1}")
                         
             except asyncio.TimeoutError:
                 error_msg = f"Таймаут запроса после {self.request_timeout}s"
@@ -163,7 +184,7 @@ class AsyncMexcRestClient:
                 'limit': limit
             }
             
-            logger.debug(f"📊 Асинхронный запрос: {pair} ({interval}, {limit} свечей)")
+            logger.debug("📊 Асинхронный запрос: %s (%s, %s свечей)", pair, interval, limit)
             
             result = await self._make_request(url, params)
             
@@ -180,26 +201,53 @@ class AsyncMexcRestClient:
             raw_data = data['data']
             klines = []
             
-            if 'time' in raw_data and len(raw_data['time']) > 0:
-                count = len(raw_data['time'])
-                for i in range(count):
-                    kline = {
-                        't': raw_data['time'][i] * 1000,  # В миллисекундах
-                        'o': raw_data['open'][i],
-                        'h': raw_data['high'][i],
-                        'l': raw_data['low'][i],
-                        'c': raw_data['close'][i],
-                        'q': raw_data['vol'][i]  # volume
-                    }
-                    klines.append(kline)
+            if raw_data.get('time'):
+                # Колонки обходятся zip без индексации каждого массива по номеру строки
+                klines = [
+                    {'t': t * 1000, 'o': o, 'h': h, 'l': l, 'c': c, 'q': q}  # t в миллисекундах, q - объём
+                    for t, o, h, l, c, q in zip(raw_data['time'], raw_data['open'], raw_data['high'],
+                                                raw_data['low'], raw_data['close'], raw_data['vol'])
+                ]
             
-            logger.debug(f"✅ Получено {len(klines)} свечей для {pair} ({interval})")
+            logger.debug("✅ Получено %s свечей для %s (%s)", len(klines), pair, interval)
             return klines
             
         except Exception as e:
             logger.error(f"💥 Неожиданная ошибка для {pair} ({interval}): {e}")
             return None
     
+    async def get_klines_batch_async(self,
+                                     requests: Sequence[Tuple[str, str, int]],
+                                     workers: int = 64) -> List:
+        """
+        Загрузка свечей для пакета запросов фиксированным пулом воркеров
+        
+        У MEXC нет эндпоинта свечей сразу для нескольких пар, поэтому пакет
+        выполняется отдельными GET через общую сессию (keep-alive): workers
+        воркеров разбирают запросы из общего итератора, и число корутин не
+        растёт с размером пакета.
+        
+        Args:
+            requests: Список запросов [(pair, interval, limit), ...]
+            workers: Количество одновременных воркеров
+            
+        Returns:
+            List: Свечи, None или исключение для каждого запроса в порядке requests
+        """
+        results: List = [None] * len(requests)
+        pending = iter(enumerate(requests))
+        
+        async def worker():
+            # Общий итератор безопасен: воркеры переключаются только на await
+            for index, (pair, interval, limit) in pending:
+                try:
+                    results[index] = await self.get_klines_async(pair, interval, limit)
+                except Exception as e:
+                    results[index] = e
+        
+        await asyncio.gather(*(worker() for _ in range(min(workers, len(requests)))))
+        return results
+    
     async def get_multiple_klines(self, 
                                   requests: List[Tuple[str, str, int]]) -> Dict[str, RequestResult]:
         """
@@ -312,6 +360,16 @@ class AsyncMexcRestClient:
         logger.info(f"✅ Batch результат: {successful_count}/{len(requests)} успешных запросов")
         return organized_results
     
+    async def open(self):
+        """
+        Открытие общей сессии в текущем цикле событий
+        
+        Вызывается один раз при запуске: все запросы бота затем идут через
+        эту сессию и пул её keep-alive соединений.
+        """
+        await self._ensure_session()
+        self._closed = False
+    
     async def close(self):
         """Закрытие асинхронного клиента"""
         if self._session and not self._session.closed:
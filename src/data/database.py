@@ -3,13 +3,18 @@
 Реализует write-back caching с периодическим сбросом в SQLite/PostgreSQL
 """
 
+import atexit
+import signal
 import sqlite3
 import threading
 import time
 import logging
-from typing import List, Dict, Optional, Any
+from operator import attrgetter
+from pathlib import Path
+from typing import List, Dict, Optional, Any, Iterator
+from collections import OrderedDict
 from datetime import datetime, timezone
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from queue import Queue
 from src.config import DATABASE_CONFIG, CACHE_CONFIG
 from src.signals.detector import VolumeSignal
@@ -17,6 +22,17 @@ from src.signals.detector import VolumeSignal
 # Настройка логгера
 logger = logging.getLogger(__name__)
 
+# Столбцы, заполняемые при вставке сигнала (id - автоинкремент)
+_INSERT_COLUMNS = (
+    'timestamp', 'pair', 'timeframe', 'signal_type', 'price',
+    'current_volume', 'average_volume', 'spike_ratio', 'open_interest',
+    'period_change', 'status', 'notification_text', 'created_at'
+)
+_INSERT_SQL = (
+    f"INSERT OR IGNORE INTO signals ({', '.join(_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _INSERT_COLUMNS)})"
+)
+
 
 @dataclass
 class StoredSignal:
@@ -37,7 +53,7 @@ class StoredSignal:
     period_change: float = 0.0       # Изменение цены за период (%)
     status: str = "new"              # Статус сигнала (new, processed, archived)
     notification_text: str = ""      # Текст уведомления
-    created_at: Optional[str] = None # Время создания записи
+    created_at: Optional[int] = None # Время создания записи (миллисекунды, epoch)
     
     @classmethod
     def from_volume_signal(cls, signal: VolumeSignal) -> 'StoredSignal':
@@ -60,10 +76,54 @@ class StoredSignal:
             average_volume=signal.average_volume,
             spike_ratio=signal.spike_ratio,
             notification_text=signal.message,
-            created_at=datetime.now(timezone.utc).isoformat()
+            created_at=time.time_ns() // 1_000_000
         )
 
 
+# Значения столбцов _INSERT_COLUMNS из StoredSignal одним вызовом
+_stored_signal_row = attrgetter(*_INSERT_COLUMNS)
+
+
+def _volume_signal_row(signal: VolumeSignal, created_at: int) -> tuple:
+    """
+    Строка для INSERT напрямую из VolumeSignal, минуя StoredSignal
+    
+    Args:
+        signal (VolumeSignal): Сигнал от детектора
+        created_at (int): Время создания записи (миллисекунды, epoch)
+        
+    Returns:
+        tuple: Значения в порядке _INSERT_COLUMNS
+    """
+    return (
+        signal.timestamp, signal.pair, signal.timeframe, "volume_spike", signal.price,
+        signal.current_volume, signal.average_volume, signal.spike_ratio, 0.0,
+        0.0, "new", signal.message, created_at
+    )
+
+
+def _format_created_at(value: Any) -> Any:
+    """
+    Ленивое форматирование created_at в ISO-строку при чтении
+    
+    Новые записи хранят время создания как epoch-миллисекунды,
+    старые базы содержат уже готовые ISO-строки - их возвращаем как есть.
+    
+    Args:
+        value: Значение столбца created_at
+    
+    Returns:
+        str: Время создания в формате ISO 8601 (UTC)
+    """
+    if isinstance(value, str):
+        if not value.isdigit():
+            return value
+        value = int(value)
+    if isinstance(value, int):
+        return datetime.fromtimestamp(value / 1000, tz=timezone.utc).isoformat()
+    return value
+
+
 class SignalsDatabase:
     """
     Класс для работы с базой данных сигналов
@@ -80,6 +140,9 @@ class SignalsDatabase:
         self.config = config or DATABASE_CONFIG
         self.db_type = self.config.get("type", "sqlite")
         self.connection = None
+        self._read_connection = None
+        self._write_cursor: Optional[sqlite3.Cursor] = None
+        self._write_lock = threading.Lock()
         self._init_database()
         logger.info(f"Инициализирована база данных: {self.db_type}")
     
@@ -96,18 +159,55 @@ class SignalsDatabase:
         """Инициализация SQLite базы данных"""
         try:
             db_path = self.config.get("path", "signals_history.db")
-            self.connection = sqlite3.connect(db_path, check_same_thread=False)
+            # isolation_level=None: транзакциями записи управляем явно (BEGIN IMMEDIATE/COMMIT)
+            self.connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
             self.connection.row_factory = sqlite3.Row  # Для доступа к столбцам по имени
             
+            # WAL: читатели не блокируют запись и видят только закоммиченные данные
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            # В WAL-режиме NORMAL не теряет целостность; долговечность добирается checkpoint(FULL) при закрытии
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(f"PRAGMA wal_autocheckpoint={int(self.config.get('wal_autocheckpoint', 1000))}")
+            
             # Создаем таблицу сигналов
             self._create_tables()
             
+            # Долгоживущий курсор записи: подготовленный INSERT берётся из кэша выражений
+            self._write_cursor = self.connection.cursor()
+            
+            # Отдельное read-only подключение для истории и аналитики
+            self._read_connection = self._open_read_connection(db_path)
+            
             logger.debug(f"SQLite база данных инициализирована: {db_path}")
             
         except Exception as e:
             logger.error(f"Ошибка инициализации SQLite: {e}")
             raise
     
+    def _open_read_connection(self, db_path: str) -> sqlite3.Connection:
+        """
+        Открытие read-only подключения (URI mode=ro) с memory-mapped чтением
+        
+        Args:
+            db_path (str): Путь к файлу базы данных
+            
+        Returns:
+            sqlite3.Connection: Подключение для чтения (для :memory: - основное подключение)
+        """
+        if db_path == ":memory:":
+            return self.connection
+        
+        try:
+            uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+            connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute(f"PRAGMA mmap_size={int(self.config.get('read_mmap_size', 536870912))}")
+            return connection
+            
+        except Exception as e:
+            logger.warning(f"Не удалось открыть read-only подключение, чтение через основное: {e}")
+            return self.connection
+    
     def _create_tables(self):
         """Создание таблиц в базе данных"""
         create_signals_table = """
@@ -125,26 +225,38 @@ class SignalsDatabase:
             period_change REAL DEFAULT 0.0,
             status TEXT DEFAULT 'new',
             notification_text TEXT,
-            created_at TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
             UNIQUE(timestamp, pair, timeframe) ON CONFLICT IGNORE
         );
         """
         
         # Создаем индексы для быстрого поиска
+        # idx_signals_query покрывает фильтры и сортировку get_signals с фильтром по паре
+        # (pair [, timeframe [, status]] + ORDER BY timestamp DESC) без filesort.
+        # Запросы без пары (только timeframe или status) используют одностолбцовые индексы
         create_indexes = [
             "CREATE INDEX IF NOT EXISTS idx_signals_timestamp ON signals(timestamp);",
-            "CREATE INDEX IF NOT EXISTS idx_signals_pair ON signals(pair);",
+            "CREATE INDEX IF NOT EXISTS idx_signals_query ON signals(pair, timeframe, status, timestamp DESC);",
             "CREATE INDEX IF NOT EXISTS idx_signals_timeframe ON signals(timeframe);",
             "CREATE INDEX IF NOT EXISTS idx_signals_status ON signals(status);",
-            "CREATE INDEX IF NOT EXISTS idx_signals_created_at ON signals(created_at);"        ]
+            "CREATE INDEX IF NOT EXISTS idx_signals_created_at ON signals(created_at);"
+        ]
+        
+        # idx_signals_pair - префикс idx_signals_query (остался в старых базах)
+        drop_indexes = [
+            "DROP INDEX IF EXISTS idx_signals_pair;"
+        ]
         
         try:
             cursor = self.connection.cursor()
             cursor.execute(create_signals_table)
             
-            for index_sql in create_indexes:
+            for index_sql in drop_indexes + create_indexes:
                 cursor.execute(index_sql)
             
+            # Обновляем статистику планировщика для новых индексов
+            cursor.execute("ANALYZE signals;")
+            
             self.connection.commit()
             logger.debug("Таблицы базы данных созданы успешно")
             
@@ -160,34 +272,14 @@ class SignalsDatabase:
             signal (StoredSignal): Сигнал для вставки
             
         Returns:
-            int: ID вставленной записи или None при ошибке
+            int: ID вставленной записи или None при ошибке/дубликате
         """
-        try:
-            cursor = self.connection.cursor()
-            
-            # Подготавливаем данные для вставки (исключаем id)
-            signal_dict = asdict(signal)
-            del signal_dict['id']  # id автоинкремент
-            
-            # Создаем SQL запрос безопасно
-            columns = list(signal_dict.keys())
-            values = list(signal_dict.values())
-            
-            placeholders = ', '.join(['?' for _ in columns])
-            columns_str = ', '.join(columns)
-            
-            sql = f"INSERT INTO signals ({columns_str}) VALUES ({placeholders})"
-            
-            cursor.execute(sql, values)
-            self.connection.commit()
-            
-            signal_id = cursor.lastrowid
-            logger.debug(f"Сигнал сохранен в БД с ID: {signal_id}")
-            return signal_id
-            
-        except Exception as e:
-            logger.error(f"Ошибка вставки сигнала в БД: {e}")
+        inserted_count, signal_id = self._write_rows([_stored_signal_row(signal)])
+        if not inserted_count:
             return None
+        
+        logger.debug("Сигнал сохранен в БД с ID: %s", signal_id)
+        return signal_id
     
     def insert_signals_batch(self, signals: List[StoredSignal]) -> int:
         """
@@ -199,38 +291,135 @@ class SignalsDatabase:
         Returns:
             int: Количество успешно вставленных записей
         """
-        if not signals:
+        return self.insert_rows_batch([_stored_signal_row(signal) for signal in signals])
+    
+    def insert_rows_batch(self, rows: List[tuple], raise_errors: bool = False) -> int:
+        """
+        Пакетная вставка готовых строк (значения в порядке _INSERT_COLUMNS)
+        
+        Args:
+            rows (List[tuple]): Строки для вставки
+            raise_errors (bool): Пробрасывать ошибку записи вместо возврата 0
+            
+        Returns:
+            int: Количество успешно вставленных записей
+        """
+        if not rows:
             return 0
         
+        inserted_count, _ = self._write_rows(rows, raise_errors)
+        logger.info(f"Пакетная вставка: {inserted_count}/{len(rows)} сигналов сохранено")
+        return inserted_count
+    
+    def _write_rows(self, rows: List[tuple], raise_errors: bool = False) -> tuple[int, Optional[int]]:
+        """
+        Единственный путь записи: одна транзакция и один COMMIT на весь пакет
+        
+        Args:
+            rows (List[tuple]): Строки для вставки
+            raise_errors (bool): Пробрасывать ошибку (транзакция уже откачена)
+            
+        Returns:
+            tuple: (количество вставленных записей, ID последней записи для одиночной вставки)
+        """
         try:
-            cursor = self.connection.cursor()
-            inserted_count = 0
+            with self._write_lock:
+                cursor = self._write_cursor
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    if len(rows) == 1:
+                        # execute, а не executemany - чтобы получить lastrowid
+                        cursor.execute(_INSERT_SQL, rows[0])
+                    else:
+                        cursor.executemany(_INSERT_SQL, rows)
+                    inserted_count = cursor.rowcount
+                    last_row_id = cursor.lastrowid
+                    cursor.execute("COMMIT")
+                except BaseException:
+                    # В том числе SystemExit из обработчика SIGTERM: транзакция не должна остаться открытой
+                    if self.connection.in_transaction:
+                        cursor.execute("ROLLBACK")
+                    raise
+            
+            return inserted_count, last_row_id
             
-            for signal in signals:
-                # Подготавливаем данные (исключаем id)
-                signal_dict = asdict(signal)
-                del signal_dict['id']
-                
-                # Создаем SQL запрос безопасно
-                columns = list(signal_dict.keys())
-                values = list(signal_dict.values())
-                
-                placeholders = ', '.join(['?' for _ in columns])
-                columns_str = ', '.join(columns)
-                
-                sql = f"INSERT OR IGNORE INTO signals ({columns_str}) VALUES ({placeholders})"
-                
-                cursor.execute(sql, values)
-                if cursor.rowcount > 0:
-                    inserted_count += 1
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"Ошибка вставки сигналов в БД: {e}")
+            return 0, None
+    
+    def checkpoint(self, mode: str = "TRUNCATE") -> bool:
+        """
+        Принудительный checkpoint WAL-журнала на подключении записи
+        
+        Args:
+            mode (str): Режим checkpoint (PASSIVE, FULL, RESTART, TRUNCATE)
             
-            self.connection.commit()
-            logger.info(f"Пакетная вставка: {inserted_count}/{len(signals)} сигналов сохранено")
-            return inserted_count
+        Returns:
+            bool: True если checkpoint выполнен полностью
+        """
+        try:
+            with self._write_lock:
+                busy, log_pages, checkpointed = self.connection.execute(
+                    f"PRAGMA wal_checkpoint({mode})"
+                ).fetchone()
+            
+            logger.debug(f"WAL checkpoint ({mode}): {checkpointed}/{log_pages} страниц, busy={busy}")
+            return busy == 0
             
         except Exception as e:
-            logger.error(f"Ошибка пакетной вставки сигналов: {e}")
-            return 0
+            logger.error(f"Ошибка checkpoint WAL: {e}")
+            return False
+    
+    def iter_signals(self, pair: str = None, timeframe: str = None, 
+                     status: str = None, limit: int = 100) -> Iterator[Dict]:
+        """
+        Потоковое чтение сигналов из базы данных с фильтрацией
+        
+        Строки отдаются по одной прямо из курсора, без промежуточного списка.
+        Ошибки выполнения запроса пробрасываются вызывающему коду.
+        
+        Args:
+            pair (str): Фильтр по торговой паре
+            timeframe (str): Фильтр по таймфрейму
+            status (str): Фильтр по статусу
+            limit (int): Максимальное количество записей
+            
+        Yields:
+            Dict: Сигнал (created_at в формате ISO 8601)
+        """
+        cursor = self._read_connection.cursor()
+        
+        # Строим SQL запрос с фильтрами
+        sql = "SELECT * FROM signals WHERE 1=1"
+        params = []
+        
+        if pair:
+            sql += " AND pair = ?"
+            params.append(pair)
+        
+        if timeframe:
+            sql += " AND timeframe = ?"
+            params.append(timeframe)
+        
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        
+        sql += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
+        
+        try:
+            cursor.execute(sql, params)
+            
+            # created_at форматируем только здесь, при выдаче строки
+            for row in cursor:
+                signal = dict(row)
+                signal['created_at'] = _format_created_at(signal['created_at'])
+                yield signal
+        finally:
+            cursor.close()
     
     def get_signals(self, pair: str = None, timeframe: str = None, 
                    status: str = None, limit: int = 100) -> List[Dict]:
@@ -247,32 +436,8 @@ class SignalsDatabase:
             List[Dict]: Список сигналов
         """
         try:
-            cursor = self.connection.cursor()
-            
-            # Строим SQL запрос с фильтрами
-            sql = "SELECT * FROM signals WHERE 1=1"
-            params = []
-            
-            if pair:
-                sql += " AND pair = ?"
-                params.append(pair)
-            
-            if timeframe:
-                sql += " AND timeframe = ?"
-                params.append(timeframe)
-            
-            if status:
-                sql += " AND status = ?"
-                params.append(status)
-            
-            sql += " ORDER BY timestamp DESC LIMIT ?"
-            params.append(limit)
-            
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
-            
-            # Преобразуем в список словарей
-            signals = [dict(row) for row in rows]
+            signals = list(self.iter_signals(pair=pair, timeframe=timeframe,
+                                             status=status, limit=limit))
             
             logger.debug(f"Получено {len(signals)} сигналов из БД")
             return signals
@@ -289,7 +454,7 @@ class SignalsDatabase:
             Dict: Статистика (общее количество, по парам, по таймфреймам и т.д.)
         """
         try:
-            cursor = self.connection.cursor()
+            cursor = self._read_connection.cursor()
             
             # Общее количество сигналов
             cursor.execute("SELECT COUNT(*) as total FROM signals")
@@ -334,6 +499,9 @@ class SignalsDatabase:
     
     def close(self):
         """Закрытие подключения к базе данных"""
+        if self._read_connection and self._read_connection is not self.connection:
+            self._read_connection.close()
+        
         if self.connection:
             self.connection.close()
             logger.debug("Подключение к базе данных закрыто")
@@ -361,21 +529,69 @@ class SignalsCache:
         self.flush_interval = self.config.get("flush_interval", 300)
         self.batch_size = self.config.get("batch_size", 50)
         self.enabled = self.config.get("enable_cache", True)
+        self.dedup_window = self.config.get("dedup_window", 1000)
+        self.min_flush_interval = self.config.get("min_flush_interval", 0.5)
+        self.checkpoint_every = self.config.get("checkpoint_every", 20)
+        
+        # EMA темпа поступления сигналов (сигналов/с) для адаптивного интервала сброса
+        self._rate_alpha = 0.1
+        self._rate_ema = 0.0
+        self._last_arrival: Optional[float] = None
         
-        # Буфер для сигналов
-        self.buffer: List[StoredSignal] = []
+        # Буфер сигналов - готовые строки для INSERT (порядок _INSERT_COLUMNS)
+        self.buffer: List[tuple] = []
         self.buffer_lock = threading.Lock()
         
+        # Ключи (timestamp, pair, timeframe) недавно сброшенных сигналов (LRU)
+        self._recent_keys: OrderedDict = OrderedDict()
+        
         # Поток для периодического сброса
         self.flush_thread = None
         self.stop_event = threading.Event()
+        self._flush_wakeup = threading.Event()
+        self._closed = False
         
         if self.enabled:
             self._start_flush_thread()
         
+        # Финальный сброс буфера даже если close() не был вызван явно
+        self._register_shutdown_hooks()
+        
         logger.info(f"Инициализирован кэш сигналов: размер буфера={self.buffer_size}, "
                    f"интервал сброса={self.flush_interval}с")
     
+    def _register_shutdown_hooks(self):
+        """
+        Регистрация atexit и обработчика SIGTERM для сброса буфера при завершении
+        
+        Сам обработчик SIGTERM не пишет в БД и не берёт блокировок: он выполняется
+        в главном потоке между байткодами, возможно, пока тот держит buffer_lock.
+        Обработчик только завершает процесс через SystemExit, а буфер сбрасывает
+        atexit-хук close() после раскрутки стека.
+        """
+        atexit.register(self.close)
+        
+        # Обработчики сигналов можно ставить только из главного потока
+        if threading.current_thread() is not threading.main_thread():
+            return
+        
+        try:
+            previous_handler = signal.getsignal(signal.SIGTERM)
+            if previous_handler == signal.SIG_IGN:
+                return
+            
+            def _on_sigterm(signum, frame):
+                # Сохраняем прежнее поведение SIGTERM; по умолчанию - штатный выход с atexit
+                if callable(previous_handler):
+                    previous_handler(signum, frame)
+                else:
+                    raise SystemExit(128 + signum)
+            
+            signal.signal(signal.SIGTERM, _on_sigterm)
+            
+        except (ValueError, OSError) as e:
+            logger.warning(f"Не удалось установить обработчик SIGTERM: {e}")
+    
     def _start_flush_thread(self):
         """Запуск потока для периодического сброса буфера"""
         self.flush_thread = threading.Thread(target=self._flush_worker, daemon=True)
@@ -384,8 +600,56 @@ class SignalsCache:
     
     def _flush_worker(self):
         """Рабочий поток для периодического сброса буфера в БД"""
-        while not self.stop_event.wait(self.flush_interval):
+        last_flush = time.monotonic()
+        flushes = 0
+        
+        while not self.stop_event.is_set():
+            # Пересчитываем срок сброса при каждом пробуждении: темп мог измениться
+            self._flush_wakeup.clear()
+            remaining = last_flush + self._next_flush_delay() - time.monotonic()
+            
+            if remaining > 0:
+                self._flush_wakeup.wait(remaining)
+                continue
+            
             self.flush_buffer()
+            last_flush = time.monotonic()
+            
+            # Периодически усекаем WAL, чтобы журнал не рос между автоматическими checkpoint
+            flushes += 1
+            if self.checkpoint_every and flushes % self.checkpoint_every == 0:
+                self.database.checkpoint("TRUNCATE")
+    
+    def _update_arrival_rate(self, count: int = 1):
+        """Обновление EMA темпа поступления сигналов (вызывается под блокировкой)"""
+        now = time.monotonic()
+        if self._last_arrival is not None:
+            elapsed = max(now - self._last_arrival, 1e-3)
+            self._rate_ema += self._rate_alpha * (count / elapsed - self._rate_ema)
+        self._last_arrival = now
+    
+    def _next_flush_delay(self) -> float:
+        """
+        Адаптивный интервал до следующего сброса
+        
+        Подбирается так, чтобы за интервал набирался примерно batch_size сигналов:
+        при низкой нагрузке - не чаще flush_interval, при высокой - не реже
+        min_flush_interval.
+        
+        Returns:
+            float: Задержка в секундах
+        """
+        rate = self._rate_ema
+        if self._last_arrival is not None:
+            # Если поток сигналов затих, темп не может быть выше 1 / время тишины
+            idle = time.monotonic() - self._last_arrival
+            if idle > 0:
+                rate = min(rate, 1.0 / idle)
+        
+        if rate <= 0:
+            return self.flush_interval
+        
+        return min(self.flush_interval, max(self.min_flush_interval, self.batch_size / rate))
     
     def add_signal(self, signal: VolumeSignal):
         """
@@ -394,23 +658,60 @@ class SignalsCache:
         Args:
             signal (VolumeSignal): Сигнал от детектора
         """
+        row = _volume_signal_row(signal, time.time_ns() // 1_000_000)
+        
         if not self.enabled:
             # Если кэш отключен, сразу записываем в БД
-            stored_signal = StoredSignal.from_volume_signal(signal)
-            self.database.insert_signal(stored_signal)
+            self.database.insert_rows_batch([row])
             return
         
-        stored_signal = StoredSignal.from_volume_signal(signal)
-        
         with self.buffer_lock:
-            self.buffer.append(stored_signal)
-            logger.debug(f"Сигнал добавлен в кэш. Размер буфера: {len(self.buffer)}/{self.buffer_size}")
+            self._update_arrival_rate()
+            self.buffer.append(row)
+            logger.debug("Сигнал добавлен в кэш. Размер буфера: %s/%s", len(self.buffer), self.buffer_size)
+            
+            # Набрался очередной пакет - будим поток сброса пересчитать интервал
+            if len(self.buffer) % self.batch_size == 0:
+                self._flush_wakeup.set()
             
             # Проверяем, нужен ли принудительный сброс
             if len(self.buffer) >= self.buffer_size:
                 logger.info("Буфер заполнен, принудительный сброс в БД")
                 self._flush_buffer_unsafe()
     
+    def add_signals(self, signals: List[VolumeSignal]):
+        """
+        Пакетное добавление сигналов в кэш (одна блокировка на пакет)
+        
+        Args:
+            signals (List[VolumeSignal]): Сигналы от детектора
+        """
+        if not signals:
+            return
+        
+        now_ms = time.time_ns() // 1_000_000
+        rows = [_volume_signal_row(signal, now_ms) for signal in signals]
+        
+        if not self.enabled:
+            # Если кэш отключен, сразу записываем в БД одной транзакцией
+            self.database.insert_rows_batch(rows)
+            return
+        
+        with self.buffer_lock:
+            self._update_arrival_rate(len(rows))
+            size_before = len(self.buffer)
+            self.buffer.extend(rows)
+            logger.debug("Пакет из %s сигналов добавлен в кэш. Размер буфера: %s/%s",
+                         len(rows), len(self.buffer), self.buffer_size)
+            
+            # Пересекли границу очередного пакета - будим поток сброса
+            if len(self.buffer) // self.batch_size > size_before // self.batch_size:
+                self._flush_wakeup.set()
+            
+            if len(self.buffer) >= self.buffer_size:
+                logger.info("Буфер заполнен, принудительный сброс в БД")
+                self._flush_buffer_unsafe()
+    
     def flush_buffer(self):
         """Безопасный сброс буфера в базу данных"""
         with self.buffer_lock:
@@ -421,18 +722,84 @@ class SignalsCache:
         if not self.buffer:
             return
         
-        signals_to_flush = self.buffer.copy()
-        self.buffer.clear()
+        # Забираем буфер целиком и подменяем на новый список - без копирования под блокировкой
+        signals_to_flush, self.buffer = self.buffer, []
+        signals_to_flush = self._deduplicate(signals_to_flush)
+        
+        if not signals_to_flush:
+            return
         
         # Сбрасываем пакетами для лучшей производительности
+        failed = 0
         for i in range(0, len(signals_to_flush), self.batch_size):
             batch = signals_to_flush[i:i + self.batch_size]
-            inserted = self.database.insert_signals_batch(batch)
+            try:
+                inserted = self.database.insert_rows_batch(batch, raise_errors=True)
+            except (SystemExit, KeyboardInterrupt):
+                # Завершение посреди сброса: незаписанный остаток возвращаем в буфер,
+                # его допишет финальный сброс в close()
+                self.buffer[:0] = signals_to_flush[i:]
+                raise
+            except Exception as e:
+                # Ключи не запоминаем: повторная отправка тех же сигналов не считается дубликатом
+                logger.error(f"Ошибка сброса пакета из {len(batch)} сигналов в БД: {e}")
+                failed += len(batch)
+                continue
+            
+            # Ключи запоминаются только после COMMIT пакета
+            self._remember_keys(batch)
             
             if inserted < len(batch):
                 logger.warning(f"Не все сигналы из пакета сохранены: {inserted}/{len(batch)}")
         
-        logger.info(f"Сброшено {len(signals_to_flush)} сигналов из кэша в БД")
+        logger.info(f"Сброшено {len(signals_to_flush) - failed} сигналов из кэша в БД")
+    
+    def _deduplicate(self, rows: List[tuple]) -> List[tuple]:
+        """
+        Отбрасывание дубликатов по ключу UNIQUE(timestamp, pair, timeframe)
+        
+        Дубликаты внутри буфера и среди недавно сброшенных сигналов отсекаются
+        проверкой по хэшу, не доходя до INSERT OR IGNORE в базе данных.
+        Сами ключи запоминаются позже, в _remember_keys - после записи в БД.
+        
+        Args:
+            rows (List[tuple]): Строки сигналов из буфера
+            
+        Returns:
+            List[tuple]: Уникальные строки
+        """
+        recent = self._recent_keys
+        seen = set()
+        unique = []
+        
+        for row in rows:
+            key = row[:3]  # (timestamp, pair, timeframe)
+            if key in recent:
+                recent.move_to_end(key)
+                continue
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(row)
+        
+        if len(unique) < len(rows):
+            logger.debug(f"Отброшено дубликатов сигналов: {len(rows) - len(unique)}")
+        
+        return unique
+    
+    def _remember_keys(self, rows: List[tuple]):
+        """
+        Запоминание ключей успешно записанных сигналов (LRU на dedup_window ключей)
+        
+        Args:
+            rows (List[tuple]): Строки, попавшие в БД
+        """
+        recent = self._recent_keys
+        for row in rows:
+            recent[row[:3]] = None
+        
+        while len(recent) > self.dedup_window:
+            recent.popitem(last=False)
     
     def get_buffer_size(self) -> int:
         """Получение текущего размера буфера"""
@@ -446,21 +813,33 @@ class SignalsCache:
             'buffer_size': self.get_buffer_size(),
             'max_buffer_size': self.buffer_size,
             'flush_interval': self.flush_interval,
-            'batch_size': self.batch_size
+            'next_flush_delay': self._next_flush_delay(),
+            'arrival_rate': self._rate_ema,
+            'batch_size': self.batch_size,
+            'dedup_window': self.dedup_window
         }
     
     def close(self):
         """Закрытие кэша с финальным сбросом данных"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        
         logger.info("Закрытие кэша сигналов...")
         
         # Останавливаем поток сброса
         if self.flush_thread:
             self.stop_event.set()
+            self._flush_wakeup.set()
             self.flush_thread.join(timeout=5)
         
         # Финальный сброс буфера
         self.flush_buffer()
         
+        # Переносим WAL в основной файл БД с fsync - данные переживут аварийное завершение
+        self.database.checkpoint("FULL")
+        
         logger.info("Кэш сигналов закрыт")
 
 
@@ -493,6 +872,15 @@ class SignalsManager:
         """
         self.cache.add_signal(signal)
     
+    def save_signals_batch(self, signals: List[VolumeSignal]):
+        """
+        Сохранение пакета сигналов (через кэш или напрямую в БД)
+        
+        Args:
+            signals (List[VolumeSignal]): Сигналы от детектора
+        """
+        self.cache.add_signals(signals)
+    
     def get_signals_history(self, pair: str = None, timeframe: str = None, 
                           limit: int = 100) -> List[Dict]:
         """
@@ -508,6 +896,21 @@ class SignalsManager:
         """
         return self.database.get_signals(pair=pair, timeframe=timeframe, limit=limit)
     
+    def iter_signals_history(self, pair: str = None, timeframe: str = None, 
+                             limit: int = 100) -> Iterator[Dict]:
+        """
+        Потоковое получение истории сигналов (без загрузки всего списка в память)
+        
+        Args:
+            pair (str): Фильтр по торговой паре
+            timeframe (str): Фильтр по таймфрейму
+            limit (int): Максимальное количество записей
+            
+        Returns:
+            Iterator[Dict]: Итератор сигналов
+        """
+        return self.database.iter_signals(pair=pair, timeframe=timeframe, limit=limit)
+    
     def get_full_statistics(self) -> Dict[str, Any]:
         """
         Получение полной статистики (БД + кэш)
@@ -540,22 +943,28 @@ class SignalsManager:
         try:
             import csv
             
-            signals = self.get_signals_history(pair=pair, timeframe=timeframe, limit=limit)
+            signals = self.iter_signals_history(pair=pair, timeframe=timeframe, limit=limit)
+            first_signal = next(signals, None)
             
-            if not signals:
+            if first_signal is None:
                 logger.warning("Нет сигналов для экспорта")
                 return False
             
-            # Записываем в CSV
+            # Записываем в CSV построчно, по мере чтения из БД
+            exported = 0
             with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = signals[0].keys()
+                fieldnames = first_signal.keys()
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                 
                 writer.writeheader()
+                writer.writerow(first_signal)
+                exported += 1
+                
                 for signal in signals:
                     writer.writerow(signal)
+                    exported += 1
             
-            logger.info(f"Экспортировано {len(signals)} сигналов в {filepath}")
+            logger.info(f"Экспортировано {exported} сигналов в {filepath}")
             return True
             
         except Exception as e:
@@ -5,44 +5,169 @@
 
 import requests
 import logging
+import sys
 import threading
 import time
-from typing import List, Dict, Optional, Set
-from datetime import datetime, timedelta
-from dataclasses import dataclass
+from functools import wraps
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, FrozenSet, Optional, Set, Tuple, Mapping
+from datetime import datetime
+from types import MappingProxyType
 from src.config import MEXC_API_BASE_URL
+from src.data.rest_client import get_shared_session
+from src.utils import fast_json
 
 logger = logging.getLogger(__name__)
 
+# Ключи, без которых ответ /contract/detail считается изменившим формат
+_REQUIRED_CONTRACT_KEYS = ('symbol', 'baseCoin', 'quoteCoin')
+
+# Маркер ответа 304 Not Modified: список контрактов не изменился
+NOT_MODIFIED = object()
+
+
+# Соответствие полей PairInfo полям контракта API:
+# (атрибут, ключ API, значение по умолчанию, способ преобразования)
+#   raw    - значение как есть
+#   intern - строка через sys.intern (валюты, ставки и лимиты повторяются у сотен контрактов)
+#   plates - список тегов через sys.intern
+_CONTRACT_FIELDS = (
+    ('base_coin', 'baseCoin', '', 'intern'),
+    ('quote_coin', 'quoteCoin', '', 'intern'),
+    ('price_scale', 'priceScale', 0, 'raw'),
+    ('qty_scale', 'volScale', 0, 'raw'),
+    ('max_leverage', 'maxLeverage', 0, 'raw'),
+    ('min_leverage', 'minLeverage', 0, 'raw'),
+    ('maintain_margin_rate', 'maintenanceMarginRate', '', 'intern'),
+    ('initial_margin_rate', 'initialMarginRate', '', 'intern'),
+    ('risk_base_vol', 'riskBaseVol', '', 'intern'),
+    ('risk_incr_vol', 'riskIncrVol', '', 'intern'),
+    ('risk_incr_mmr', 'riskIncrMmr', '', 'intern'),
+    ('risk_incr_imr', 'riskIncrImr', '', 'intern'),
+    ('risk_level_limit', 'riskLevelLimit', 0, 'raw'),
+    ('price_unit', 'priceUnit', '', 'intern'),
+    ('vol_unit', 'volUnit', '', 'intern'),
+    ('min_vol', 'minVol', '', 'intern'),
+    ('max_vol', 'maxVol', '', 'intern'),
+    ('bid_limit_price_rate', 'bidLimitPriceRate', '', 'intern'),
+    ('ask_limit_price_rate', 'askLimitPriceRate', '', 'intern'),
+    ('taker_fee_rate', 'takerFeeRate', '', 'intern'),
+    ('maker_fee_rate', 'makerFeeRate', '', 'intern'),
+    ('maintenance_time', 'maintenanceTime', '', 'intern'),
+    ('is_new', 'isNew', False, 'raw'),
+    ('concept_plate', 'conceptPlate', None, 'plates'),
+)
+
+_CONVERTERS = {
+    'raw': lambda value: value,
+    'intern': lambda value: sys.intern(str(value)),
+    'plates': lambda value: [sys.intern(str(plate)) for plate in value or ()]
+}
+
+# Поля, которые разбираются только при первом обращении
+_LAZY_FIELDS = {
+    attr: (key, default, _CONVERTERS[kind])
+    for attr, key, default, kind in _CONTRACT_FIELDS
+    if attr not in ('base_coin', 'quote_coin')
+}
+
+
+def _ensure_cache(method):
+    """Декоратор: заполняет кэш пар перед первым обращением к методу"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self._snapshot.pairs:
+            self.get_all_pairs()
+        return method(self, *args, **kwargs)
+    return wrapper
+
 
-@dataclass
 class PairInfo:
-    """Информация о торговой паре"""
-    symbol: str
-    base_coin: str
-    quote_coin: str
-    price_scale: int
-    qty_scale: int
-    max_leverage: int
-    min_leverage: int
-    maintain_margin_rate: str
-    initial_margin_rate: str
-    risk_base_vol: str
-    risk_incr_vol: str
-    risk_incr_mmr: str
-    risk_incr_imr: str
-    risk_level_limit: int
-    price_unit: str
-    vol_unit: str
-    min_vol: str
-    max_vol: str
-    bid_limit_price_rate: str
-    ask_limit_price_rate: str
-    taker_fee_rate: str
-    maker_fee_rate: str
-    maintenance_time: str
-    is_new: bool
-    concept_plate: List[str]
+    """
+    Информация о торговой паре
+    
+    symbol, base_coin и quote_coin заполняются сразу - по ним строятся индексы.
+    Остальные поля разбираются из исходного словаря контракта при первом
+    обращении и сохраняются в слот, повторное чтение идёт без преобразований.
+    """
+    
+    __slots__ = ('_raw', 'symbol', 'base_coin', 'quote_coin') + tuple(_LAZY_FIELDS)
+    
+    def __init__(self, symbol: str, base_coin: str, quote_coin: str, raw: Dict):
+        self._raw = raw
+        self.symbol = symbol
+        self.base_coin = base_coin
+        self.quote_coin = quote_coin
+    
+    @classmethod
+    def from_contract(cls, contract: Dict) -> "PairInfo":
+        """
+        Создание PairInfo из элемента ответа /contract/detail
+        
+        Args:
+            contract (Dict): Словарь контракта от API
+            
+        Returns:
+            PairInfo: Информация о паре
+        """
+        return cls(
+            symbol=contract['symbol'],
+            base_coin=sys.intern(str(contract.get('baseCoin', ''))),
+            quote_coin=sys.intern(str(contract.get('quoteCoin', ''))),
+            raw=contract
+        )
+    
+    def __getattr__(self, name: str):
+        # Вызывается только для ещё не заполненных слотов
+        spec = _LAZY_FIELDS.get(name)
+        if spec is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        
+        key, default, convert = spec
+        value = convert(self._raw.get(key, default))
+        object.__setattr__(self, name, value)
+        return value
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PairInfo):
+            return NotImplemented
+        return self.symbol == other.symbol and self._raw == other._raw
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (f"PairInfo(symbol={self.symbol!r}, base_coin={self.base_coin!r}, "
+                f"quote_coin={self.quote_coin!r})")
+
+
+@dataclass(frozen=True, slots=True)
+class _PairsSnapshot:
+    """
+    Неизменяемый снимок кэша пар
+    
+    Данные, индексы, версия и время обновления заменяются вместе одним
+    присваиванием self._snapshot, поэтому читатель всегда видит согласованный снимок.
+    """
+    pairs: Tuple[str, ...] = ()
+    pairs_info: Mapping[str, PairInfo] = field(default_factory=lambda: MappingProxyType({}))
+    # Версия растёт только при изменении состава пар
+    version: int = 0
+    pairs_set: FrozenSet[str] = frozenset()
+    by_base: Mapping[str, Tuple[str, ...]] = field(default_factory=dict)
+    by_quote: Mapping[str, Tuple[str, ...]] = field(default_factory=dict)
+    volume_keys: Tuple[float, ...] = ()
+    volume_symbols: Tuple[str, ...] = ()
+    # Валидаторы для условных запросов к /contract/detail
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # monotonic: начало запроса, из которого получен снимок, и время обновления (TTL);
+    # datetime - только для отображения
+    fetch_started: float = 0.0
+    updated_ts: float = 0.0
+    updated_wall: Optional[datetime] = None
 
 
 class MexcPairsFetcher:
@@ -60,70 +185,98 @@ class MexcPairsFetcher:
         """
         self.base_url = MEXC_API_BASE_URL
         self.update_interval = update_interval
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Пул соединений общий с MexcRestClient - тот же хост API
+        self.session = get_shared_session()
+        self._headers = {
             'User-Agent': 'MEXC-MultiPair-Bot/2.0',
             'Content-Type': 'application/json',
             'Accept': 'application/json'
-        })
+        }
         
-        # Кэш данных
-        self._pairs_cache: List[str] = []
-        self._pairs_info_cache: Dict[str, PairInfo] = {}
-        self._last_update: Optional[datetime] = None
-        self._update_lock = threading.RLock()
+        # Кэш данных: неизменяемый снимок, читатели берут его без блокировок,
+        # писатели подменяют целиком под _update_lock
+        self._snapshot = _PairsSnapshot()
+        self._update_lock = threading.Lock()
         self._update_thread: Optional[threading.Thread] = None
         self._stop_updates = threading.Event()
         
+        # Фоновое обновление устаревшего кэша (stale-while-revalidate)
+        self._refresh_lock = threading.Lock()
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        
         # Статистика
         self.stats = {
             'total_updates': 0,
             'successful_updates': 0,
             'failed_updates': 0,
             'last_error': None,
-            'cache_hits': 0
+            'cache_hits': 0,
+            'stale_hits': 0,
+            'not_modified': 0,
+            'outdated_results': 0
         }
         
         logger.info(f"Инициализирован MexcPairsFetcher с интервалом обновления {update_interval}s")
     
-    def _fetch_symbols_from_api(self) -> Optional[Dict]:
+    def _fetch_symbols_from_api(self, snapshot: _PairsSnapshot
+                                ) -> Tuple[Optional[Dict], Optional[str], Optional[str]]:
         """
         Получение данных о символах напрямую от API
         
+        Если сервер отдал ETag/Last-Modified, следующий запрос делается условным,
+        и при неизменном списке контрактов возвращается NOT_MODIFIED без тела ответа.
+        
+        Args:
+            snapshot (_PairsSnapshot): Текущий снимок кэша (валидаторы условного запроса)
+            
         Returns:
-            Optional[Dict]: Ответ API или None в случае ошибки
+            tuple: (ответ API, NOT_MODIFIED или None в случае ошибки; ETag; Last-Modified)
         """
         try:
             url = f"{self.base_url}/contract/detail"
             logger.debug(f"Запрос к API: {url}")
             
-            response = self.session.get(url, timeout=30)
+            headers = dict(self._headers)
+            if snapshot.pairs:
+                if snapshot.etag:
+                    headers['If-None-Match'] = snapshot.etag
+                if snapshot.last_modified:
+                    headers['If-Modified-Since'] = snapshot.last_modified
+            
+            response = self.session.get(url, headers=headers, timeout=30)
+            if response.status_code == 304:
+                logger.debug("Список контрактов не изменился (304 Not Modified)")
+                return NOT_MODIFIED, snapshot.etag, snapshot.last_modified
             response.raise_for_status()
             
-            data = response.json()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            
+            # Ответ /contract/detail весит сотни КБ - разбираем через orjson
+            data = fast_json.loads(response.content)
             
             if not isinstance(data, dict):
                 logger.error(f"Неожиданный формат ответа API: {type(data)}")
-                return None
+                return None, None, None
                 
             if 'success' in data and not data['success']:
                 logger.error(f"API вернул ошибку: {data.get('errorMsg', 'Unknown error')}")
-                return None
+                return None, None, None
                 
-            return data
+            return data, etag, last_modified
             
         except requests.exceptions.Timeout:
             logger.error("Таймаут при запросе к API MEXC")
-            return None
+            return None, None, None
         except requests.exceptions.ConnectionError:
             logger.error("Ошибка соединения с API MEXC")
-            return None
+            return None, None, None
         except requests.exceptions.HTTPError as e:
             logger.error(f"HTTP ошибка при запросе к API: {e}")
-            return None
+            return None, None, None
         except Exception as e:
             logger.error(f"Неожиданная ошибка при запросе к API: {e}")
-            return None
+            return None, None, None
     
     def _parse_api_response(self, data: Dict) -> tuple[List[str], Dict[str, PairInfo]]:
         """
@@ -146,49 +299,22 @@ class MexcPairsFetcher:
                 logger.error(f"Ожидался список контрактов, получен: {type(contracts)}")
                 return [], {}
             
+            # Формат проверяется один раз по первому контракту, а не в каждой итерации
+            if contracts:
+                sample = contracts[0]
+                missing = [key for key in _REQUIRED_CONTRACT_KEYS 
+                           if not isinstance(sample, dict) or key not in sample]
+                if missing:
+                    logger.error(f"Изменился формат контрактов API, нет полей: {missing}")
+                    return [], {}
+            
             for contract in contracts:
-                if not isinstance(contract, dict):
-                    continue
-                    
                 symbol = contract.get('symbol')
                 if not symbol:
                     continue
                 
-                try:
-                    pair_info = PairInfo(
-                        symbol=symbol,
-                        base_coin=contract.get('baseCoin', ''),
-                        quote_coin=contract.get('quoteCoin', ''),
-                        price_scale=contract.get('priceScale', 0),
-                        qty_scale=contract.get('volScale', 0),
-                        max_leverage=contract.get('maxLeverage', 0),
-                        min_leverage=contract.get('minLeverage', 0),
-                        maintain_margin_rate=str(contract.get('maintenanceMarginRate', '')),
-                        initial_margin_rate=str(contract.get('initialMarginRate', '')),
-                        risk_base_vol=str(contract.get('riskBaseVol', '')),
-                        risk_incr_vol=str(contract.get('riskIncrVol', '')),
-                        risk_incr_mmr=str(contract.get('riskIncrMmr', '')),
-                        risk_incr_imr=str(contract.get('riskIncrImr', '')),
-                        risk_level_limit=contract.get('riskLevelLimit', 0),
-                        price_unit=str(contract.get('priceUnit', '')),
-                        vol_unit=str(contract.get('volUnit', '')),
-                        min_vol=str(contract.get('minVol', '')),
-                        max_vol=str(contract.get('maxVol', '')),
-                        bid_limit_price_rate=str(contract.get('bidLimitPriceRate', '')),
-                        ask_limit_price_rate=str(contract.get('askLimitPriceRate', '')),
-                        taker_fee_rate=str(contract.get('takerFeeRate', '')),
-                        maker_fee_rate=str(contract.get('makerFeeRate', '')),
-                        maintenance_time=str(contract.get('maintenanceTime', '')),
-                        is_new=contract.get('isNew', False),
-                        concept_plate=contract.get('conceptPlate', [])
-                    )
-                    
-                    symbols.append(symbol)
-                    pairs_info[symbol] = pair_info
-                    
-                except Exception as e:
-                    logger.warning(f"Ошибка при парсинге данных для символа {symbol}: {e}")
-                    continue
+                symbols.append(symbol)
+                pairs_info[symbol] = PairInfo.from_contract(contract)
             
             logger.info(f"Успешно спаршено {len(symbols)} торговых пар")
             return symbols, pairs_info
@@ -197,57 +323,157 @@ class MexcPairsFetcher:
             logger.error(f"Ошибка при парсинге ответа API: {e}")
             return [], {}
     
+    def _build_indexes(self, pairs_info: Mapping[str, PairInfo]) -> tuple:
+        """
+        Построение обратных индексов по базовой/котируемой валюте и объёму
+        
+        Args:
+            pairs_info (Dict[str, PairInfo]): Детальная информация о парах
+            
+        Returns:
+            tuple: (by_base, by_quote, volume_keys, volume_symbols)
+        """
+        by_base = defaultdict(list)
+        by_quote = defaultdict(list)
+        volumes = []
+        
+        for symbol, info in pairs_info.items():
+            by_base[info.base_coin.upper()].append(symbol)
+            by_quote[info.quote_coin.upper()].append(symbol)
+            try:
+                if info.min_vol:
+                    volumes.append((float(info.min_vol), symbol))
+            except (ValueError, TypeError):
+                continue
+        
+        volumes.sort()
+        return (
+            {coin: tuple(symbols) for coin, symbols in by_base.items()},
+            {coin: tuple(symbols) for coin, symbols in by_quote.items()},
+            tuple(volume for volume, _ in volumes),
+            tuple(symbol for _, symbol in volumes)
+        )
+    
+    def _swap_cache(self, current: _PairsSnapshot, fetch_started: float,
+                    pairs_info: Optional[Dict[str, PairInfo]] = None, indexes: Optional[tuple] = None, etag: Optional[str] = None,
+                    last_modified: Optional[str] = None) -> bool:
+        """
+        Публикация нового снимка кэша одним присваиванием (вызывается под _update_lock)
+        
+        Обновления могут пересекаться (фоновое и принудительное), поэтому результат
+        запроса, начатого раньше того, из которого получен текущий снимок, отбрасывается:
+        иначе последним мог бы установиться более старый список пар.
+        
+        Args:
+            current (_PairsSnapshot): Снимок, прочитанный под блокировкой
+            fetch_started (float): time.monotonic() перед запросом к API
+            pairs_info (Optional[Dict[str, PairInfo]]): Новые данные или None для 304 Not Modified
+            indexes (Optional[tuple]): Индексы, построенные _build_indexes вне блокировки
+            etag (Optional[str]): ETag ответа
+            last_modified (Optional[str]): Last-Modified ответа
+            
+        Returns:
+            bool: False если результат устарел и отброшен
+        """
+        if fetch_started < current.fetch_started:
+            self.stats['outdated_results'] += 1
+            logger.debug("Результат обновления пар устарел: кэш уже обновлён более поздним запросом")
+            return False
+        
+        now = time.monotonic()
+        wall = datetime.now()
+        if pairs_info is None:
+            self._snapshot = replace(current, fetch_started=fetch_started, updated_ts=now, updated_wall=wall)
+            return True
+        
+        by_base, by_quote, volume_keys, volume_symbols = indexes
+        version, pairs_set = current.version, current.pairs_set
+        if len(pairs_info) != len(pairs_set) or not pairs_set.issuperset(pairs_info):
+            version, pairs_set = version + 1, frozenset(pairs_info)
+        
+        self._snapshot = _PairsSnapshot(
+            pairs=tuple(pairs_info),
+            pairs_info=MappingProxyType(pairs_info),
+            version=version,
+            pairs_set=pairs_set,
+            by_base=by_base,
+            by_quote=by_quote,
+            volume_keys=volume_keys,
+            volume_symbols=volume_symbols,
+            etag=etag,
+            last_modified=last_modified,
+            fetch_started=fetch_started,
+            updated_ts=now,
+            updated_wall=wall
+        )
+        return True
+    
     def _update_cache(self) -> bool:
         """
         Обновление кэша с данными о парах
         
+        Запрос к API и парсинг выполняются без блокировки, новый снимок кэша
+        подставляется одной короткой критической секцией (copy-on-write).
+        
         Returns:
             bool: True если обновление прошло успешно
         """
-        with self._update_lock:
-            try:
-                self.stats['total_updates'] += 1
-                
-                logger.debug("Начинаю обновление кэша пар...")
-                
-                # Получаем данные от API
-                api_data = self._fetch_symbols_from_api()
-                if not api_data:
-                    self.stats['failed_updates'] += 1
-                    return False
-                
-                # Парсим ответ
-                symbols, pairs_info = self._parse_api_response(api_data)
-                
-                if not symbols:
-                    logger.error("Не получено ни одной торговой пары")
-                    self.stats['failed_updates'] += 1
-                    self.stats['last_error'] = "Empty symbols list"
-                    return False
-                
-                # Обновляем кэш
-                old_count = len(self._pairs_cache)
-                self._pairs_cache = symbols
-                self._pairs_info_cache = pairs_info
-                self._last_update = datetime.now()
-                
+        try:
+            self.stats['total_updates'] += 1
+            
+            logger.debug("Начинаю обновление кэша пар...")
+            
+            # Получаем данные от API
+            fetch_started = time.monotonic()
+            api_data, etag, last_modified = self._fetch_symbols_from_api(self._snapshot)
+            if not api_data:
+                self.stats['failed_updates'] += 1
+                return False
+            
+            if api_data is NOT_MODIFIED:
+                with self._update_lock:
+                    self._swap_cache(self._snapshot, fetch_started)
                 self.stats['successful_updates'] += 1
+                self.stats['not_modified'] += 1
                 self.stats['last_error'] = None
-                
-                logger.info(f"Кэш обновлён: {len(symbols)} пар (было: {old_count})")
-                
-                # Логируем некоторые примеры пар для отладки
-                if symbols:
-                    sample_pairs = symbols[:5]
-                    logger.debug(f"Примеры пар: {sample_pairs}")
-                
                 return True
-                
-            except Exception as e:
-                logger.error(f"Критическая ошибка при обновлении кэша: {e}")
+            
+            # Парсим ответ
+            symbols, pairs_info = self._parse_api_response(api_data)
+            
+            if not symbols:
+                logger.error("Не получено ни одной торговой пары")
                 self.stats['failed_updates'] += 1
-                self.stats['last_error'] = str(e)
+                self.stats['last_error'] = "Empty symbols list"
                 return False
+            
+            indexes = self._build_indexes(pairs_info)
+            
+            # Обновляем кэш
+            with self._update_lock:
+                current = self._snapshot
+                swapped = self._swap_cache(current, fetch_started, pairs_info, indexes, etag, last_modified)
+            
+            self.stats['successful_updates'] += 1
+            self.stats['last_error'] = None
+            if not swapped:
+                return True
+            
+            old_count = len(current.pairs)
+            logger.info(f"Кэш обновлён: {len(pairs_info)} пар (было: {old_count})")
+            
+            # Логируем некоторые примеры пар для отладки
+            if symbols:
+                sample_pairs = symbols[:5]
+                logger.debug(f"Примеры пар: {sample_pairs}")
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"Критическая ошибка при обновлении кэша: {e}")
+            self.stats['failed_updates'] += 1
+            self.stats['last_error'] = str(e)
+            return False
     
     def _background_updater(self):
         """Фоновый поток для периодического обновления"""
@@ -283,7 +509,16 @@ class MexcPairsFetcher:
         logger.info("Автоматическое обновление пар запущено")
     
     def stop_auto_update(self):
-        """Остановка автоматического обновления"""
+        """
+        Остановка автоматического обновления
+        
+        Пул фонового обновления устаревшего кэша останавливается всегда: его
+        запускает get_all_pairs независимо от того, работает ли автообновление.
+        """
+        if self._refresh_executor is not None:
+            self._refresh_executor.shutdown(wait=False)
+            self._refresh_executor = None
+        
         if not self._update_thread or not self._update_thread.is_alive():
             logger.warning("Автоматическое обновление не запущено")
             return
@@ -298,35 +533,95 @@ class MexcPairsFetcher:
             else:
                 logger.info("Автоматическое обновление остановлено")
     
-    def get_all_pairs(self, force_update: bool = False) -> List[str]:
+    def _is_cache_stale(self) -> bool:
+        """Проверка истечения срока жизни кэша"""
+        updated_ts = self._snapshot.updated_ts
+        return not updated_ts or time.monotonic() - updated_ts > self.update_interval
+    
+    def _schedule_refresh(self):
+        """
+        Запуск фонового обновления кэша, если оно ещё не выполняется
+        
+        Неблокирующий захват _refresh_lock гарантирует, что одновременно
+        выполняется не более одного фонового обновления.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        
+        try:
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="MexcPairsFetcher-Refresh"
+                )
+            self._refresh_executor.submit(self._refresh_in_background)
+            logger.debug("Кэш пар устарел, запущено фоновое обновление")
+        except Exception as e:
+            self._refresh_lock.release()
+            logger.error(f"Не удалось запустить фоновое обновление пар: {e}")
+    
+    def _refresh_in_background(self):
+        """Фоновое обновление кэша для stale-while-revalidate"""
+        try:
+            if not self._update_cache():
+                logger.warning("Фоновое обновление не удалось, продолжаем использовать устаревший кэш")
+        finally:
+            self._refresh_lock.release()
+    
+    def get_all_pairs(self, force_update: bool = False) -> Tuple[str, ...]:
         """
         Получение списка всех доступных фьючерсных пар
         
+        Если кэш устарел, возвращается текущий список, а обновление
+        выполняется в фоне. Блокирует только первая загрузка.
+        
         Args:
             force_update (bool): Принудительное обновление из API
             
         Returns:
-            List[str]: Список символов торговых пар
+            Tuple[str, ...]: Неизменяемый кортеж символов торговых пар
         """
-        # Проверяем, нужно ли обновить кэш
-        if (force_update or 
-            not self._pairs_cache or 
-            not self._last_update or 
-            datetime.now() - self._last_update > timedelta(seconds=self.update_interval)):
-            
+        # Первая загрузка или принудительное обновление - синхронно
+        if force_update or not self._snapshot.pairs:
             logger.debug("Необходимо обновление кэша пар")
             if not self._update_cache():
-                if self._pairs_cache:
+                if self._snapshot.pairs:
                     logger.warning("Обновление не удалось, используем устаревший кэш")
                 else:
                     logger.error("Обновление не удалось и кэш пуст")
-                    return []
+                    return ()
+        elif self._is_cache_stale():
+            # Кэш устарел - отдаём его сразу, а обновляем в фоне
+            self.stats['stale_hits'] += 1
+            self._schedule_refresh()
         else:
             self.stats['cache_hits'] += 1
             logger.debug("Используем данные из кэша")
         
-        return self._pairs_cache.copy()
+        return self._snapshot.pairs
+    
+    @property
+    def version(self) -> int:
+        """Версия состава пар (увеличивается только при его изменении)"""
+        return self._snapshot.version
     
+    def get_pairs_snapshot(self, force_update: bool = False) -> Tuple[int, FrozenSet[str]]:
+        """
+        Получение версии и неизменяемого множества пар
+        
+        Позволяет вызывающему коду пропускать сравнение списков, если версия
+        не изменилась с прошлого вызова. Кэш обновляется так же, как в get_all_pairs.
+        
+        Args:
+            force_update (bool): Принудительное обновление из API
+            
+        Returns:
+            Tuple[int, FrozenSet[str]]: Версия и множество символов торговых пар
+        """
+        self.get_all_pairs(force_update)
+        snapshot = self._snapshot
+        return snapshot.version, snapshot.pairs_set
+    
+    @_ensure_cache
     def get_pair_info(self, symbol: str) -> Optional[PairInfo]:
         """
         Получение детальной информации о торговой паре
@@ -337,13 +632,10 @@ class MexcPairsFetcher:
         Returns:
             Optional[PairInfo]: Информация о паре или None
         """
-        # Убеждаемся, что кэш заполнен
-        if not self._pairs_info_cache:
-            self.get_all_pairs()
-        
-        return self._pairs_info_cache.get(symbol)
+        return self._snapshot.pairs_info.get(symbol)
     
-    def get_pairs_by_base_coin(self, base_coin: str) -> List[str]:
+    @_ensure_cache
+    def get_pairs_by_base_coin(self, base_coin: str) -> Tuple[str, ...]:
         """
         Получение пар по базовой валюте
         
@@ -351,19 +643,12 @@ class MexcPairsFetcher:
             base_coin (str): Базовая валюта (например, 'BTC')
             
         Returns:
-            List[str]: Список пар с указанной базовой валютой
+            Tuple[str, ...]: Пары с указанной базовой валютой
         """
-        # Убеждаемся, что кэш заполнен
-        if not self._pairs_info_cache:
-            self.get_all_pairs()
-        
-        pairs = []
-        for symbol, info in self._pairs_info_cache.items():
-            if info.base_coin.upper() == base_coin.upper():
-                pairs.append(symbol)
-        return pairs
+        return self._snapshot.by_base.get(base_coin.upper(), ())
     
-    def get_pairs_by_quote_coin(self, quote_coin: str) -> List[str]:
+    @_ensure_cache
+    def get_pairs_by_quote_coin(self, quote_coin: str) -> Tuple[str, ...]:
         """
         Получение пар по котируемой валюте
         
@@ -371,19 +656,12 @@ class MexcPairsFetcher:
             quote_coin (str): Котируемая валюта (например, 'USDT')
             
         Returns:
-            List[str]: Список пар с указанной котируемой валютой
+            Tuple[str, ...]: Пары с указанной котируемой валютой
         """
-        # Убеждаемся, что кэш заполнен
-        if not self._pairs_info_cache:
-            self.get_all_pairs()
-        
-        pairs = []
-        for symbol, info in self._pairs_info_cache.items():
-            if info.quote_coin.upper() == quote_coin.upper():
-                pairs.append(symbol)
-        return pairs
+        return self._snapshot.by_quote.get(quote_coin.upper(), ())
     
-    def filter_pairs_by_volume(self, min_volume: str = "1000000") -> List[str]:
+    @_ensure_cache
+    def filter_pairs_by_volume(self, min_volume: str = "1000000") -> Tuple[str, ...]:
         """
         Фильтрация пар по минимальному объёму
         
@@ -391,25 +669,17 @@ class MexcPairsFetcher:
             min_volume (str): Минимальный объём
             
         Returns:
-            List[str]: Список пар, удовлетворяющих критерию
+            Tuple[str, ...]: Пары, удовлетворяющие критерию (по возрастанию объёма)
         """
-        # Убеждаемся, что кэш заполнен
-        if not self._pairs_info_cache:
-            self.get_all_pairs()
-            
-        pairs = []
         try:
             min_vol_float = float(min_volume)
-            for symbol, info in self._pairs_info_cache.items():
-                try:
-                    if info.min_vol and float(info.min_vol) >= min_vol_float:
-                        pairs.append(symbol)
-                except (ValueError, TypeError):
-                    continue
         except ValueError:
             logger.error(f"Некорректное значение минимального объёма: {min_volume}")
+            return ()
         
-        return pairs
+        # Индекс отсортирован по объёму - ищем порог бинарным поиском
+        snapshot = self._snapshot
+        return snapshot.volume_symbols[bisect_left(snapshot.volume_keys, min_vol_float):]
     
     def get_cache_info(self) -> Dict:
         """
@@ -418,9 +688,10 @@ class MexcPairsFetcher:
         Returns:
             Dict: Информация о кэше и статистике
         """
+        snapshot = self._snapshot
         return {
-            'pairs_count': len(self._pairs_cache),
-            'last_update': self._last_update.isoformat() if self._last_update else None,
+            'pairs_count': len(snapshot.pairs),
+            'last_update': snapshot.updated_wall.isoformat() if snapshot.updated_wall else None,
             'update_interval': self.update_interval,
             'auto_update_running': self._update_thread and self._update_thread.is_alive(),
             'stats': self.stats.copy()
@@ -458,7 +729,7 @@ def get_pairs_fetcher(update_interval: int = 3600) -> MexcPairsFetcher:
     return _global_fetcher
 
 
-def get_all_futures_pairs(force_update: bool = False) -> List[str]:
+def get_all_futures_pairs(force_update: bool = False) -> Tuple[str, ...]:
     """
     Удобная функция для получения всех фьючерсных пар
     
@@ -466,7 +737,7 @@ def get_all_futures_pairs(force_update: bool = False) -> List[str]:
         force_update (bool): Принудительное обновление
         
     Returns:
-        List[str]: Список всех доступных торговых пар
+        Tuple[str, ...]: Кортеж всех доступных торговых пар
     """
     fetcher = get_pairs_fetcher()
     return fetcher.get_all_pairs(force_update=force_update)
@@ -4,14 +4,126 @@ REST API клиент для получения данных с биржи MEXC
 оддержка мультипарности и мульти-таймфрейм
 """
 
+import asyncio
+import threading
+import time
 import requests
+import aiohttp
 import logging
-from typing import List, Dict, Optional
-from src.config import MEXC_API_BASE_URL
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Tuple, AsyncIterator
+from src.config import MEXC_API_BASE_URL, MEXC_API_RATE_LIMIT, MEXC_API_RATE_BURST
+from src.utils import fast_json
+
+try:
+    import numpy as np
+except ImportError:  # NumPy нужен только для get_klines_arrays
+    np = None
 
 # астройка логгера
 logger = logging.getLogger(__name__)
 
+# Размер пула keep-alive соединений requests-сессии
+HTTP_POOL_SIZE = 64
+
+# Конвейер загрузки свечей: лимит неразобранных ответов и порог разбора в пуле потоков
+PIPELINE_QUEUE_SIZE = 16
+DECODE_IN_EXECUTOR_THRESHOLD = 64 * 1024
+
+
+class TokenBucket:
+    """
+    Потокобезопасный token bucket для соблюдения лимита запросов к API
+    
+    Токены пополняются со скоростью rate в секунду до capacity. Каждый запрос
+    резервирует токен; если токенов нет, вызывающий ждёт время до их пополнения.
+    Общий для синхронных потоков и asyncio-задач.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate (float): Скорость пополнения (запросов в секунду)
+            capacity (float): Максимальный запас токенов (допустимый всплеск)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """
+        Резервирование одного токена
+        
+        Returns:
+            float: Сколько секунд нужно подождать перед запросом
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def acquire(self):
+        """Блокирующее получение токена"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def acquire_async(self):
+        """Асинхронное получение токена"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Общие для всех клиентов ресурсы: один пул HTTP-соединений и один лимит запросов,
+# так как MEXC ограничивает публичные эндпоинты по IP, а не по клиенту
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+_shared_rate_limiter = TokenBucket(MEXC_API_RATE_LIMIT, MEXC_API_RATE_BURST)
+
+
+def get_shared_session() -> requests.Session:
+    """
+    Получение общей requests-сессии для REST API MEXC
+    
+    Returns:
+        requests.Session: Сессия с пулом keep-alive соединений
+    """
+    global _shared_session
+    
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                session = requests.Session()
+                session.headers.update({
+                    'User-Agent': 'MEXC-Bot/1.0',
+                    'Content-Type': 'application/json'
+                })
+                
+                # Пул соединений больше стандартных 10, чтобы потоки не ждали друг друга
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _shared_session = session
+    
+    return _shared_session
+
+
+def close_shared_session():
+    """Закрытие общей requests-сессии (при завершении приложения)"""
+    global _shared_session
+    
+    with _shared_session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
+
 
 class MexcRestClient:
     """
@@ -19,16 +131,77 @@ class MexcRestClient:
     олучает исторические данные по свечам (K-line) для любых пар и таймфреймов
     """
     
-    def __init__(self):
-        """нициализация клиента"""
+    def __init__(self, rate_limit: Optional[float] = None, rate_burst: Optional[float] = None):
+        """
+        нициализация клиента
+        
+        Args:
+            rate_limit (Optional[float]): Собственный лимит запросов в секунду
+                (по умолчанию общий для всех клиентов лимит из конфига)
+            rate_burst (Optional[float]): Допустимый всплеск запросов
+        """
         self.base_url = MEXC_API_BASE_URL
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'MEXC-Bot/1.0',
-            'Content-Type': 'application/json'
-        })
+        if rate_limit is None and rate_burst is None:
+            self.rate_limiter = _shared_rate_limiter
+        else:
+            self.rate_limiter = TokenBucket(rate_limit or MEXC_API_RATE_LIMIT, 
+                                            rate_burst or MEXC_API_RATE_BURST)
+        self.session = get_shared_session()
+        
+        # aiohttp сессии для асинхронных запросов - создаются лениво, по одной на event loop
+        # (фоновый loop get_klines_many и loop вызывающего кода в async-режиме)
+        self._async_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._sessions_lock = threading.Lock()
+        
+        # Долгоживущий event loop в фоновом потоке для синхронного get_klines_many:
+        # aiohttp сессия и её keep-alive соединения переживают отдельные вызовы
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
         logger.debug("нициализирован MEXC REST клиент")
     
+    @staticmethod
+    def _parse_klines(raw_data: Dict) -> List[Dict]:
+        """
+        Преобразование ответа /contract/kline (массивы по полям) в список свечей OHLCV
+        
+        Args:
+            raw_data (Dict): Поле 'data' ответа API
+            
+        Returns:
+            List[Dict]: Список свечей {'t', 'o', 'h', 'l', 'c', 'q'}
+        """
+        if not raw_data.get('time'):
+            return []
+        
+        return [
+            {'t': t * 1000, 'o': o, 'h': h, 'l': l, 'c': c, 'q': q}  # t в миллисекундах, q - volume
+            for t, o, h, l, c, q in zip(raw_data['time'], raw_data['open'], raw_data['high'],
+                                        raw_data['low'], raw_data['close'], raw_data['vol'])
+        ]
+    
+    @staticmethod
+    def _klines_to_arrays(raw_data: Dict) -> Dict[str, "np.ndarray"]:
+        """
+        Преобразование ответа /contract/kline в столбцы NumPy без промежуточных словарей
+        
+        Args:
+            raw_data (Dict): Поле 'data' ответа API
+            
+        Returns:
+            Dict[str, np.ndarray]: {'t': int64 (мс), 'o'/'h'/'l'/'c'/'q': float64}
+        """
+        times = np.asarray(raw_data.get('time', ()), dtype=np.int64)
+        np.multiply(times, 1000, out=times)
+        return {
+            't': times,
+            'o': np.asarray(raw_data.get('open', ()), dtype=np.float64),
+            'h': np.asarray(raw_data.get('high', ()), dtype=np.float64),
+            'l': np.asarray(raw_data.get('low', ()), dtype=np.float64),
+            'c': np.asarray(raw_data.get('close', ()), dtype=np.float64),
+            'q': np.asarray(raw_data.get('vol', ()), dtype=np.float64)
+        }
+    
     def get_klines(self, pair: str, interval: str = "Min1", limit: int = 50) -> Optional[List[Dict]]:
         """
         олучение K-line (свечей) для указанной торговой пары и таймфрейма
@@ -41,34 +214,23 @@ class MexcRestClient:
                 'limit': limit
             }
             
-            logger.debug(f"олучаем {limit} свечей для пары {pair} с интервалом {interval}")
+            logger.debug("олучаем %s свечей для пары %s с интервалом %s", limit, pair, interval)
             
             # ыполняем запрос
+            self.rate_limiter.acquire()
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
             # арсим ответ
-            data = response.json()
+            data = fast_json.loads(response.content)
             
             if data.get('success') and 'data' in data:
                 raw_data = data['data']
                 
                 # реобразуем данные в нужный формат (массив объектов OHLCV)
-                klines = []
-                if 'time' in raw_data and len(raw_data['time']) > 0:
-                    count = len(raw_data['time'])
-                    for i in range(count):
-                        kline = {
-                            't': raw_data['time'][i] * 1000,  # ереводим в миллисекунды
-                            'o': raw_data['open'][i],
-                            'h': raw_data['high'][i], 
-                            'l': raw_data['low'][i],
-                            'c': raw_data['close'][i],
-                            'q': raw_data['vol'][i]  # volume
-                        }
-                        klines.append(kline)
+                klines = self._parse_klines(raw_data)
                 
-                logger.debug(f"спешно получено {len(klines)} свечей для {pair} ({interval})")
+                logger.debug("спешно получено %s свечей для %s (%s)", len(klines), pair, interval)
                 return klines
             else:
                 logger.error(f"шибка в ответе API для {pair} ({interval}): {data}")
@@ -81,6 +243,48 @@ class MexcRestClient:
             logger.error(f"еожиданная ошибка при получении данных для {pair} ({interval}): {e}")
             return None
     
+    def get_klines_arrays(self, pair: str, interval: str = "Min1", 
+                          limit: int = 50) -> Optional[Dict[str, "np.ndarray"]]:
+        """
+        Получение свечей в виде столбцов NumPy (структура массивов, как в ответе API)
+        
+        Args:
+            pair (str): Торговая пара
+            interval (str): Таймфрейм
+            limit (int): Количество свечей
+            
+        Returns:
+            Dict[str, np.ndarray]: Столбцы 't', 'o', 'h', 'l', 'c', 'q' или None при ошибке
+        """
+        if np is None:
+            logger.error("NumPy не установлен - get_klines_arrays недоступен")
+            return None
+        
+        try:
+            url = f"{self.base_url}/contract/kline/{pair}"
+            params = {
+                'interval': interval,
+                'limit': limit
+            }
+            
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=params, timeout=10)
+            response.raise_for_status()
+            data = fast_json.loads(response.content)
+            
+            if data.get('success') and 'data' in data:
+                return self._klines_to_arrays(data['data'])
+            
+            logger.error(f"Ошибка в ответе API для {pair} ({interval}): {data}")
+            return None
+            
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Ошибка при запросе к API для {pair} ({interval}): {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Неожиданная ошибка при получении данных для {pair} ({interval}): {e}")
+            return None
+    
     def get_latest_kline(self, pair: str, interval: str = "Min1") -> Optional[Dict]:
         """
         олучение последней свечи для анализа
@@ -90,7 +294,315 @@ class MexcRestClient:
             return klines[0]
         return None
     
+    def fetch_klines_many(self, pairs: List[str], interval: str = "Min1",
+                          limit: int = 50) -> Dict[str, Optional[List[Dict]]]:
+        """
+        Получение свечей для списка пар одного таймфрейма
+        
+        Обёртка над get_klines_many с ключами по паре: загрузка идёт тем же
+        пакетом в event loop клиента, без отдельного пула потоков.
+        
+        Args:
+            pairs (List[str]): Список торговых пар
+            interval (str): Таймфрейм
+            limit (int): Количество свечей
+            
+        Returns:
+            Dict[str, Optional[List[Dict]]]: {pair: список свечей или None}
+        """
+        klines_map = self.get_klines_many([(pair, interval, limit) for pair in pairs])
+        return {pair: klines for (pair, _), klines in klines_map.items()}
+    
+    async def _get_async_session(self) -> aiohttp.ClientSession:
+        """
+        Получение aiohttp сессии для текущего event loop (keep-alive пул соединений)
+        
+        Returns:
+            aiohttp.ClientSession: Сессия, привязанная к текущему event loop
+        """
+        loop = asyncio.get_running_loop()
+        session = self._async_sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=90),
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers=dict(self.session.headers)
+            )
+            with self._sessions_lock:
+                self._async_sessions[loop] = session
+            logger.debug("Создана aiohttp сессия REST клиента")
+            # Заодно закрываем сессии уже завершившихся event loop (например, asyncio.run)
+            await self._close_sessions(self._pop_sessions(lambda session_loop: session_loop.is_closed()))
+        return session
+    
+    def _pop_sessions(self, predicate) -> List[aiohttp.ClientSession]:
+        """Изъятие сессий, чей event loop удовлетворяет условию"""
+        with self._sessions_lock:
+            loops = [loop for loop in self._async_sessions if predicate(loop)]
+            return [self._async_sessions.pop(loop) for loop in loops]
+    
+    @staticmethod
+    async def _close_sessions(sessions: List[aiohttp.ClientSession]):
+        """
+        Закрытие aiohttp сессий
+        
+        Для сессии закрытого event loop aiohttp только сбрасывает пул соединений,
+        поэтому её можно закрыть из любого loop.
+        """
+        for session in sessions:
+            if not session.closed:
+                try:
+                    await session.close()
+                except Exception as e:
+                    logger.warning(f"Ошибка закрытия aiohttp сессии REST клиента: {e}")
+    
+    async def _fetch_kline_bytes(self, session: aiohttp.ClientSession, 
+                                 pair: str, interval: str, limit: int) -> Optional[bytes]:
+        """
+        Сетевая стадия: загрузка тела ответа /contract/kline без разбора JSON
+        
+        Returns:
+            Optional[bytes]: Тело ответа или None при ошибке
+        """
+        try:
+            url = f"{self.base_url}/contract/kline/{pair}"
+            params = {
+                'interval': interval,
+                'limit': limit
+            }
+            
+            await self.rate_limiter.acquire_async()
+            async with session.get(url, params=params) as response:
+                response.raise_for_status()
+                return await response.read()
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Ошибка при запросе к API для {pair} ({interval}): {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Неожиданная ошибка при получении данных для {pair} ({interval}): {e}")
+            return None
+    
+    async def _decode_klines(self, pair: str, interval: str, body: Optional[bytes]) -> Optional[List[Dict]]:
+        """
+        Стадия разбора: JSON -> список свечей
+        
+        Крупные ответы разбираются в пуле потоков, чтобы не задерживать
+        event loop и параллельно идущие загрузки.
+        
+        Returns:
+            Optional[List[Dict]]: Список свечей или None при ошибке
+        """
+        if body is None:
+            return None
+        
+        try:
+            if len(body) > DECODE_IN_EXECUTOR_THRESHOLD:
+                data = await asyncio.get_running_loop().run_in_executor(None, fast_json.loads, body)
+            else:
+                data = fast_json.loads(body)
+            
+            if data.get('success') and 'data' in data:
+                return self._parse_klines(data['data'])
+            
+            logger.error(f"Ошибка в ответе API для {pair} ({interval}): {data}")
+            return None
+            
+        except Exception as e:
+            logger.error(f"Ошибка разбора ответа API для {pair} ({interval}): {e}")
+            return None
+    
+    async def get_klines_async(self, pair: str, interval: str = "Min1", limit: int = 50) -> Optional[List[Dict]]:
+        """
+        Асинхронное получение K-line (свечей) для указанной торговой пары и таймфрейма
+        
+        Args:
+            pair (str): Торговая пара (например, BTC_USDT)
+            interval (str): Таймфрейм (например, Min1)
+            limit (int): Количество свечей
+            
+        Returns:
+            List[Dict]: Список свечей или None при ошибке
+        """
+        session = await self._get_async_session()
+        body = await self._fetch_kline_bytes(session, pair, interval, limit)
+        return await self._decode_klines(pair, interval, body)
+    
+    async def iter_klines_many_async(self, requests_list: List[Tuple[str, str, int]], 
+                                     queue_size: int = PIPELINE_QUEUE_SIZE
+                                     ) -> AsyncIterator[Tuple[Tuple[str, str], Optional[List[Dict]]]]:
+        """
+        Конвейерная загрузка свечей: результаты отдаются по мере готовности
+        
+        Загрузки идут конкурентно и складывают сырые ответы в ограниченную
+        очередь, а разбор JSON выполняется потребителем параллельно с
+        оставшимися загрузками. Размер очереди задаёт обратное давление.
+        
+        Args:
+            requests_list: Список запросов [(pair, interval, limit), ...]
+            queue_size (int): Максимум неразобранных ответов в очереди
+            
+        Yields:
+            Tuple: ((pair, interval), список свечей или None)
+        """
+        if not requests_list:
+            return
+        
+        session = await self._get_async_session()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        
+        async def produce(pair: str, interval: str, limit: int):
+            body = await self._fetch_kline_bytes(session, pair, interval, limit)
+            await queue.put((pair, interval, body))
+        
+        producers = [
+            asyncio.create_task(produce(pair, interval, limit))
+            for pair, interval, limit in requests_list
+        ]
+        
+        try:
+            for _ in range(len(producers)):
+                pair, interval, body = await queue.get()
+                yield (pair, interval), await self._decode_klines(pair, interval, body)
+        finally:
+            for task in producers:
+                if not task.done():
+                    task.cancel()
+    
+    async def get_latest_kline_async(self, pair: str, interval: str = "Min1") -> Optional[Dict]:
+        """
+        Асинхронное получение последней свечи для анализа
+        """
+        klines = await self.get_klines_async(pair=pair, interval=interval, limit=1)
+        if klines and len(klines) > 0:
+            return klines[0]
+        return None
+    
+    async def get_klines_many_async(self, 
+                                    requests_list: List[Tuple[str, str, int]]) -> Dict[Tuple[str, str], Optional[List[Dict]]]:
+        """
+        Конкурентное получение свечей для множества пар/таймфреймов
+        
+        Args:
+            requests_list: Список запросов [(pair, interval, limit), ...]
+            
+        Returns:
+            Dict: {(pair, interval): список свечей или None}
+        """
+        return {
+            key: klines
+            async for key, klines in self.iter_klines_many_async(requests_list)
+        }
+    
+    def get_klines_many(self, 
+                        requests_list: List[Tuple[str, str, int]]) -> Dict[Tuple[str, str], Optional[List[Dict]]]:
+        """
+        Синхронная обёртка над get_klines_many_async для legacy-кода
+        
+        Все запросы выполняются одновременно в долгоживущем event loop клиента
+        (фоновый поток), поэтому общее время близко к времени самого медленного
+        запроса, а aiohttp сессия с keep-alive соединениями переиспользуется
+        между вызовами. Закрывается вместе с клиентом в close().
+        
+        Args:
+            requests_list: Список запросов [(pair, interval, limit), ...]
+            
+        Returns:
+            Dict: {(pair, interval): список свечей или None}
+            
+        Raises:
+            RuntimeError: При вызове из работающего event loop - там нужен
+                get_klines_many_async, иначе ожидание заблокирует этот loop
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("get_klines_many блокирует поток: внутри event loop "
+                               "используйте await get_klines_many_async()")
+        
+        future = asyncio.run_coroutine_threadsafe(
+            self.get_klines_many_async(requests_list), self._get_background_loop()
+        )
+        return future.result()
+    
+    def _get_background_loop(self) -> asyncio.AbstractEventLoop:
+        """Event loop фонового потока клиента (запускается при первом обращении)"""
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="MexcRestClient-Loop", daemon=True)
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+                logger.debug("Запущен фоновый event loop REST клиента")
+            return self._loop
+    
+    def _stop_background_loop(self, sessions: List[aiohttp.ClientSession] = ()):
+        """
+        Закрытие сессий в фоновом loop и остановка его потока
+        
+        Args:
+            sessions: Сессии, которые нужно закрыть (фонового loop и завершившихся loop)
+        """
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        
+        if loop is None:
+            if sessions:
+                self._close_sessions_sync(sessions)
+            return
+        
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_sessions(sessions), loop).result(timeout=5)
+        except Exception as e:
+            logger.warning(f"Не удалось закрыть aiohttp сессию REST клиента: {e}")
+        
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        if not thread.is_alive():
+            loop.close()
+    
+    def _close_sessions_sync(self, sessions: List[aiohttp.ClientSession]):
+        """Закрытие сессий во временном event loop (фоновый loop не запускался)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self._close_sessions(sessions))
+            finally:
+                loop.close()
+        else:
+            logger.warning("close() вызван внутри event loop: используйте await close_async()")
+    
+    async def close_async(self):
+        """Закрытие aiohttp сессий текущего и уже завершившихся event loop"""
+        loop = asyncio.get_running_loop()
+        await self._close_sessions(self._pop_sessions(
+            lambda session_loop: session_loop is loop or session_loop.is_closed()
+        ))
+    
     def close(self):
-        """акрытие сессии"""
+        """
+        акрытие клиента
+        
+        requests-сессия общая для всех клиентов и закрывается через close_shared_session().
+        Фоновый event loop get_klines_many останавливается здесь.
+        """
         logger.debug("акрытие REST клиента")
-        self.session.close()
+        with self._sessions_lock:
+            sessions = list(self._async_sessions.items())
+            self._async_sessions.clear()
+        
+        # Сессию работающего чужого loop закрываем в нём самом, остальные
+        # (фонового loop и завершившихся loop) - в фоновом loop перед его остановкой
+        background = self._loop
+        remaining = []
+        for loop, session in sessions:
+            if loop is not background and loop.is_running():
+                asyncio.run_coroutine_threadsafe(self._close_sessions([session]), loop)
+            else:
+                remaining.append(session)
+        self._stop_background_loop(remaining)
@@ -14,16 +14,22 @@ WebSocket клиент для real-time анализа всех контракт
 """
 
 import asyncio
+import heapq
 import json
 import logging
+import os
+import random
+import socket
+import threading
 import time
 import weakref
 from asyncio import Queue, Event, TaskGroup
+from collections import deque
 from contextlib import AsyncExitStack
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Set, Callable, Any, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Set, Callable, Any, Tuple, Union
 from urllib.parse import urljoin
 
 import aiohttp
@@ -31,6 +37,7 @@ from aiohttp import WSMsgType, ClientWebSocketResponse, ClientSession
 
 from src.data.pairs_fetcher import MexcPairsFetcher, get_pairs_fetcher
 from src.utils.logger import setup_main_logger
+from src.utils import fast_json
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +53,62 @@ class SubscriptionType(Enum):
     DEALS = "deals"             # Торговые сделки
 
 
+# Шаблоны имён каналов MEXC по типу подписки ({sym} - символ без подчёркивания)
+_SUB_TYPE_TEMPLATES: Dict[SubscriptionType, str] = {
+    SubscriptionType.TICKER: "spot@public.market.ticker.v3.{sym}",
+    SubscriptionType.DEPTH: "spot@public.market.depth.v3.{sym}",
+    SubscriptionType.DEALS: "spot@public.market.deals.v3.{sym}",
+    **{
+        sub_type: f"spot@public.market.kline.{sub_type.value.replace('kline_', '')}.{{sym}}"
+        for sub_type in SubscriptionType
+        if sub_type.value.startswith("kline_")
+    }
+}
+
+# Готовые шаблоны кадров подписки/отписки: меняется только список каналов.
+# Имена каналов строятся из _SUB_TYPE_TEMPLATES и не требуют экранирования
+_FRAME_TEMPLATES: Dict[str, str] = {
+    method: '{"method":"%s","params":["%%s"]}' % method
+    for method in ("SUBSCRIPTION", "UNSUBSCRIPTION")
+}
+
+# Метрики подключения обновляются раз в 64 сообщения (маска для проверки count & mask == 0)
+METRICS_FLUSH_EVERY = 64
+_METRICS_FLUSH_MASK = METRICS_FLUSH_EVERY - 1
+
+# Ключ канала в рыночных push-сообщениях: кадры без него отсекаются до разбора JSON
+_CHANNEL_KEY = '"c"'
+_CHANNEL_KEY_BYTES = _CHANNEL_KEY.encode()
+
+# Котируемые активы для преобразования BTCUSDT -> BTC_USDT (порядок важен: USDT раньше USD)
+_QUOTES = (("USDT", 4), ("USD", 3))
+
+# Кэш преобразованных символов: множество пар ограничено, поэтому кэш быстро стабилизируется
+_SYMBOL_CACHE: Dict[str, str] = {}
+
+
+def _format_symbol(symbol_raw: str) -> str:
+    """
+    Преобразование символа из канала WebSocket в формат торговой пары
+    
+    Args:
+        symbol_raw (str): Символ из канала, например BTCUSDT
+        
+    Returns:
+        str: Символ пары, например BTC_USDT
+    """
+    symbol = _SYMBOL_CACHE.get(symbol_raw)
+    if symbol is None:
+        symbol = symbol_raw
+        if len(symbol_raw) >= 6:
+            for quote, size in _QUOTES:
+                if symbol_raw.endswith(quote):
+                    symbol = f"{symbol_raw[:-size]}_{quote}"
+                    break
+        _SYMBOL_CACHE[symbol_raw] = symbol
+    return symbol
+
+
 class ConnectionState(Enum):
     """Состояния WebSocket подключения"""
     DISCONNECTED = "disconnected"
@@ -55,26 +118,34 @@ class ConnectionState(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class WSMessage:
     """Структура для входящих WebSocket сообщений"""
     channel: str
     symbol: str
     data: Dict[str, Any]
-    timestamp: datetime = field(default_factory=datetime.now)
-    raw_message: Dict[str, Any] = field(default_factory=dict)
+    timestamp: int = field(default_factory=time.time_ns)  # Время получения, нс с эпохи
+    raw: Optional[Union[str, bytes]] = None  # Исходный кадр без разбора
+    
+    @property
+    def raw_message(self) -> Dict[str, Any]:
+        """Полное исходное сообщение (разбирается из raw только при обращении)"""
+        if self.raw is None:
+            return {}
+        return fast_json.loads(self.raw)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionMetrics:
     """Метрики для мониторинга подключения"""
     connection_id: str
     connected_at: Optional[datetime] = None
-    last_message_at: Optional[datetime] = None
+    last_message_at: Optional[float] = None  # time.monotonic() последнего сообщения
     messages_received: int = 0
     reconnect_count: int = 0
     subscriptions_count: int = 0
     error_count: int = 0
+    ping_rtt: Optional[float] = None  # Последнее измеренное время ping-pong в секундах
     is_healthy: bool = True
 
 
@@ -96,12 +167,21 @@ class MexcWebSocketClient:
     RECONNECT_DELAY = 5  # Базовая задержка переподключения
     MAX_RECONNECT_ATTEMPTS = 10
     MESSAGE_TIMEOUT = 60  # Таймаут ожидания сообщений
+    SUBSCRIPTION_BATCH_SIZE = 30  # Каналов в одном кадре SUBSCRIPTION/UNSUBSCRIPTION
+    SOCKET_SEND_BUFFER = 128 * 1024  # Буфер отправки сокета (SO_SNDBUF) для серий кадров
+    HEALTH_CHECK_INTERVAL = 30  # Резервная периодическая проверка (основная - по событиям)
+    MESSAGE_BATCH_SIZE = 256    # Максимум сообщений в одной пачке для batch_handler
     
     def __init__(self, 
                  pairs_fetcher: Optional[MexcPairsFetcher] = None,
                  subscription_types: List[SubscriptionType] = None,
                  event_handler: Optional[Callable[[WSMessage], None]] = None,
-                 error_handler: Optional[Callable[[Exception, str], None]] = None):
+                 error_handler: Optional[Callable[[Exception, str], None]] = None,
+                 message_workers: Optional[int] = None,
+                 message_queue_size: int = 10000,
+                 inline_dispatch: bool = True,
+                 shards: int = 0,
+                 batch_handler: Optional[Callable[[List[WSMessage]], None]] = None):
         """
         Инициализация WebSocket клиента
         
@@ -110,6 +190,12 @@ class MexcWebSocketClient:
             subscription_types: Типы подписок для каждой пары
             event_handler: Обработчик входящих событий
             error_handler: Обработчик ошибок
+            message_workers: Число воркеров обработки сообщений (по умолчанию по числу CPU)
+            message_queue_size: Ёмкость очереди входящих сообщений
+            inline_dispatch: Вызывать обработчик прямо из цикла чтения, минуя очередь
+            shards: Число потоков со своими event loop для подключений (0 - все в текущем цикле)
+            batch_handler: Обработчик пачек сообщений; если задан, заменяет event_handler,
+                а сообщения всегда идут через очередь (без inline-обработки)
         """
         logger.info("🌐 Инициализация MEXC Futures WebSocket клиента...")
         
@@ -123,28 +209,71 @@ class MexcWebSocketClient:
         
         # Обработчики событий
         self.event_handler = event_handler
+        self.batch_handler = batch_handler
         self.error_handler = error_handler or self._default_error_handler
         
+        # Тип обработчиков определяем один раз, а не на каждое сообщение
+        self._dispatch = (
+            self._dispatch_async if asyncio.iscoroutinefunction(event_handler)
+            else self._dispatch_sync
+        )
+        self._dispatch_batch = (
+            self._dispatch_batch_async if asyncio.iscoroutinefunction(batch_handler)
+            else self._dispatch_batch_sync
+        )
+        self._dispatch_error = (
+            self._dispatch_error_async if asyncio.iscoroutinefunction(self.error_handler)
+            else self._dispatch_error_sync
+        )
+        
         # Состояние системы
         self.is_running = False
         self.shutdown_event = Event()
-        self.message_queue: Queue[WSMessage] = Queue(maxsize=10000)
+        self.ready_event = Event()  # Выставляется, когда первое подключение установлено
+        self.message_queue: Queue[Optional[WSMessage]] = Queue(maxsize=message_queue_size)
+        self.message_workers = message_workers or os.cpu_count() or 4
+        
+        # Inline-обработка: не более message_workers обработчиков одновременно
+        # удерживают циклы чтения, остальные сообщения идут через очередь
+        self.inline_dispatch = inline_dispatch
+        self._inline_semaphore = asyncio.Semaphore(self.message_workers)
         
         # Управление соединениями
         self.connections: Dict[str, 'WSConnection'] = {}
-        self.connection_tasks: Dict[str, asyncio.Task] = {}
+        self.connection_tasks: Dict[str, asyncio.Future] = {}
         self.current_pairs: Set[str] = set()
         self.pair_to_connection: Dict[str, str] = {}  # mapping: pair -> connection_id
         
+        # Min-heap нагрузки (load, connection_id, version) с ленивой инвалидацией:
+        # запись актуальна, только если version совпадает с _load_version[connection_id]
+        self._load_heap: List[Tuple[int, str, int]] = []
+        self._load_version: Dict[str, int] = {}
+        
         # Мониторинг
         self.metrics: Dict[str, ConnectionMetrics] = {}
         self.start_time = datetime.now()
         self.total_messages_processed = 0
+        self.dropped_messages = 0      # Сообщения, отброшенные при переполненной очереди
+        self.queue_high_water = 0      # Максимальная наблюдавшаяся длина очереди
+        
+        # Шардирование подключений по потокам: каждый шард - отдельный поток со своим
+        # event loop; сообщения из шардов передаются в основной цикл через _shard_inbox
+        self.shard_count = max(0, shards)
+        self._shards: List[_LoopShard] = []
+        self._next_shard = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._shard_inbox: deque = deque()
+        self._shard_drain_scheduled = False
+        
+        # Общая HTTP-сессия для всех подключений: DNS-кэш и TLS-сессии
+        # переиспользуются при массовых переподключениях
+        self._http_session: Optional[ClientSession] = None
         
         # Служебные задачи
         self.pairs_monitor_task: Optional[asyncio.Task] = None
-        self.message_processor_task: Optional[asyncio.Task] = None
+        self.message_worker_tasks: List[asyncio.Task] = []
         self.health_monitor_task: Optional[asyncio.Task] = None
+        self.start_task: Optional[asyncio.Task] = None
         
         logger.info(f"✅ WebSocket клиент инициализирован")
         logger.info(f"📡 Типы подписок: {[t.value for t in self.subscription_types]}")
@@ -158,8 +287,12 @@ class MexcWebSocketClient:
         logger.info("🚀 Запуск WebSocket клиента...")
         self.is_running = True
         self.shutdown_event.clear()
+        self.ready_event.clear()
         
         try:
+            self._get_http_session()
+            self._start_shards()
+            
             async with TaskGroup() as tg:
                 # Запускаем основные задачи
                 self.pairs_monitor_task = tg.create_task(
@@ -167,10 +300,14 @@ class MexcWebSocketClient:
                     name="pairs_monitor"
                 )
                 
-                self.message_processor_task = tg.create_task(
-                    self._process_messages(),
-                    name="message_processor"
-                )
+                # Фиксированный пул воркеров вместо задачи на каждое сообщение
+                self.message_worker_tasks = [
+                    tg.create_task(
+                        self._message_worker(worker_id),
+                        name=f"message_worker_{worker_id}"
+                    )
+                    for worker_id in range(self.message_workers)
+                ]
                 
                 self.health_monitor_task = tg.create_task(
                     self._monitor_health(),
@@ -180,6 +317,10 @@ class MexcWebSocketClient:
                 # Инициальная настройка подключений
                 await self._initialize_connections()
                 
+                # Без пар ждать нечего - клиент готов сразу
+                if not self.connections:
+                    self.ready_event.set()
+                
                 logger.info("✅ WebSocket клиент успешно запущен")
                 
                 # Ожидаем сигнал остановки
@@ -199,6 +340,13 @@ class MexcWebSocketClient:
         logger.info("🛑 Остановка WebSocket клиента...")
         self.is_running = False
         self.shutdown_event.set()
+        
+        # По одному sentinel на воркер - воркеры завершаются без опроса по таймауту
+        for task in self.message_worker_tasks:
+            try:
+                self.message_queue.put_nowait(None)
+            except asyncio.QueueFull:
+                task.cancel()
 
     async def _initialize_connections(self) -> None:
         """Инициальная настройка подключений для всех пар"""
@@ -256,22 +404,34 @@ class MexcWebSocketClient:
         try:
             logger.info(f"🔗 Создание подключения {connection_id} для {len(pairs)} пар...")
             
-            # Создаем объект подключения
+            # Подключения распределяются по шардам по кругу
+            shard = None
+            if self._shards:
+                shard = self._shards[self._next_shard % len(self._shards)]
+                self._next_shard += 1
+            
+            # Создаем объект подключения (сессия основного цикла в шарде недоступна)
             connection = WSConnection(
                 connection_id=connection_id,
                 client=weakref.ref(self),
                 pairs=pairs,
-                subscription_types=self.subscription_types
+                subscription_types=self.subscription_types,
+                session=self._get_http_session() if shard is None else None,
+                shard=shard
             )
             
             self.connections[connection_id] = connection
             self.metrics[connection_id] = ConnectionMetrics(connection_id=connection_id)
+            self._update_connection_load(connection_id)
             
-            # Запускаем подключение в отдельной задаче
-            task = asyncio.create_task(
-                connection.run(),
-                name=f"connection_{connection_id}"
-            )
+            # Запускаем подключение в отдельной задаче (или в цикле шарда)
+            if shard is None:
+                task = asyncio.create_task(
+                    connection.run(),
+                    name=f"connection_{connection_id}"
+                )
+            else:
+                task = shard.submit(connection.run())
             self.connection_tasks[connection_id] = task
             
             logger.info(f"✅ Подключение {connection_id} создано")
@@ -286,7 +446,12 @@ class MexcWebSocketClient:
         
         while self.is_running:
             try:
-                await asyncio.sleep(60)  # Проверяем каждую минуту
+                # Проверяем каждую минуту; остановка клиента прерывает ожидание сразу
+                try:
+                    await asyncio.wait_for(self.shutdown_event.wait(), timeout=60)
+                    break
+                except asyncio.TimeoutError:
+                    pass
                 
                 new_pairs = set(self.pairs_fetcher.get_all_pairs())
                 
@@ -325,8 +490,9 @@ class MexcWebSocketClient:
             
             if target_connection_id and target_connection_id in self.connections:
                 connection = self.connections[target_connection_id]
-                await connection.add_pair(pair)
+                await connection.call_in_loop(connection.add_pair(pair))
                 self.pair_to_connection[pair] = target_connection_id
+                self._update_connection_load(target_connection_id)
             else:
                 # Создаем новое подключение, если все заполнены
                 new_connection_id = f"ws_conn_{len(self.connections)}"
@@ -334,105 +500,275 @@ class MexcWebSocketClient:
 
     async def _remove_pairs(self, pairs: List[str]) -> None:
         """Удаление пар из подключений"""
+        # Группируем пары по подключениям: одна отписка на подключение
+        pairs_by_connection: Dict[str, List[str]] = {}
         for pair in pairs:
             connection_id = self.pair_to_connection.get(pair)
             if connection_id and connection_id in self.connections:
-                connection = self.connections[connection_id]
-                await connection.remove_pair(pair)
+                pairs_by_connection.setdefault(connection_id, []).append(pair)
+        
+        for connection_id, connection_pairs in pairs_by_connection.items():
+            connection = self.connections[connection_id]
+            await connection.call_in_loop(connection.remove_pairs(connection_pairs))
+            for pair in connection_pairs:
                 del self.pair_to_connection[pair]
+            self._update_connection_load(connection_id)
+
+    def _update_connection_load(self, connection_id: str) -> None:
+        """Запись текущей нагрузки подключения в heap (старые записи инвалидируются)"""
+        connection = self.connections.get(connection_id)
+        if connection is None:
+            return
+        
+        version = self._load_version.get(connection_id, 0) + 1
+        self._load_version[connection_id] = version
+        load = len(connection.pairs) * len(self.subscription_types)
+        heapq.heappush(self._load_heap, (load, connection_id, version))
 
     def _find_least_loaded_connection(self) -> Optional[str]:
-        """Поиск подключения с минимальной нагрузкой"""
-        min_load = float('inf')
-        target_connection = None
+        """Поиск подключения с минимальной нагрузкой (O(log C) через heap)"""
+        heap = self._load_heap
         
-        for connection_id, connection in self.connections.items():
-            current_load = len(connection.pairs) * len(self.subscription_types)
-            if current_load < min_load and current_load < self.MAX_SUBSCRIPTIONS_PER_CONNECTION:
-                min_load = current_load
-                target_connection = connection_id
+        while heap:
+            load, connection_id, version = heap[0]
+            if (connection_id not in self.connections or 
+                    self._load_version.get(connection_id) != version):
+                heapq.heappop(heap)  # Устаревшая запись
+                continue
+            
+            if load + len(self.subscription_types) > self.MAX_SUBSCRIPTIONS_PER_CONNECTION:
+                return None  # Даже в наименее загруженное подключение пара не помещается
+            return connection_id
                 
-        return target_connection
+        return None
 
-    async def _process_messages(self) -> None:
-        """Обработка входящих сообщений из очереди"""
-        logger.info("📨 Запуск обработчика сообщений...")
+    async def _message_worker(self, worker_id: int) -> None:
+        """Воркер обработки входящих сообщений из общей очереди"""
+        logger.debug(f"📨 Запуск воркера сообщений #{worker_id}...")
         
-        while self.is_running:
+        if self.batch_handler:
+            await self._batch_worker(worker_id)
+            return
+        
+        while True:
             try:
-                # Получаем сообщение с таймаутом
-                message = await asyncio.wait_for(
-                    self.message_queue.get(), 
-                    timeout=1.0
-                )
+                message = await self.message_queue.get()
+                if message is None:
+                    break  # Sentinel остановки
                 
                 # Обрабатываем сообщение
                 if self.event_handler:
-                    await asyncio.create_task(
-                        self._safe_handle_message(message),
-                        name=f"handle_message_{message.symbol}"
-                    )
+                    await self._safe_handle_message(message)
                 
                 self.total_messages_processed += 1
                 
-            except asyncio.TimeoutError:
-                continue  # Нормальная ситуация при отсутствии сообщений
             except Exception as e:
-                await self._handle_error(e, "message_processor")
+                await self._handle_error(e, f"message_worker_{worker_id}")
+
+    async def _batch_worker(self, worker_id: int) -> None:
+        """
+        Воркер пакетной обработки
+        
+        После ожидания первого сообщения забирает из очереди все уже готовые
+        (не более MESSAGE_BATCH_SIZE) и передаёт их batch_handler одним списком.
+        
+        Args:
+            worker_id: Номер воркера
+        """
+        queue = self.message_queue
+        batch_size = self.MESSAGE_BATCH_SIZE
+        stopping = False
+        
+        while not stopping:
+            try:
+                message = await queue.get()
+                if message is None:
+                    break  # Sentinel остановки
+                
+                batch = [message]
+                while len(batch) < batch_size and not queue.empty():
+                    message = queue.get_nowait()
+                    if message is None:
+                        stopping = True
+                        break
+                    batch.append(message)
+                
+                try:
+                    await self._dispatch_batch(batch)
+                except Exception as e:
+                    logger.error(f"❌ Ошибка в обработчике пачки из {len(batch)} сообщений: {e}")
+                
+                self.total_messages_processed += len(batch)
+                
+            except Exception as e:
+                await self._handle_error(e, f"message_worker_{worker_id}")
+
+    async def _dispatch_inline(self, message: WSMessage) -> None:
+        """Обработка сообщения прямо из цикла чтения подключения"""
+        async with self._inline_semaphore:
+            await self._safe_handle_message(message)
+        self.total_messages_processed += 1
+
+    def _start_shards(self) -> None:
+        """Запуск потоков-шардов для подключений"""
+        self._loop = asyncio.get_running_loop()
+        if self._shards or not self.shard_count:
+            return
+        
+        self._shards = [_LoopShard(shard_id) for shard_id in range(self.shard_count)]
+        for shard in self._shards:
+            shard.start()
+        logger.info(f"🧵 Подключения распределяются по {self.shard_count} потокам")
+
+    async def _stop_shards(self) -> None:
+        """Остановка потоков-шардов (без блокировки основного цикла)"""
+        shards, self._shards = self._shards, []
+        self._next_shard = 0
+        if shards:
+            await asyncio.gather(*(shard.stop() for shard in shards))
+
+    def _forward_from_shard(self, message: WSMessage) -> None:
+        """
+        Передача сообщения из потока шарда в основной цикл
+        
+        Вызывается в потоке шарда. Сообщения копятся в deque, а пробуждение основного
+        цикла планируется один раз на пачку, а не на каждое сообщение.
+        """
+        self._shard_inbox.append(message)
+        if not self._shard_drain_scheduled:
+            self._shard_drain_scheduled = True
+            self._loop.call_soon_threadsafe(self._drain_shard_inbox)
+
+    def _drain_shard_inbox(self) -> None:
+        """Перенос сообщений из шардов в очередь обработки (в основном цикле)"""
+        # Флаг сбрасывается до выборки: сообщение, добавленное после него, запланирует новый вызов
+        self._shard_drain_scheduled = False
+        inbox = self._shard_inbox
+        while inbox:
+            message = inbox.popleft()
+            try:
+                self.message_queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self.dropped_messages += 1
+                if self.dropped_messages % 1000 == 1:
+                    logger.warning(f"⚠️ Очередь сообщений переполнена, пропущено "
+                                   f"{self.dropped_messages} сообщений")
+        
+        queue_size = self.message_queue.qsize()
+        if queue_size > self.queue_high_water:
+            self.queue_high_water = queue_size
 
     async def _safe_handle_message(self, message: WSMessage) -> None:
         """Безопасная обработка сообщения с изоляцией ошибок"""
         try:
-            if asyncio.iscoroutinefunction(self.event_handler):
-                await self.event_handler(message)
-            else:
-                self.event_handler(message)
+            await self._dispatch(message)
                 
         except Exception as e:
             logger.error(f"❌ Ошибка в обработчике сообщения для {message.symbol}: {e}")
 
+    async def _dispatch_async(self, message: WSMessage) -> None:
+        """Вызов асинхронного обработчика сообщений"""
+        await self.event_handler(message)
+
+    async def _dispatch_sync(self, message: WSMessage) -> None:
+        """Вызов синхронного обработчика сообщений"""
+        self.event_handler(message)
+
+    async def _dispatch_batch_async(self, messages: List[WSMessage]) -> None:
+        """Вызов асинхронного обработчика пачек сообщений"""
+        await self.batch_handler(messages)
+
+    async def _dispatch_batch_sync(self, messages: List[WSMessage]) -> None:
+        """Вызов синхронного обработчика пачек сообщений"""
+        self.batch_handler(messages)
+
     async def _monitor_health(self) -> None:
         """Мониторинг здоровья всех подключений"""
         logger.info("🏥 Запуск мониторинга здоровья подключений...")
         
         while self.is_running:
             try:
-                await asyncio.sleep(30)  # Проверяем каждые 30 секунд
+                # Ждем сигнала о мертвом подключении от keepalive, остановки клиента
+                # или резервного таймаута для проверки тишины и завершенных задач
+                waiters = [
+                    asyncio.ensure_future(connection._dead_event.wait())
+                    for connection in self.connections.values()
+                ]
+                waiters.append(asyncio.ensure_future(self.shutdown_event.wait()))
+                try:
+                    await asyncio.wait(
+                        waiters,
+                        timeout=self.HEALTH_CHECK_INTERVAL,
+                        return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    for waiter in waiters:
+                        waiter.cancel()
                 
-                for connection_id, metrics in self.metrics.items():
-                    await self._check_connection_health(connection_id, metrics)
+                if not self.is_running:
+                    break
+                
+                unhealthy = [
+                    connection_id
+                    for connection_id, metrics in list(self.metrics.items())
+                    if self._check_connection_health(connection_id, metrics)
+                ]
+                
+                # Проблемные подключения перезапускаем параллельно, а не по очереди
+                if unhealthy:
+                    await asyncio.gather(
+                        *(self._restart_connection(connection_id) for connection_id in unhealthy)
+                    )
                     
             except Exception as e:
                 await self._handle_error(e, "health_monitor")
 
-    async def _check_connection_health(self, connection_id: str, metrics: ConnectionMetrics) -> None:
-        """Проверка здоровья конкретного подключения"""
-        now = datetime.now()
+    def _check_connection_health(self, connection_id: str, metrics: ConnectionMetrics) -> bool:
+        """
+        Проверка здоровья конкретного подключения
+        
+        Args:
+            connection_id (str): Идентификатор подключения
+            metrics (ConnectionMetrics): Метрики подключения
+            
+        Returns:
+            bool: True, если подключение требует перезапуска
+        """
+        # Keepalive уже определил, что подключение не отвечает
+        connection = self.connections.get(connection_id)
+        if connection and connection._dead_event.is_set():
+            logger.warning(f"⚠️ Подключение {connection_id} не отвечает на ping")
+            metrics.is_healthy = False
+            return True
         
         # Проверяем, когда было последнее сообщение
         if metrics.last_message_at:
-            silence_duration = (now - metrics.last_message_at).total_seconds()
+            silence_duration = time.monotonic() - metrics.last_message_at
             if silence_duration > self.MESSAGE_TIMEOUT:
                 logger.warning(f"⚠️ Подключение {connection_id} молчит {silence_duration:.1f}s")
                 metrics.is_healthy = False
-                await self._restart_connection(connection_id)
+                return True
         
         # Проверяем статус задачи подключения
         task = self.connection_tasks.get(connection_id)
         if task and task.done():
             logger.warning(f"⚠️ Задача подключения {connection_id} завершена")
             metrics.is_healthy = False
-            await self._restart_connection(connection_id)
+            return True
+        
+        return False
 
     async def _restart_connection(self, connection_id: str) -> None:
         """Перезапуск проблемного подключения"""
         try:
             logger.info(f"🔄 Перезапуск подключения {connection_id}...")
             
-            # Останавливаем старое подключение
+            # Останавливаем старое подключение, сохраняя его пары без пересчета распределения
+            pairs_for_connection: Optional[List[str]] = None
             if connection_id in self.connections:
-                await self.connections[connection_id].close()
-                del self.connections[connection_id]
+                old_connection = self.connections.pop(connection_id)
+                pairs_for_connection = list(old_connection.pairs)
+                await old_connection.call_in_loop(old_connection.close())
                 
             if connection_id in self.connection_tasks:
                 task = self.connection_tasks[connection_id]
@@ -441,10 +777,11 @@ class MexcWebSocketClient:
                 del self.connection_tasks[connection_id]
             
             # Получаем пары для этого подключения
-            pairs_for_connection = [
-                pair for pair, conn_id in self.pair_to_connection.items()
-                if conn_id == connection_id
-            ]
+            if pairs_for_connection is None:
+                pairs_for_connection = [
+                    pair for pair, conn_id in self.pair_to_connection.items()
+                    if conn_id == connection_id
+                ]
             
             if pairs_for_connection:
                 # Создаем новое подключение
@@ -460,17 +797,45 @@ class MexcWebSocketClient:
         
         if self.error_handler:
             try:
-                if asyncio.iscoroutinefunction(self.error_handler):
-                    await self.error_handler(error, context)
-                else:
-                    self.error_handler(error, context)
+                await self._dispatch_error(error, context)
             except Exception as e:
                 logger.error(f"❌ Ошибка в обработчике ошибок: {e}")
 
+    async def _dispatch_error_async(self, error: Exception, context: str) -> None:
+        """Вызов асинхронного обработчика ошибок"""
+        await self.error_handler(error, context)
+
+    async def _dispatch_error_sync(self, error: Exception, context: str) -> None:
+        """Вызов синхронного обработчика ошибок"""
+        self.error_handler(error, context)
+
     def _default_error_handler(self, error: Exception, context: str) -> None:
         """Обработчик ошибок по умолчанию"""
         logger.error(f"🚨 Необработанная ошибка в {context}: {error}")
 
+    def _get_http_session(self) -> ClientSession:
+        """
+        Получение общей HTTP-сессии для WebSocket подключений
+        
+        Returns:
+            ClientSession: Сессия с общим коннектором и DNS-кэшем
+        """
+        if self._http_session is None or self._http_session.closed:
+            try:
+                # Асинхронный резолвер требует aiodns, без него используется стандартный
+                resolver = aiohttp.AsyncResolver()
+            except Exception:
+                resolver = None
+            
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                ttl_dns_cache=600,
+                resolver=resolver
+            )
+            self._http_session = aiohttp.ClientSession(connector=connector)
+        
+        return self._http_session
+
     async def _cleanup(self) -> None:
         """Очистка ресурсов при остановке"""
         logger.info("🧹 Очистка ресурсов WebSocket клиента...")
@@ -478,17 +843,25 @@ class MexcWebSocketClient:
         try:
             # Останавливаем все подключения
             for connection in self.connections.values():
-                await connection.close()
+                await connection.call_in_loop(connection.close())
             
             # Отменяем все задачи
             for task in self.connection_tasks.values():
                 if not task.done():
                     task.cancel()
             
+            await self._stop_shards()
+            
             # Очищаем состояние
             self.connections.clear()
             self.connection_tasks.clear()
             self.pair_to_connection.clear()
+            self._load_heap.clear()
+            self._load_version.clear()
+            
+            if self._http_session and not self._http_session.closed:
+                await self._http_session.close()
+            self._http_session = None
             
             logger.info("✅ Очистка завершена")
             
@@ -506,6 +879,9 @@ class MexcWebSocketClient:
             "total_pairs": len(self.current_pairs),
             "total_messages_processed": self.total_messages_processed,
             "queue_size": self.message_queue.qsize(),
+            "queue_maxsize": self.message_queue.maxsize,
+            "queue_high_water": self.queue_high_water,
+            "dropped_messages": self.dropped_messages,
             "connections": {
                 conn_id: {
                     "pairs_count": len(conn.pairs),
@@ -514,6 +890,7 @@ class MexcWebSocketClient:
                         "messages_received": metrics.messages_received,
                         "reconnect_count": metrics.reconnect_count,
                         "is_healthy": metrics.is_healthy,
+                        "ping_rtt": metrics.ping_rtt,
                         "connected_at": metrics.connected_at.isoformat() if metrics.connected_at else None
                     }
                 }
@@ -540,7 +917,9 @@ class WSConnection:
                  connection_id: str,
                  client: weakref.ref,
                  pairs: List[str],
-                 subscription_types: List[SubscriptionType]):
+                 subscription_types: List[SubscriptionType],
+                 session: Optional[ClientSession] = None,
+                 shard: Optional['_LoopShard'] = None):
         """
         Инициализация WebSocket подключения
         
@@ -549,16 +928,22 @@ class WSConnection:
             client: Слабая ссылка на основной клиент
             pairs: Список пар для этого подключения
             subscription_types: Типы подписок
+            session: Общая HTTP-сессия клиента (если не задана, создаётся своя)
+            shard: Поток-шард, в цикле которого работает подключение (None - основной цикл)
         """
         self.connection_id = connection_id
         self.client_ref = client
-        self.pairs = list(pairs)
+        # dict сохраняет порядок добавления и даёт O(1) проверку, добавление и удаление
+        self.pairs: Dict[str, None] = dict.fromkeys(pairs)
         self.subscription_types = subscription_types
         
         # Состояние подключения
         self.state = ConnectionState.DISCONNECTED
         self.websocket: Optional[ClientWebSocketResponse] = None
         self.session: Optional[ClientSession] = None
+        self._shared_session = session
+        self._owns_session = False
+        self.shard = shard
         
         # Управление переподключением
         self.reconnect_count = 0
@@ -568,6 +953,45 @@ class WSConnection:
         # Активные подписки
         self.active_subscriptions: Set[str] = set()
         
+        # Запросы (метод, каналы) отправляет отдельная задача, чтобы add_pair/remove_pair
+        # не ждали сети и не блокировали цикл чтения
+        self._out_queue: Queue[Tuple[str, List[str]]] = Queue()
+        
+        # Шаблоны каналов для типов подписок этого подключения (разрешаются один раз)
+        self._channel_templates: List[str] = []
+        for sub_type in subscription_types:
+            template = _SUB_TYPE_TEMPLATES.get(sub_type)
+            if template is None:
+                logger.warning(f"⚠️ Неизвестный тип подписки: {sub_type}")
+            else:
+                self._channel_templates.append(template)
+        
+        # Кэш каналов пары по всем типам подписок: пара -> каналы
+        self._pair_channels: Dict[str, Tuple[str, ...]] = {}
+        self._sender_task: Optional[asyncio.Task] = None
+        
+        # Keepalive по дедлайну: ping отправляется, только если соединение молчит
+        self._ping_task: Optional[asyncio.Task] = None
+        self._ping_sent_at: Optional[float] = None
+        
+        # Сигнал для монитора здоровья: pong не получен, подключение нужно перезапустить
+        self._dead_event = Event()
+        
+        # Прямые ссылки на метрики и связанные методы очереди клиента для горячего пути
+        # _handle_message, чтобы не разыменовывать weakref и не искать атрибуты на каждый кадр
+        self._metrics: Optional[ConnectionMetrics] = None
+        self._queue_put: Optional[Callable[[WSMessage], None]] = None
+        self._queue_size: Optional[Callable[[], int]] = None
+        self._queue_high_water = 0
+        
+        # Локальный счетчик сообщений: метрики обновляются раз в METRICS_FLUSH_EVERY кадров
+        self._local_msg_count = 0
+        self._flushed_msg_count = 0
+        self._dispatch_inline: Optional[Callable[[WSMessage], Any]] = None
+        self._inline_semaphore: Optional[asyncio.Semaphore] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready_event: Optional[Event] = None
+        
         logger.debug(f"📡 Инициализировано подключение {connection_id} для {len(pairs)} пар")
 
     async def run(self) -> None:
@@ -586,26 +1010,47 @@ class WSConnection:
         self.state = ConnectionState.CONNECTING
         
         try:
-            # Создаем сессию и подключаемся
-            self.session = aiohttp.ClientSession()
+            # Используем общую сессию клиента, собственную создаем только без нее
+            if self._shared_session is not None and not self._shared_session.closed:
+                self.session = self._shared_session
+                self._owns_session = False
+            else:
+                self.session = aiohttp.ClientSession()
+                self._owns_session = True
+            # Вместо heartbeat - собственный ping по дедлайну (_ping_loop),
+            # поэтому PING/PONG обрабатываются в цикле чтения
             self.websocket = await self.session.ws_connect(
                 MexcWebSocketClient.WS_BASE_URL,
-                heartbeat=MexcWebSocketClient.PING_INTERVAL
+                autoping=False
             )
+            self._tune_socket()
             
             self.state = ConnectionState.CONNECTED
             self.reconnect_count = 0
             
             # Обновляем метрики
-            client = self.client_ref()
-            if client and self.connection_id in client.metrics:
-                metrics = client.metrics[self.connection_id]
+            self._bind_client()
+            metrics = self._metrics
+            if metrics:
                 metrics.connected_at = datetime.now()
                 metrics.reconnect_count = self.reconnect_count
                 metrics.is_healthy = True
             
             logger.info(f"✅ Подключение {self.connection_id} установлено")
             
+            if self._ready_event is not None:
+                self._set_client_event(self._ready_event)
+            
+            self._sender_task = asyncio.create_task(
+                self._sender_loop(),
+                name=f"ws_sender_{self.connection_id}"
+            )
+            self._ping_sent_at = None
+            self._ping_task = asyncio.create_task(
+                self._ping_loop(),
+                name=f"ws_ping_{self.connection_id}"
+            )
+            
             # Подписываемся на каналы
             await self._subscribe_to_channels()
             
@@ -613,6 +1058,13 @@ class WSConnection:
             async for msg in self.websocket:
                 if msg.type == WSMsgType.TEXT:
                     await self._handle_message(msg.data)
+                elif msg.type == WSMsgType.BINARY:
+                    # Бинарные кадры разбираются из bytes напрямую, без декодирования в str
+                    await self._handle_message(msg.data, _CHANNEL_KEY_BYTES)
+                elif msg.type == WSMsgType.PING:
+                    await self.websocket.pong(msg.data)
+                elif msg.type == WSMsgType.PONG:
+                    self._handle_pong()
                 elif msg.type == WSMsgType.ERROR:
                     logger.error(f"❌ WebSocket ошибка {self.connection_id}: {msg.data}")
                     break
@@ -633,70 +1085,295 @@ class WSConnection:
             
         logger.info(f"📺 Подписка на каналы для {len(self.pairs)} пар...")
         
-        for pair in self.pairs:
-            for sub_type in self.subscription_types:
-                await self._subscribe_to_channel(pair, sub_type)
+        self._queue_channels("SUBSCRIPTION", self._channels_for_pairs(self.pairs))
                 
-        logger.info(f"✅ Подписка на {len(self.active_subscriptions)} каналов завершена")
+        logger.info(f"✅ Подписка на {len(self.active_subscriptions)} каналов поставлена в очередь")
+
+    def _channels_for_pair(self, pair: str) -> Tuple[str, ...]:
+        """Каналы пары в формате MEXC по всем типам подписок (с кэшированием)"""
+        channels = self._pair_channels.get(pair)
+        if channels is None:
+            sym = pair.replace('_', '')
+            channels = self._pair_channels[pair] = tuple(
+                template.format(sym=sym) for template in self._channel_templates
+            )
+            # Кадры собираются подстановкой в _FRAME_TEMPLATES без экранирования
+            assert all(channel.isascii() and '"' not in channel and '\\' not in channel
+                       for channel in channels), f"Недопустимые символы в каналах {pair}"
+        return channels
 
-    async def _subscribe_to_channel(self, pair: str, sub_type: SubscriptionType) -> None:
-        """Подписка на конкретный канал"""
+    def _channels_for_pairs(self, pairs: Iterable[str]) -> List[str]:
+        """Список каналов для пар по всем типам подписок"""
+        channels = []
+        for pair in pairs:
+            channels.extend(self._channels_for_pair(pair))
+        return channels
+
+    def _queue_channels(self, method: str, channels: List[str]) -> None:
+        """
+        Постановка в очередь подписки/отписки
+        
+        Кадры формирует _sender_loop: подряд идущие запросы одного метода
+        объединяются в кадры по SUBSCRIPTION_BATCH_SIZE параметров. Каналы, уже
+        находящиеся в нужном состоянии (по active_subscriptions), не отправляются.
+        
+        Args:
+            method: "SUBSCRIPTION" или "UNSUBSCRIPTION"
+            channels: Имена каналов
+        """
+        active = self.active_subscriptions
+        if method == "SUBSCRIPTION":
+            channels = [channel for channel in channels if channel not in active]
+            active.update(channels)
+        else:
+            channels = [channel for channel in channels if channel in active]
+            active.difference_update(channels)
+        
+        if channels:
+            self._out_queue.put_nowait((method, channels))
+        
+        logger.debug("📺 %s: %s каналов для %s", method, len(channels), self.connection_id)
+
+    def _tune_socket(self) -> None:
+        """
+        Настройка сокета подключения для мелких кадров
+        
+        Отключает алгоритм Нейгла (мелкие кадры подписки и ping не ждут ACK)
+        и увеличивает буфер отправки под серии кадров из _sender_loop.
+        """
+        sock = self.websocket.get_extra_info('socket') if self.websocket else None
+        if sock is None:
+            return
+        
         try:
-            # Формируем имя канала в формате MEXC
-            if sub_type == SubscriptionType.TICKER:
-                channel = f"spot@public.market.ticker.v3.{pair.replace('_', '')}"
-            elif sub_type.value.startswith("kline_"):
-                interval = sub_type.value.replace("kline_", "")
-                channel = f"spot@public.market.kline.{interval}.{pair.replace('_', '')}"
-            elif sub_type == SubscriptionType.DEPTH:
-                channel = f"spot@public.market.depth.v3.{pair.replace('_', '')}"
-            elif sub_type == SubscriptionType.DEALS:
-                channel = f"spot@public.market.deals.v3.{pair.replace('_', '')}"
-            else:
-                logger.warning(f"⚠️ Неизвестный тип подписки: {sub_type}")
-                return
-            
-            # Отправляем команду подписки
-            subscribe_msg = {
-                "method": "SUBSCRIPTION",
-                "params": [channel]
-            }
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF,
+                            MexcWebSocketClient.SOCKET_SEND_BUFFER)
+        except (OSError, AttributeError) as e:
+            logger.debug("Не удалось настроить сокет %s: %s", self.connection_id, e)
+
+    @staticmethod
+    def _build_frames(requests: List[Tuple[str, List[str]]]) -> List[str]:
+        """
+        Сборка кадров из накопившихся запросов подписки/отписки
+        
+        Подряд идущие запросы одного метода сливаются (порядок между SUBSCRIPTION
+        и UNSUBSCRIPTION сохраняется) и режутся на кадры по SUBSCRIPTION_BATCH_SIZE.
+        
+        Args:
+            requests: Пары (метод, каналы) в порядке постановки в очередь
             
-            await self.websocket.send_str(json.dumps(subscribe_msg))
-            self.active_subscriptions.add(channel)
+        Returns:
+            List[str]: Готовые JSON-кадры
+        """
+        batch_size = MexcWebSocketClient.SUBSCRIPTION_BATCH_SIZE
+        frames = []
+        run_method: Optional[str] = None
+        run_channels: List[str] = []
+        
+        for method, channels in requests + [(None, [])]:
+            if method != run_method:
+                if run_channels:
+                    template = _FRAME_TEMPLATES[run_method]
+                    for i in range(0, len(run_channels), batch_size):
+                        frames.append(template % '","'.join(run_channels[i:i + batch_size]))
+                run_method = method
+                run_channels = []
+            run_channels.extend(channels)
+        
+        return frames
+
+    async def _sender_loop(self) -> None:
+        """
+        Отправка исходящих кадров из очереди
+        
+        Все накопившиеся запросы забираются разом, сливаются в минимум кадров
+        и пишутся подряд: send_str не уступает управление, пока буфер транспорта
+        не переполнен, поэтому кадры уходят одной серией.
+        """
+        out_queue = self._out_queue
+        while True:
+            requests = [await out_queue.get()]
+            while not out_queue.empty():
+                requests.append(out_queue.get_nowait())
             
-            logger.debug(f"📺 Подписка на {channel}")
+            websocket = self.websocket
+            if not websocket or websocket.closed:
+                continue
             
+            try:
+                for frame in self._build_frames(requests):
+                    await websocket.send_str(frame)
+            except Exception as e:
+                logger.error(f"❌ Ошибка отправки кадра {self.connection_id}: {e}")
+
+    async def _ping_loop(self) -> None:
+        """
+        Keepalive по дедлайну
+        
+        Ping отправляется только после PING_INTERVAL тишины с момента последнего
+        входящего кадра. Если за следующий интервал не пришло ни pong, ни данных,
+        выставляется _dead_event и монитор здоровья перезапускает подключение.
+        """
+        interval = MexcWebSocketClient.PING_INTERVAL
+        started_at = time.monotonic()
+        
+        try:
+            while self.websocket and not self.websocket.closed:
+                # Учитываем сообщения, еще не перенесенные в метрики
+                self._flush_metrics()
+                now = time.monotonic()
+                metrics = self._metrics
+                last_activity = (metrics.last_message_at if metrics and metrics.last_message_at
+                                 else started_at)
+                
+                if self._ping_sent_at is not None:
+                    if last_activity >= self._ping_sent_at:
+                        # После ping пришли данные или pong - соединение живо
+                        self._ping_sent_at = None
+                    elif now - self._ping_sent_at >= interval:
+                        logger.warning(f"⚠️ Подключение {self.connection_id} не ответило на ping "
+                                       f"за {interval}s")
+                        self._signal_dead()
+                        return
+                    else:
+                        await asyncio.sleep(self._ping_sent_at + interval - now)
+                        continue
+                
+                deadline = last_activity + interval
+                if now < deadline:
+                    await asyncio.sleep(deadline - now)
+                    continue
+                
+                self._ping_sent_at = now
+                await self.websocket.ping()
+                
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"❌ Ошибка подписки на {pair} {sub_type.value}: {e}")
+            logger.error(f"❌ Ошибка keepalive {self.connection_id}: {e}")
 
-    async def _handle_message(self, raw_data: str) -> None:
-        """Обработка входящего сообщения"""
+    def _signal_dead(self) -> None:
+        """Сигнал монитору здоровья"""
+        self._set_client_event(self._dead_event)
+
+    def _set_client_event(self, event: Event) -> None:
+        """Выставление события, которое ожидается в основном цикле клиента"""
+        if self.shard is not None and self._client_loop is not None:
+            self._client_loop.call_soon_threadsafe(event.set)
+        else:
+            event.set()
+
+    def _handle_pong(self) -> None:
+        """Обработка pong: RTT и отметка активности соединения"""
+        now = time.monotonic()
+        metrics = self._metrics
+        if metrics:
+            if self._ping_sent_at is not None:
+                metrics.ping_rtt = now - self._ping_sent_at
+            metrics.last_message_at = now
+        self._ping_sent_at = None
+
+    def _flush_metrics(self) -> None:
+        """Перенос локального счетчика сообщений в метрики подключения"""
+        pending = self._local_msg_count - self._flushed_msg_count
+        if pending <= 0:
+            return
+        
+        self._flushed_msg_count = self._local_msg_count
+        metrics = self._metrics
+        if metrics:
+            metrics.messages_received += pending
+            metrics.last_message_at = time.monotonic()
+
+    def _bind_client(self) -> None:
+        """Однократное разыменование weakref: кэшируем метрики и очередь клиента"""
+        client = self.client_ref()
+        if client is None:
+            self._metrics = None
+            self._queue_put = None
+            self._queue_size = None
+            self._dispatch_inline = None
+            self._inline_semaphore = None
+            return
+        
+        self._metrics = client.metrics.get(self.connection_id)
+        self._client_loop = client._loop
+        self._ready_event = client.ready_event
+        
+        # В шарде объекты asyncio основного цикла недоступны - сообщения пересылаются
+        if self.shard is not None:
+            self._queue_put = client._forward_from_shard
+            self._queue_size = None
+            self._dispatch_inline = None
+            self._inline_semaphore = None
+            return
+        
+        self._queue_put = client.message_queue.put_nowait
+        self._queue_size = client.message_queue.qsize
+        if client.inline_dispatch and client.event_handler and not client.batch_handler:
+            self._dispatch_inline = client._dispatch_inline
+            self._inline_semaphore = client._inline_semaphore
+        else:
+            self._dispatch_inline = None
+            self._inline_semaphore = None
+
+    async def _handle_message(self, raw_data: Union[str, bytes],
+                              channel_key: Union[str, bytes] = _CHANNEL_KEY) -> None:
+        """Обработка входящего сообщения (текстового или бинарного кадра)"""
         try:
-            data = json.loads(raw_data)
+            # Обновляем метрики выборочно, раз в METRICS_FLUSH_EVERY сообщений
+            # (служебные кадры тоже подтверждают, что соединение живо)
+            count = self._local_msg_count + 1
+            self._local_msg_count = count
+            if not count & _METRICS_FLUSH_MASK:
+                self._flush_metrics()
             
-            # Обновляем метрики
-            client = self.client_ref()
-            if client and self.connection_id in client.metrics:
-                metrics = client.metrics[self.connection_id]
-                metrics.last_message_at = datetime.now()
-                metrics.messages_received += 1
+            # Служебные кадры (подтверждения подписки и т.п.) не содержат канала - не разбираем их
+            if channel_key not in raw_data:
+                return
+            
+            data = fast_json.loads(raw_data)
             
             # Парсим сообщение
-            message = self._parse_message(data)
-            if message and client:
-                # Отправляем в очередь обработки
+            message = self._parse_message(data, raw_data)
+            if message is None:
+                return
+            
+            # Inline-обработка без очереди, пока есть свободные слоты
+            dispatch_inline = self._dispatch_inline
+            if dispatch_inline is not None and not self._inline_semaphore.locked():
+                await dispatch_inline(message)
+                return
+            
+            # Отправляем в очередь обработки (из шарда - пересылка в основной цикл)
+            queue_put = self._queue_put
+            if queue_put is not None:
                 try:
-                    client.message_queue.put_nowait(message)
+                    queue_put(message)
                 except asyncio.QueueFull:
-                    logger.warning(f"⚠️ Очередь сообщений переполнена, пропускаем сообщение")
+                    # Редкий путь - к клиенту обращаемся только здесь
+                    client = self.client_ref()
+                    if client:
+                        client.dropped_messages += 1
+                        if client.dropped_messages % 1000 == 1:
+                            logger.warning(f"⚠️ Очередь сообщений переполнена, пропущено "
+                                           f"{client.dropped_messages} сообщений")
+                else:
+                    queue_size = self._queue_size() if self._queue_size else 0
+                    if queue_size > self._queue_high_water:
+                        self._queue_high_water = queue_size
+                        client = self.client_ref()
+                        if client and queue_size > client.queue_high_water:
+                            client.queue_high_water = queue_size
                     
         except json.JSONDecodeError as e:
             logger.error(f"❌ Ошибка парсинга JSON {self.connection_id}: {e}")
         except Exception as e:
             logger.error(f"❌ Ошибка обработки сообщения {self.connection_id}: {e}")
 
-    def _parse_message(self, data: Dict[str, Any]) -> Optional[WSMessage]:
+    def _parse_message(self, data: Dict[str, Any],
+                       raw_data: Optional[Union[str, bytes]] = None) -> Optional[WSMessage]:
         """Парсинг сообщения в структурированный формат"""
         try:
             # Определяем тип сообщения по каналу
@@ -708,28 +1385,19 @@ class WSConnection:
             # Примеры каналов:
             # spot@public.market.ticker.v3.BTCUSDT
             # spot@public.market.kline.Min1.BTCUSDT
-            parts = channel.split(".")
-            if len(parts) < 2:
+            _, sep, symbol_raw = channel.rpartition(".")
+            if not sep:
                 return None
                 
-            symbol_raw = parts[-1]
             # Конвертируем BTCUSDT -> BTC_USDT
-            if len(symbol_raw) >= 6:
-                if symbol_raw.endswith("USDT"):
-                    symbol = f"{symbol_raw[:-4]}_USDT"
-                elif symbol_raw.endswith("USD"):
-                    symbol = f"{symbol_raw[:-3]}_USD"
-                else:
-                    symbol = symbol_raw
-            else:
-                symbol = symbol_raw
+            symbol = _format_symbol(symbol_raw)
             
             # Создаем структурированное сообщение
             return WSMessage(
                 channel=channel,
                 symbol=symbol,
                 data=data.get("d", {}),
-                raw_message=data
+                raw=raw_data
             )
             
         except Exception as e:
@@ -749,9 +1417,11 @@ class WSConnection:
             self.state = ConnectionState.FAILED
             return
         
-        # Экспоненциальная задержка
-        delay = min(MexcWebSocketClient.RECONNECT_DELAY * (2 ** (self.reconnect_count - 1)), 60)
-        logger.info(f"🔄 Переподключение {self.connection_id} через {delay}s (попытка {self.reconnect_count})")
+        # Экспоненциальная задержка с полным джиттером, чтобы подключения
+        # не переподключались синхронно после общего сбоя
+        max_delay = min(MexcWebSocketClient.RECONNECT_DELAY * (2 ** (self.reconnect_count - 1)), 60)
+        delay = random.uniform(0, max_delay)
+        logger.info(f"🔄 Переподключение {self.connection_id} через {delay:.1f}s (попытка {self.reconnect_count})")
         
         await asyncio.sleep(delay)
 
@@ -759,10 +1429,32 @@ class WSConnection:
         """Очистка ресурсов подключения"""
         self.state = ConnectionState.DISCONNECTED
         
+        if self._sender_task and not self._sender_task.done():
+            self._sender_task.cancel()
+        self._sender_task = None
+        
+        if self._ping_task and not self._ping_task.done():
+            self._ping_task.cancel()
+        self._ping_task = None
+        self._ping_sent_at = None
+        
+        # Разрываем прямые ссылки на объекты клиента
+        self._flush_metrics()
+        self._metrics = None
+        self._queue_put = None
+        self._queue_size = None
+        self._dispatch_inline = None
+        self._inline_semaphore = None
+        self._ready_event = None
+        
+        # Неотправленные кадры устарели: после переподключения подписка выполняется заново
+        while not self._out_queue.empty():
+            self._out_queue.get_nowait()
+        
         if self.websocket and not self.websocket.closed:
             await self.websocket.close()
             
-        if self.session and not self.session.closed:
+        if self._owns_session and self.session and not self.session.closed:
             await self.session.close()
             
         self.websocket = None
@@ -771,61 +1463,76 @@ class WSConnection:
 
     async def add_pair(self, pair: str) -> None:
         """Добавление новой пары к подключению"""
-        if pair in self.pairs:
+        await self.add_pairs([pair])
+
+    async def add_pairs(self, pairs: List[str]) -> None:
+        """
+        Добавление нескольких пар к подключению
+        
+        Каналы всех пар уходят общими кадрами SUBSCRIPTION, а не кадром на пару.
+        
+        Args:
+            pairs: Пары для добавления
+        """
+        new_pairs = []
+        for pair in pairs:
+            if pair not in self.pairs:
+                self.pairs[pair] = None
+                new_pairs.append(pair)
+        
+        if not new_pairs:
             return
-            
-        self.pairs.append(pair)
         
-        # Подписываемся на каналы для новой пары
+        # Подписываемся на каналы новых пар
         if self.websocket and self.state == ConnectionState.CONNECTED:
-            for sub_type in self.subscription_types:
-                await self._subscribe_to_channel(pair, sub_type)
+            self._queue_channels("SUBSCRIPTION", self._channels_for_pairs(new_pairs))
                 
-        logger.info(f"➕ Добавлена пара {pair} к подключению {self.connection_id}")
+        logger.info(f"➕ Добавлено {len(new_pairs)} пар к подключению {self.connection_id}: "
+                    f"{', '.join(new_pairs[:5])}{'...' if len(new_pairs) > 5 else ''}")
 
     async def remove_pair(self, pair: str) -> None:
         """Удаление пары из подключения"""
-        if pair not in self.pairs:
+        await self.remove_pairs([pair])
+
+    async def remove_pairs(self, pairs: List[str]) -> None:
+        """
+        Удаление нескольких пар из подключения
+        
+        Каналы всех пар уходят общими кадрами UNSUBSCRIPTION, а не кадром на пару.
+        
+        Args:
+            pairs: Пары для удаления
+        """
+        removed_pairs = [pair for pair in dict.fromkeys(pairs) if pair in self.pairs]
+        if not removed_pairs:
             return
-            
-        self.pairs.remove(pair)
         
-        # Отписываемся от каналов удаляемой пары
+        for pair in removed_pairs:
+            del self.pairs[pair]
+        
+        # Отписываемся от каналов удаляемых пар
         if self.websocket and self.state == ConnectionState.CONNECTED:
-            for sub_type in self.subscription_types:
-                await self._unsubscribe_from_channel(pair, sub_type)
+            self._queue_channels("UNSUBSCRIPTION", self._channels_for_pairs(removed_pairs))
+        
+        for pair in removed_pairs:
+            self._pair_channels.pop(pair, None)
                 
-        logger.info(f"➖ Удалена пара {pair} из подключения {self.connection_id}")
+        logger.info(f"➖ Удалено {len(removed_pairs)} пар из подключения {self.connection_id}: "
+                    f"{', '.join(removed_pairs[:5])}{'...' if len(removed_pairs) > 5 else ''}")
 
-    async def _unsubscribe_from_channel(self, pair: str, sub_type: SubscriptionType) -> None:
-        """Отписка от канала"""
-        try:
-            # Формируем имя канала (аналогично подписке)
-            if sub_type == SubscriptionType.TICKER:
-                channel = f"spot@public.market.ticker.v3.{pair.replace('_', '')}"
-            elif sub_type.value.startswith("kline_"):
-                interval = sub_type.value.replace("kline_", "")
-                channel = f"spot@public.market.kline.{interval}.{pair.replace('_', '')}"
-            elif sub_type == SubscriptionType.DEPTH:
-                channel = f"spot@public.market.depth.v3.{pair.replace('_', '')}"
-            elif sub_type == SubscriptionType.DEALS:
-                channel = f"spot@public.market.deals.v3.{pair.replace('_', '')}"
-            else:
-                return
-            
-            # Отправляем команду отписки
-            unsubscribe_msg = {
-                "method": "UNSUBSCRIPTION",
-                "params": [channel]
-            }
-            
-            await self.websocket.send_str(json.dumps(unsubscribe_msg))
-            self.active_subscriptions.discard(channel)
-            
-            logger.debug(f"📺 Отписка от {channel}")
+    async def call_in_loop(self, coro: Any) -> Any:
+        """
+        Выполнение корутины подключения в его event loop
+        
+        Args:
+            coro: Корутина метода подключения (add_pair, remove_pair, close)
             
-        except Exception as e:
-            logger.error(f"❌ Ошибка отписки от {pair} {sub_type.value}: {e}")
+        Returns:
+            Any: Результат корутины
+        """
+        if self.shard is None:
+            return await coro
+        return await self.shard.submit(coro)
 
     async def close(self) -> None:
         """Закрытие подключения"""
@@ -835,6 +1542,117 @@ class WSConnection:
         await self._cleanup_connection()
 
 
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Новый event loop (uvloop, если установлен)"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+
+class _LoopShard:
+    """
+    Поток со своим event loop для части WebSocket подключений
+    
+    Разбор кадров и ввод-вывод подключений шарда выполняются вне основного цикла;
+    обработчики событий по-прежнему вызываются в основном цикле.
+    """
+    
+    def __init__(self, shard_id: int):
+        """
+        Инициализация шарда
+        
+        Args:
+            shard_id: Номер шарда
+        """
+        self.shard_id = shard_id
+        self.loop = _new_event_loop()
+        self.thread = threading.Thread(
+            target=self._run,
+            name=f"ws_shard_{shard_id}",
+            daemon=True
+        )
+
+    def start(self) -> None:
+        """Запуск потока шарда"""
+        self.thread.start()
+
+    def _run(self) -> None:
+        """Цикл потока шарда"""
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    def submit(self, coro: Any) -> asyncio.Future:
+        """
+        Запуск корутины в цикле шарда
+        
+        Args:
+            coro: Корутина
+            
+        Returns:
+            asyncio.Future: Future вызывающего цикла с результатом корутины
+        """
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Остановка цикла и потока шарда
+        
+        Сначала в цикле шарда отменяются и дожидаются все его задачи (подключения
+        успевают закрыться), затем цикл останавливается, а поток дожидается через
+        to_thread - основной цикл при этом не блокируется.
+        
+        Args:
+            timeout: Время ожидания отмены задач и завершения потока в секундах
+        """
+        if self.loop.is_running():
+            try:
+                await asyncio.wait_for(
+                    asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._cancel_tasks(), self.loop)),
+                    timeout
+                )
+            except (asyncio.TimeoutError, RuntimeError) as e:
+                logger.warning(f"⚠️ Задачи шарда {self.shard_id} не завершились: {e!r}")
+            
+            try:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+            except RuntimeError:
+                pass  # Цикл уже закрыт
+        
+        if self.thread.is_alive():
+            await asyncio.to_thread(self.thread.join, timeout)
+
+    async def _cancel_tasks(self) -> None:
+        """Отмена всех задач цикла шарда с ожиданием их завершения (в цикле шарда)"""
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_with_uvloop(main: Any) -> Any:
+    """
+    Запуск корутины в новом event loop, аналог asyncio.run
+    
+    Цикл создаётся фабрикой asyncio.Runner: uvloop, если он установлен,
+    иначе стандартный цикл asyncio. Глобальная политика event loop не меняется.
+    
+    Args:
+        main: Корутина верхнего уровня
+        
+    Returns:
+        Any: Результат корутины
+    """
+    with asyncio.Runner(loop_factory=_new_event_loop) as runner:
+        return runner.run(main)
+
+
 # Фабричные функции для удобства использования
 
 def create_websocket_client(
@@ -862,7 +1680,8 @@ def create_websocket_client(
 
 async def create_and_start_websocket_client(
     event_handler: Callable[[WSMessage], None],
-    subscription_types: List[SubscriptionType] = None
+    subscription_types: List[SubscriptionType] = None,
+    connect_timeout: float = 30.0
 ) -> MexcWebSocketClient:
     """
     Создание и запуск WebSocket клиента в одной функции
@@ -870,6 +1689,7 @@ async def create_and_start_websocket_client(
     Args:
         event_handler: Обработчик событий
         subscription_types: Типы подписок
+        connect_timeout: Максимальное время ожидания первого подключения в секундах
         
     Returns:
         MexcWebSocketClient: Запущенный клиент
@@ -880,9 +1700,24 @@ async def create_and_start_websocket_client(
     )
     
     # Запускаем в фоне
-    asyncio.create_task(client.start(), name="websocket_client")
+    client.start_task = asyncio.create_task(client.start(), name="websocket_client")
+    
+    # Ждем установки первого подключения (или падения запуска)
+    ready_waiter = asyncio.ensure_future(client.ready_event.wait())
+    try:
+        await asyncio.wait(
+            [ready_waiter, client.start_task],
+            timeout=connect_timeout,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+    finally:
+        ready_waiter.cancel()
+    
+    if client.start_task.done() and client.start_task.exception():
+        raise client.start_task.exception()
     
-    # Ждем инициализации
-    await asyncio.sleep(1)
+    if not client.ready_event.is_set():
+        logger.warning(f"⚠️ WebSocket клиент не подключился за {connect_timeout}s, "
+                       f"подключение продолжается в фоне")
     
     return client
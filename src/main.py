@@ -12,39 +12,50 @@
 DUAL-MODE: REST API + WebSocket real-time анализ
 """
 
-import time
 import logging
 import asyncio
+import time
 from asyncio import TaskGroup
-from typing import Optional, List, Dict, Tuple, Set, Callable
-from dataclasses import dataclass
-from datetime import datetime
+from typing import Optional, List, Dict, Tuple, FrozenSet, Callable
+from functools import cached_property
+from datetime import datetime, timedelta
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
 
 # Импорты наших модулей
 from src.utils.logger import setup_main_logger
 from src.data.rest_client import MexcRestClient
 from src.data.async_rest_client import AsyncMexcRestClient
-from src.data.ws_client import MexcWebSocketClient, WSMessage, SubscriptionType, create_websocket_client
+from src.data.ws_client import MexcWebSocketClient, WSMessage, SubscriptionType, create_websocket_client, run_with_uvloop
 from src.data.database import SignalsManager
 from src.data.pairs_fetcher import get_pairs_fetcher, MexcPairsFetcher
 from src.signals.detector import VolumeSpikeDetector, VolumeSignal
 from src.telegram.bot import TelegramNotifier
-from src.config import TRADING_PAIRS, TIMEFRAMES, TIMEFRAME_CONFIGS, DATABASE_CONFIG, CACHE_CONFIG, PAIRS_FETCHER_CONFIG, WEBSOCKET_CONFIG
+from src.config import TRADING_PAIRS, TIMEFRAMES, TIMEFRAME_CONFIGS, DATABASE_CONFIG, CACHE_CONFIG, PAIRS_FETCHER_CONFIG, WEBSOCKET_CONFIG, MEXC_API_MAX_INFLIGHT
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
 
+# Длительность единиц интервала в минутах (Min1, Min60, Hour4, Day1...)
+_INTERVAL_UNIT_MINUTES = {'Min': 1, 'Hour': 60, 'Day': 1440, 'Week': 10080}
 
-@dataclass
-class PairAnalysisTask:
-    """Структура для описания задачи анализа пары"""
-    pair: str
-    timeframe: str
-    task: Optional[asyncio.Task] = None
-    last_run: Optional[datetime] = None
-    error_count: int = 0
-    max_errors: int = 5
+
+def _interval_minutes(interval: str) -> Optional[int]:
+    """
+    Длительность интервала в минутах
+    
+    Args:
+        interval: Имя интервала (Min1, Min60, Hour1...)
+        
+    Returns:
+        Optional[int]: Минуты или None для неизвестного формата
+    """
+    for unit, minutes in _INTERVAL_UNIT_MINUTES.items():
+        count = interval[len(unit):]
+        if interval.startswith(unit) and count.isdigit():
+            return int(count) * minutes
+    return None
 
 
 class AsyncMexcAnalysisBot:
@@ -53,13 +64,20 @@ class AsyncMexcAnalysisBot:
     
     НОВАЯ АРХИТЕКТУРА:
     - Динамический список пар из pairs_fetcher (750+ пар)
-    - Асинхронная обработка каждой пары независимо
+    - Пакетный анализ: все пары таймфрейма загружаются одной волной запросов
     - Автоматическое добавление/удаление пар при изменении списка
     - Масштабируемость без ограничений на количество пар
     - Изоляция ошибок - сбой одной пары не влияет на остальные
     - DUAL-MODE: REST API + WebSocket real-time анализ
     """
     
+    SIGNAL_QUEUE_SIZE = 10000   # Ёмкость очереди сигналов на запись/отправку
+    SIGNAL_BATCH_SIZE = 50      # Максимум сигналов в одном пакете записи
+    SIGNAL_BATCH_LINGER = 0.2   # Сколько ждать добора пакета после первого сигнала (сек)
+    ANALYSIS_WORKERS = 64       # Воркеров загрузки свечей на таймфрейм в волне анализа
+    PAIR_MAX_ERRORS = 5         # Ошибок подряд, после которых пара/таймфрейм пропускает волны
+    PAIR_MAX_BACKOFF_WAVES = 64 # Предел пропуска волн при экспоненциальном откладывании
+    
     def __init__(self, timeframes: List[str] = None, 
                  analysis_interval: int = 60,
                  pairs_update_interval: int = 3600,
@@ -83,8 +101,8 @@ class AsyncMexcAnalysisBot:
         
         # Инициализируем компоненты
         self.async_client = AsyncMexcRestClient(
-            max_connections=100,  # Пул соединений для 750+ пар
-            max_connections_per_host=30,
+            max_connections=256,  # Пул соединений для волн запросов по 750+ парам
+            max_connections_per_host=64,
             request_timeout=10
         )
         self.signals_detector = VolumeSpikeDetector()
@@ -99,17 +117,72 @@ class AsyncMexcAnalysisBot:
         self.ws_task: Optional[asyncio.Task] = None
         self.real_time_analysis_enabled = WEBSOCKET_CONFIG.get('enable_real_time_analysis', True)
         
+        # Диспетчеризация WebSocket сообщений: вид канала -> обработчик,
+        # плюс кэш уже разобранных имён каналов (канал -> обработчик)
+        self._ws_kind_handlers: Dict[str, Callable] = {
+            'kline': self._handle_kline_message,
+            'ticker': self._handle_ticker_message,
+            'deals': self._handle_deals_message,
+        }
+        self._ws_channel_handlers: Dict[str, Optional[Callable]] = {}
+        
+        # Интервал kline-канала WebSocket -> настроенный таймфрейм той же длительности
+        # (None - интервал не анализируется). Статистика real-time ведётся по именам
+        # из self.timeframes, чтобы совпадать со статистикой REST анализа
+        self._ws_interval_timeframes: Dict[str, Optional[str]] = {}
+        self._timeframes_by_minutes: Dict[int, str] = {}
+        for timeframe in self.timeframes:
+            self._ws_interval_timeframes[timeframe] = timeframe
+            minutes = _interval_minutes(timeframe)
+            if minutes is not None:
+                self._timeframes_by_minutes.setdefault(minutes, timeframe)
+        
+        # Порог real-time анализа по таймфрейму (не ищется в конфигурации на каждое сообщение)
+        self._realtime_default_threshold = WEBSOCKET_CONFIG.get('real_time_volume_threshold', 1.5)
+        self._realtime_thresholds: Dict[str, float] = {
+            timeframe: tf_config.get('threshold', self._realtime_default_threshold)
+            for timeframe, tf_config in TIMEFRAME_CONFIGS.items()
+        }
+        
         # Состояние системы
-        self.current_pairs: Set[str] = set()
-        self.running_tasks: Dict[str, PairAnalysisTask] = {}  # key: f"{pair}_{timeframe}"
+        self.current_pairs: FrozenSet[str] = frozenset()
+        self._pairs_version: Optional[int] = None  # Версия списка пар фетчера при последнем обновлении
         self.shutdown_event = asyncio.Event()
         self.pairs_update_task: Optional[asyncio.Task] = None
+        self.analysis_task: Optional[asyncio.Task] = None
+        
+        # Настройки и детекторы по таймфреймам (создаются один раз, детекторы не хранят
+        # состояния между вызовами) и (время, объём) последней свечи по (пара, таймфрейм)
+        self._tf_configs: Dict[str, Dict] = {}
+        self._detectors: Dict[str, VolumeSpikeDetector] = {}
+        for timeframe in self.timeframes:
+            self._get_detector(timeframe)
+        self._last_candles: Dict[Tuple[str, str], Tuple] = {}
+        
+        # Сигналы сохраняются и отправляются пакетами фоновой задачей _signal_writer
+        self._signal_queue: asyncio.Queue = asyncio.Queue(maxsize=self.SIGNAL_QUEUE_SIZE)
+        self._signal_writer_task: Optional[asyncio.Task] = None
+        # Постоянный поток для записи в БД и отправки в Telegram (создаётся лениво, см. _run_io)
+        self._io_executor: Optional[ThreadPoolExecutor] = None
         
         # Статистика
         self.total_analyses = 0
         self.total_signals = 0
         self.total_realtime_messages = 0
-        self.analysis_stats: Dict[str, Dict[str, Dict]] = {}
+        
+        # Плоские счётчики по ключу (пара, таймфрейм) - без предварительной инициализации пар
+        self._analyses: Counter = Counter()
+        self._signals: Counter = Counter()
+        self._errors: Counter = Counter()
+        self._realtime_messages: Counter = Counter()
+        self._last_signal: Dict[Tuple[str, str], VolumeSignal] = {}
+        self._last_analysis: Dict[Tuple[str, str], float] = {}  # time.monotonic() последнего анализа
+        self._pair_analyses: Counter = Counter()
+        
+        # Откладывание пар с ошибками: (пара, таймфрейм) -> (ошибок подряд, номер волны,
+        # с которой пара снова анализируется). Ключ есть только у пар с ошибками
+        self._analysis_wave = 0
+        self._pair_backoff: Dict[Tuple[str, str], Tuple[int, int]] = {}
         
         logger.info(f"⏰ Таймфреймы: {', '.join(self.timeframes)}")
         logger.info(f"🔄 Интервал анализа: {analysis_interval}s")
@@ -117,19 +190,33 @@ class AsyncMexcAnalysisBot:
         logger.info(f"🌐 WebSocket режим: {'включен' if self.enable_websocket else 'выключен'}")
         logger.info("✅ Асинхронный мультипарный бот инициализирован")
     
-    def _init_pair_stats(self, pair: str):
-        """Инициализация статистики для пары"""
-        if pair not in self.analysis_stats:
-            self.analysis_stats[pair] = {}
-            for timeframe in self.timeframes:
-                self.analysis_stats[pair][timeframe] = {
-                    'analyses': 0,
-                    'signals': 0,
-                    'errors': 0,
-                    'last_signal': None,
-                    'last_analysis': None,
-                    'realtime_messages': 0
-                }
+    def get_pair_statistics(self, pair: str) -> Dict:
+        """
+        Статистика анализа по паре
+        
+        Args:
+            pair: Торговая пара
+            
+        Returns:
+            Dict: Статистика по таймфреймам пары
+        """
+        # Монотонные отметки переводим в datetime только здесь, а не при каждом анализе
+        now_wall, now_mono = datetime.now(), time.monotonic()
+        
+        def to_wall(mono: Optional[float]) -> Optional[datetime]:
+            return now_wall - timedelta(seconds=now_mono - mono) if mono is not None else None
+        
+        return {
+            timeframe: {
+                'analyses': self._analyses[pair, timeframe],
+                'signals': self._signals[pair, timeframe],
+                'errors': self._errors[pair, timeframe],
+                'last_signal': self._last_signal.get((pair, timeframe)),
+                'last_analysis': to_wall(self._last_analysis.get((pair, timeframe))),
+                'realtime_messages': self._realtime_messages[pair, timeframe]
+            }
+            for timeframe in self.timeframes
+        }
 
     async def _handle_websocket_message(self, message: WSMessage):
         """
@@ -145,38 +232,80 @@ class AsyncMexcAnalysisBot:
             if not self.real_time_analysis_enabled:
                 return
             
-            # Обрабатываем различные типы сообщений
-            if message.channel.startswith('kline_'):
-                await self._handle_kline_message(message)
-            elif message.channel == 'ticker':
-                await self._handle_ticker_message(message)
-            elif message.channel == 'deals':
-                await self._handle_deals_message(message)
+            # Обработчик по каналу: один поиск в словаре вместо цепочки if/elif
+            channel = message.channel
+            handler = self._ws_channel_handlers.get(channel)
+            if handler is None and channel not in self._ws_channel_handlers:
+                handler = self._ws_channel_handlers[channel] = self._resolve_ws_handler(channel)
+            if handler is not None:
+                await handler(message)
             
         except Exception as e:
             logger.error(f"❌ Ошибка обработки WebSocket сообщения {message.channel} для {message.symbol}: {e}")
 
+    @staticmethod
+    def _channel_parts(channel: str) -> Tuple[str, str]:
+        """
+        Вид канала и его параметр
+        
+        Args:
+            channel: Имя канала (spot@public.market.kline.Min1.BTCUSDT или kline_Min1)
+            
+        Returns:
+            Tuple[str, str]: Вид канала (kline, ticker, deals...) и параметр (таймфрейм/версия)
+        """
+        parts = channel.split('.')
+        if len(parts) >= 5:
+            return parts[2], parts[3]
+        kind, _, param = channel.partition('_')
+        return kind, param
+
+    def _resolve_ws_handler(self, channel: str) -> Optional[Callable]:
+        """Поиск обработчика для нового имени канала"""
+        kind, _ = self._channel_parts(channel)
+        return self._ws_kind_handlers.get(kind)
+
+    def _ws_timeframe(self, interval: str) -> Optional[str]:
+        """
+        Настроенный таймфрейм для интервала kline-канала WebSocket (с кэшированием)
+        
+        Args:
+            interval: Интервал из имени канала (Min1, Min60, Hour1...)
+            
+        Returns:
+            Optional[str]: Таймфрейм из self.timeframes или None, если такой не анализируется
+        """
+        try:
+            return self._ws_interval_timeframes[interval]
+        except KeyError:
+            timeframe = self._timeframes_by_minutes.get(_interval_minutes(interval))
+            self._ws_interval_timeframes[interval] = timeframe
+            return timeframe
+
     async def _handle_kline_message(self, message: WSMessage):
         """Обработка kline (свечных) данных для real-time анализа"""
         try:
             kline_data = message.data
             symbol = message.symbol
-            timeframe = message.channel.replace('kline_', '')
+            _, interval = self._channel_parts(message.channel)
+            timeframe = self._ws_timeframe(interval)
+            if timeframe is None:
+                return
             
             # Обновляем статистику real-time обработки
             self._update_realtime_stats(symbol, timeframe)
             
-            # Получаем конфигурацию для данного таймфрейма
-            tf_config = TIMEFRAME_CONFIGS.get(timeframe, {})
-            threshold = tf_config.get('threshold', WEBSOCKET_CONFIG.get('real_time_volume_threshold', 1.5))
+            # Порог для данного таймфрейма
+            threshold = self._realtime_thresholds.get(timeframe, self._realtime_default_threshold)
             
-            # Извлекаем данные свечи
+            # Извлекаем объём свечи (цена нужна только для отладочного лога)
             current_volume = float(kline_data.get('v', 0))
-            current_price = float(kline_data.get('c', 0))
             
             # Простая real-time проверка на спайк объёма
             if current_volume > 0:
-                logger.debug(f"📊 Real-time {symbol} ({timeframe}): цена {current_price}, объём {current_volume}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("📊 Real-time %s (%s): цена %s, объём %s", symbol, timeframe,
+                                 float(kline_data.get('c', 0)), current_volume)
                 
                 # Можно добавить более сложную логику real-time анализа
                 # Например, сравнение с историческими данными
@@ -187,6 +316,10 @@ class AsyncMexcAnalysisBot:
     async def _handle_ticker_message(self, message: WSMessage):
         """Обработка данных тикера"""
         try:
+            # Данные тикера сейчас только логируются - без DEBUG не разбираем их вовсе
+            if not logger.isEnabledFor(logging.DEBUG):
+                return
+            
             ticker_data = message.data
             symbol = message.symbol
             
@@ -195,7 +328,7 @@ class AsyncMexcAnalysisBot:
             volume = float(ticker_data.get('v', 0))  # Объём за 24ч
             change_percent = float(ticker_data.get('P', 0))  # Изменение в %
             
-            logger.debug(f"📈 Тикер {symbol}: цена {price}, объём 24ч {volume}, изменение {change_percent}%")
+            logger.debug("📈 Тикер %s: цена %s, объём 24ч %s, изменение %s%%", symbol, price, volume, change_percent)
             
         except Exception as e:
             logger.error(f"❌ Ошибка обработки ticker данных: {e}")
@@ -207,19 +340,14 @@ class AsyncMexcAnalysisBot:
             symbol = message.symbol
             
             # Обрабатываем данные сделок для выявления аномальной активности
-            logger.debug(f"💰 Сделки {symbol}: получены данные")
+            logger.debug("💰 Сделки %s: получены данные", symbol)
             
         except Exception as e:
             logger.error(f"❌ Ошибка обработки deals данных: {e}")
 
     def _update_realtime_stats(self, symbol: str, timeframe: str):
         """Обновление статистики real-time обработки"""
-        self._init_pair_stats(symbol)
-        
-        if 'realtime_messages' not in self.analysis_stats[symbol][timeframe]:
-            self.analysis_stats[symbol][timeframe]['realtime_messages'] = 0
-        
-        self.analysis_stats[symbol][timeframe]['realtime_messages'] += 1
+        self._realtime_messages[symbol, timeframe] += 1
 
     async def _init_websocket_client(self):
         """Инициализация WebSocket клиента"""
@@ -288,8 +416,9 @@ class AsyncMexcAnalysisBot:
             List[str]: Список всех доступных торговых пар
         """
         try:
-            # Получаем все доступные пары через pairs_fetcher
-            pairs = self.pairs_fetcher.get_all_pairs()
+            # Получаем все доступные пары через pairs_fetcher. При устаревшем кэше он
+            # делает синхронный HTTP-запрос (requests), поэтому выполняем в потоке
+            pairs = await asyncio.to_thread(self.pairs_fetcher.get_all_pairs)
             
             if pairs:
                 logger.debug(f"📡 Получено {len(pairs)} торговых пар от API")
@@ -303,6 +432,28 @@ class AsyncMexcAnalysisBot:
             logger.error(f"❌ Ошибка при получении списка пар: {e}")
             return TRADING_PAIRS  # Fallback на статический список
 
+    def _get_tf_config(self, timeframe: str) -> Dict:
+        """Настройки анализа таймфрейма (с значениями по умолчанию, вычисляются один раз)"""
+        tf_config = self._tf_configs.get(timeframe)
+        if tf_config is None:
+            tf_config = self._tf_configs[timeframe] = TIMEFRAME_CONFIGS.get(timeframe, {
+                'limit': 50,
+                'window': 10,
+                'threshold': 2.0
+            })
+        return tf_config
+
+    def _get_detector(self, timeframe: str) -> VolumeSpikeDetector:
+        """Детектор для таймфрейма (не хранит состояния - один на таймфрейм)"""
+        detector = self._detectors.get(timeframe)
+        if detector is None:
+            tf_config = self._get_tf_config(timeframe)
+            detector = self._detectors[timeframe] = VolumeSpikeDetector(
+                threshold=tf_config['threshold'],
+                window_size=tf_config['window']
+            )
+        return detector
+
     async def analyze_pair_timeframe_async(self, pair: str, timeframe: str) -> Optional[VolumeSignal]:
         """
         Асинхронный анализ конкретной пары на конкретном таймфрейме
@@ -315,184 +466,334 @@ class AsyncMexcAnalysisBot:
             VolumeSignal: Найденный сигнал или None
         """
         try:
-            # Получаем настройки для данного таймфрейма
-            tf_config = TIMEFRAME_CONFIGS.get(timeframe, {
-                'limit': 50,
-                'window': 10,
-                'threshold': 2.0
-            })
-            
             # Шаг 1: Получаем свечи через асинхронный REST API
-            logger.debug(f"📊 Получение данных для {pair} ({timeframe})...")
+            logger.debug("📊 Получение данных для %s (%s)...", pair, timeframe)
             
             klines = await self.async_client.get_klines_async(
                 pair=pair,
                 interval=timeframe,
-                limit=tf_config['limit']
+                limit=self._get_tf_config(timeframe)['limit']
             )
             
             if not klines:
                 logger.warning(f"❌ Не удалось получить данные для {pair} ({timeframe})")
                 return None
             
-            # Шаг 2: Настраиваем детектор для этого таймфрейма
-            detector = VolumeSpikeDetector(
-                threshold=tf_config['threshold'],
-                window_size=tf_config['window']
-            )
-            
-            # Шаг 3: Анализируем спайки объёма (в executor для CPU-интенсивных операций)
-            signal = await asyncio.to_thread(
-                detector.analyze_volume_spike,
-                klines, pair, timeframe
-            )
+            # Шаг 2: Анализируем спайки объёма - расчёт по окну занимает микросекунды,
+            # поэтому выполняется прямо в event loop без передачи в поток
+            signal = self._get_detector(timeframe).analyze_volume_spike(klines, pair, timeframe)
             
             # Обновляем статистику
             self._update_analysis_stats(pair, timeframe, signal)
             
-            # Шаг 4: Если найден сигнал - сохраняем и отправляем уведомление
+            # Шаг 3: Если найден сигнал - сохраняем и отправляем уведомление
             if signal:
-                logger.info(f"🎯 Обнаружен сигнал для {pair} ({timeframe}): {signal.message}")
-                
-                # Сохраняем сигнал в базу данных через кэш
-                await asyncio.to_thread(self.signals_manager.save_signal, signal)
-                logger.debug(f"💾 Сигнал для {pair} ({timeframe}) сохранен в БД")
-                
-                # Отправляем через Telegram
-                success = await asyncio.to_thread(self.telegram_notifier.send_volume_signal, signal)
-                if success:
-                    logger.info(f"📤 Сигнал для {pair} ({timeframe}) успешно отправлен")
-                else:
-                    logger.error(f"❌ Ошибка при отправке сигнала для {pair} ({timeframe})")
-                
+                await self._process_signal(pair, timeframe, signal)
                 return signal
             else:
-                logger.debug(f"✅ Аномалий не обнаружено для {pair} ({timeframe})")
+                logger.debug("✅ Аномалий не обнаружено для %s (%s)", pair, timeframe)
                 return None
                 
         except Exception as e:
             logger.error(f"💥 Ошибка при анализе {pair} ({timeframe}): {e}")
             self._update_error_stats(pair, timeframe)
             return None
-    
-    def _update_analysis_stats(self, pair: str, timeframe: str, signal: Optional[VolumeSignal]):
-        """Обновление статистики анализа"""
-        self._init_pair_stats(pair)
+
+    async def _process_signal(self, pair: str, timeframe: str, signal: VolumeSignal) -> None:
+        """
+        Передача сигнала на сохранение и отправку
+        
+        При работающем _signal_writer сигнал только ставится в очередь, иначе
+        (анализ вне run_async) обрабатывается сразу в потоке ввода-вывода.
+        """
+        logger.info(f"🎯 Обнаружен сигнал для {pair} ({timeframe}): {signal.message}")
+        
+        writer = self._signal_writer_task
+        if writer is None or writer.done():
+            await self._run_io(self._deliver_signals, [signal])
+            return
+        
+        try:
+            self._signal_queue.put_nowait(signal)
+        except asyncio.QueueFull:
+            logger.error(f"❌ Очередь сигналов переполнена, сигнал {pair} ({timeframe}) отброшен")
+
+    async def _signal_writer(self):
+        """
+        Фоновая запись и отправка сигналов пакетами
+        
+        Без сигналов ждёт очередь без таймаута. После первого сигнала добирает пакет
+        до SIGNAL_BATCH_SIZE в течение SIGNAL_BATCH_LINGER секунд и обрабатывает его
+        одним вызовом в потоке ввода-вывода. Завершается, дойдя до sentinel None,
+        который ставит _stop_signal_writer после всех уже поставленных сигналов.
+        """
+        queue = self._signal_queue
+        loop = asyncio.get_running_loop()
+        
+        stopping = False
+        while not stopping:
+            signal = await queue.get()
+            if signal is None:
+                break
+            
+            batch = [signal]
+            deadline = loop.time() + self.SIGNAL_BATCH_LINGER
+            while len(batch) < self.SIGNAL_BATCH_SIZE:
+                if not queue.empty():
+                    signal = queue.get_nowait()
+                else:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        signal = await asyncio.wait_for(queue.get(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if signal is None:
+                    stopping = True
+                    break
+                batch.append(signal)
+            
+            try:
+                await self._run_io(self._deliver_signals, batch)
+            except Exception as e:
+                logger.error(f"❌ Ошибка обработки пакета из {len(batch)} сигналов: {e}")
+
+    async def _stop_signal_writer(self):
+        """Остановка _signal_writer: sentinel встаёт в очередь после уже поставленных сигналов"""
+        writer = self._signal_writer_task
+        if writer is not None and not writer.done():
+            await self._signal_queue.put(None)
+
+    async def _run_io(self, func: Callable, *args):
+        """
+        Выполнение блокирующей операции с БД или Telegram в потоке ввода-вывода
+        
+        Один постоянный поток вместо to_thread на каждый пакет: операции
+        выполняются по очереди и не занимают общий пул потоков цикла событий.
+        
+        Args:
+            func: Блокирующая функция
+            *args: Её аргументы
+        """
+        if self._io_executor is None:
+            self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SignalIO")
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor, func, *args)
+
+    def _deliver_signals(self, signals: List[VolumeSignal]):
+        """Сохранение пакета сигналов в БД и отправка в Telegram (выполняется в потоке)"""
+        # Сохраняем сигналы в базу данных через кэш одним пакетом
+        self.signals_manager.save_signals_batch(signals)
+        logger.debug("💾 Сохранено сигналов в БД: %s", len(signals))
+        
+        # Несколько сигналов уходят одним сообщением
+        if len(signals) == 1:
+            success = self.telegram_notifier.send_volume_signal(signals[0])
+        else:
+            success = self.telegram_notifier.send_multiple_signals(signals)
+        
+        if success:
+            logger.info(f"📤 Отправлено сигналов в Telegram: {len(signals)}")
+        else:
+            logger.error(f"❌ Ошибка при отправке {len(signals)} сигналов в Telegram")
+
+    async def analyze_timeframe_batch(self, timeframe: str, pairs: List[str]) -> List[VolumeSignal]:
+        """
+        Пакетный анализ всех пар одного таймфрейма
+        
+        Свечи всех пар загружаются одной волной через общий пул соединений клиента
+        (фиксированным пулом воркеров, см. _fetch_klines_many). Детектор вызывается
+        прямо в цикле событий и только для пар, у которых последняя свеча
+        изменилась с прошлой волны.
+        
+        Args:
+            timeframe: Таймфрейм
+            pairs: Торговые пары
+            
+        Returns:
+            List[VolumeSignal]: Найденные сигналы
+        """
+        # Пары, отложенные после серии ошибок, пропускают волну
+        backoff = self._pair_backoff
+        if backoff:
+            wave = self._analysis_wave
+            pairs = [pair for pair in pairs
+                     if (entry := backoff.get((pair, timeframe))) is None or entry[1] <= wave]
+            if not pairs:
+                return []
+        
+        limit = self._get_tf_config(timeframe)['limit']
+        results = await self._fetch_klines_many(timeframe, pairs, limit)
+        
+        changed: List[Tuple[str, List[Dict]]] = []
+        for pair, klines in zip(pairs, results):
+            if isinstance(klines, BaseException) or not klines:
+                if isinstance(klines, BaseException):
+                    logger.error(f"💥 Ошибка загрузки {pair} ({timeframe}): {klines}")
+                self._update_error_stats(pair, timeframe)
+                continue
+            
+            # Время и объём последней свечи: если не изменились, анализ даст тот же результат
+            last = klines[-1]
+            fingerprint = (last.get('t'), last.get('q'))
+            key = (pair, timeframe)
+            if self._last_candles.get(key) == fingerprint:
+                if backoff:
+                    backoff.pop(key, None)
+                continue
+            self._last_candles[key] = fingerprint
+            changed.append((pair, klines))
+        
+        if not changed:
+            return []
+        
+        # Детектор - несколько микросекунд на пару: передача волны в поток стоит дороже самого анализа
+        detections = self._detect_many(timeframe, changed)
+        
+        signals = []
+        now = time.monotonic()
+        for pair, signal in detections:
+            if backoff:
+                backoff.pop((pair, timeframe), None)
+            self._update_analysis_stats(pair, timeframe, signal, now)
+            if signal:
+                signals.append(signal)
+                await self._process_signal(pair, timeframe, signal)
+        
+        logger.debug("📊 Волна %s: загружено %s, проанализировано %s, сигналов %s",
+                     timeframe, len(pairs), len(changed), len(signals))
+        return signals
+
+    async def _fetch_klines_many(self, timeframe: str, pairs: List[str], limit: int) -> List:
+        """
+        Загрузка свечей для списка пар одним пакетом клиента
+        
+        Пакет выполняют ANALYSIS_WORKERS воркеров клиента (get_klines_batch_async):
+        число корутин не растёт с числом пар.
+        
+        Args:
+            timeframe: Таймфрейм
+            pairs: Торговые пары
+            limit: Количество свечей
+            
+        Returns:
+            List: Свечи (или исключение) для каждой пары в порядке pairs
+        """
+        return await self.async_client.get_klines_batch_async(
+            [(pair, timeframe, limit) for pair in pairs], workers=self.ANALYSIS_WORKERS
+        )
+
+    def _detect_many(self, timeframe: str,
+                     items: List[Tuple[str, List[Dict]]]) -> List[Tuple[str, Optional[VolumeSignal]]]:
+        """Поиск спайков по списку пар одного таймфрейма"""
+        detector = self._get_detector(timeframe)
+        detections = []
+        for pair, klines in items:
+            try:
+                detections.append((pair, detector.analyze_volume_spike(klines, pair, timeframe)))
+            except Exception as e:
+                logger.error(f"💥 Ошибка при анализе {pair} ({timeframe}): {e}")
+                # Те же свечи в следующей волне нужно проанализировать заново
+                self._last_candles.pop((pair, timeframe), None)
+                self._update_error_stats(pair, timeframe)
+        return detections
+
+    def _update_analysis_stats(self, pair: str, timeframe: str, signal: Optional[VolumeSignal],
+                               now: Optional[float] = None):
+        """
+        Обновление статистики анализа
         
-        self.analysis_stats[pair][timeframe]['analyses'] += 1
-        self.analysis_stats[pair][timeframe]['last_analysis'] = datetime.now()
+        Args:
+            pair: Торговая пара
+            timeframe: Таймфрейм
+            signal: Найденный сигнал или None
+            now: Отметка time.monotonic() (для пакета читается один раз на всю волну)
+        """
+        key = (pair, timeframe)
+        self._analyses[key] += 1
+        self._last_analysis[key] = now if now is not None else time.monotonic()
+        self._pair_analyses[pair] += 1
         self.total_analyses += 1
         
         if signal:
-            self.analysis_stats[pair][timeframe]['signals'] += 1
-            self.analysis_stats[pair][timeframe]['last_signal'] = signal
+            self._signals[key] += 1
+            self._last_signal[key] = signal
             self.total_signals += 1
     
     def _update_error_stats(self, pair: str, timeframe: str):
-        """Обновление статистики ошибок"""
-        self._init_pair_stats(pair)
-        self.analysis_stats[pair][timeframe]['errors'] += 1
-
-    async def continuous_pair_analysis(self, pair: str, timeframe: str):
         """
-        Непрерывный анализ конкретной пары на конкретном таймфрейме
+        Обновление статистики ошибок и откладывание пары
         
-        Эта корутина работает бесконечно, анализируя одну пару/таймфрейм
-        с заданным интервалом до получения сигнала shutdown.
+        После PAIR_MAX_ERRORS ошибок подряд пара/таймфрейм пропускает 1, 2, 4...
+        (не более PAIR_MAX_BACKOFF_WAVES) волн. Успешный анализ сбрасывает счётчик.
         """
-        task_key = f"{pair}_{timeframe}"
-        error_count = 0
-        max_errors = 5
+        key = (pair, timeframe)
+        self._errors[key] += 1
         
-        logger.debug(f"🔄 Запущен непрерывный анализ для {pair} ({timeframe})")
+        failures = self._pair_backoff.get(key, (0, 0))[0] + 1
+        resume_wave = self._analysis_wave + 1
+        if failures >= self.PAIR_MAX_ERRORS:
+            skip = min(2 ** (failures - self.PAIR_MAX_ERRORS), self.PAIR_MAX_BACKOFF_WAVES)
+            resume_wave += skip
+            logger.warning(f"🚫 {pair} ({timeframe}): {failures} ошибок подряд, "
+                           f"пропуск {skip} волн анализа")
+        self._pair_backoff[key] = (failures, resume_wave)
+
+    async def batch_analysis_loop(self):
+        """
+        Непрерывный пакетный анализ всех пар
         
-        try:
-            while not self.shutdown_event.is_set():
-                try:
-                    # Выполняем анализ
-                    signal = await self.analyze_pair_timeframe_async(pair, timeframe)
-                    
-                    # Сбрасываем счетчик ошибок при успешном анализе
-                    error_count = 0
-                    
-                    # Обновляем информацию о задаче
-                    if task_key in self.running_tasks:
-                        self.running_tasks[task_key].last_run = datetime.now()
-                        self.running_tasks[task_key].error_count = error_count
-                
-                except Exception as e:
-                    error_count += 1
-                    logger.error(f"❌ Ошибка в анализе {pair} ({timeframe}): {e} (ошибка {error_count}/{max_errors})")
-                    
-                    # Обновляем счетчик ошибок в задаче
-                    if task_key in self.running_tasks:
-                        self.running_tasks[task_key].error_count = error_count
-                    
-                    # Если слишком много ошибок подряд - временно останавливаем эту задачу
-                    if error_count >= max_errors:
-                        logger.error(f"🚫 Задача {pair} ({timeframe}) остановлена из-за превышения лимита ошибок")
-                        break
-                
-                # Ждем до следующего анализа или сигнала shutdown
-                try:
-                    await asyncio.wait_for(
-                        self.shutdown_event.wait(), 
-                        timeout=self.analysis_interval
-                    )
-                    break  # Получен сигнал shutdown
-                except asyncio.TimeoutError:
-                    continue  # Таймаут - продолжаем анализ
-                    
-        except asyncio.CancelledError:
-            logger.debug(f"🛑 Задача анализа {pair} ({timeframe}) отменена")
-            raise
-        except Exception as e:
-            logger.error(f"💥 Критическая ошибка в задаче анализа {pair} ({timeframe}): {e}")
-        finally:
-            logger.debug(f"🏁 Завершена задача анализа {pair} ({timeframe})")
+        Одна корутина вместо задачи на каждую пару/таймфрейм: раз в analysis_interval
+        запускается волна анализа по всем таймфреймам сразу для текущего списка пар.
+        Сбой одной пары или таймфрейма не влияет на остальные, а пара с серией
+        ошибок временно откладывается (см. _update_error_stats).
+        """
+        logger.info("🔄 Запущен пакетный анализ пар")
+        
+        while not self.shutdown_event.is_set():
+            self._analysis_wave += 1
+            pairs = list(self.current_pairs)
+            if pairs:
+                results = await asyncio.gather(
+                    *(self.analyze_timeframe_batch(timeframe, pairs) for timeframe in self.timeframes),
+                    return_exceptions=True
+                )
+                for timeframe, result in zip(self.timeframes, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"❌ Ошибка в волне анализа {timeframe}: {result}")
+            
+            # Ждем до следующей волны или сигнала shutdown
+            try:
+                await asyncio.wait_for(
+                    self.shutdown_event.wait(), 
+                    timeout=self.analysis_interval
+                )
+                break  # Получен сигнал shutdown
+            except asyncio.TimeoutError:
+                continue  # Таймаут - следующая волна
 
-    async def update_pairs_and_tasks(self):
+    async def update_pairs(self):
         """
-        Периодическое обновление списка пар и управление задачами анализа
+        Периодическое обновление списка пар
         
-        Эта корутина:
-        1. Получает актуальный список пар
-        2. Сравнивает с текущими активными задачами
-        3. Запускает новые задачи для новых пар
-        4. Останавливает задачи для удаленных пар
+        Новый список подхватывается следующей волной batch_analysis_loop,
+        для удаленных пар очищается состояние последних свечей.
         """
-        logger.info("🔄 Запущен поток обновления списка пар и управления задачами")
+        logger.info("🔄 Запущен поток обновления списка пар")
         
         while not self.shutdown_event.is_set():
             try:
-                # Получаем актуальный список пар
-                new_pairs = await self.get_dynamic_pairs()
-                new_pairs_set = set(new_pairs)
-                
-                logger.debug(f"📡 Проверка обновлений: текущих пар {len(self.current_pairs)}, новых {len(new_pairs_set)}")
-                
-                # Определяем изменения
-                added_pairs = new_pairs_set - self.current_pairs
-                removed_pairs = self.current_pairs - new_pairs_set
-                
-                if added_pairs or removed_pairs:
-                    logger.info(f"📈 Изменения в списке пар: +{len(added_pairs)}, -{len(removed_pairs)}")
-                    
-                    # Останавливаем задачи для удаленных пар
-                    if removed_pairs:
-                        await self._stop_tasks_for_pairs(removed_pairs)
-                    
-                    # Запускаем задачи для новых пар
-                    if added_pairs:
-                        await self._start_tasks_for_pairs(added_pairs)
-                    
-                    # Обновляем текущий список пар
-                    self.current_pairs = new_pairs_set
-                    
-                    logger.info(f"✅ Обновление завершено. Активных задач: {len(self.running_tasks)}")
+                # Версия и множество пар фетчера: при неизменной версии сравнение не нужно
+                version, new_pairs_set = await asyncio.to_thread(self.pairs_fetcher.get_pairs_snapshot)
+                if not new_pairs_set:
+                    logger.warning("⚠️ Не удалось получить пары от API, используем fallback")
+                    version, new_pairs_set = None, frozenset(TRADING_PAIRS)
                 
-                # Проверяем состояние задач и перезапускаем упавшие
-                await self._check_and_restart_failed_tasks()
+                if version is not None and version == self._pairs_version:
+                    logger.debug("📡 Список пар не изменился (версия %s)", version)
+                else:
+                    self._pairs_version = version
+                    self._apply_pairs_update(new_pairs_set)
                 
             except Exception as e:
                 logger.error(f"❌ Ошибка при обновлении списка пар: {e}")
@@ -507,83 +808,30 @@ class AsyncMexcAnalysisBot:
             except asyncio.TimeoutError:
                 continue  # Таймаут - продолжаем работу
 
-    async def _start_tasks_for_pairs(self, pairs: Set[str]):
-        """Запуск задач анализа для новых пар"""
-        for pair in pairs:
-            for timeframe in self.timeframes:
-                task_key = f"{pair}_{timeframe}"
-                
-                if task_key not in self.running_tasks:
-                    # Создаем и запускаем новую задачу
-                    task = asyncio.create_task(
-                        self.continuous_pair_analysis(pair, timeframe),
-                        name=task_key
-                    )
-                    
-                    self.running_tasks[task_key] = PairAnalysisTask(
-                        pair=pair,
-                        timeframe=timeframe,
-                        task=task,
-                        last_run=None,
-                        error_count=0
-                    )
-                    
-                    logger.debug(f"▶️ Запущена задача анализа {pair} ({timeframe})")
-
-    async def _stop_tasks_for_pairs(self, pairs: Set[str]):
-        """Остановка задач анализа для удаленных пар"""
-        tasks_to_remove = []
-        
-        for task_key, task_info in self.running_tasks.items():
-            if task_info.pair in pairs:
-                # Отменяем задачу
-                if task_info.task and not task_info.task.done():
-                    task_info.task.cancel()
-                    try:
-                        await task_info.task
-                    except asyncio.CancelledError:
-                        pass
-                
-                tasks_to_remove.append(task_key)
-                logger.debug(f"⏹️ Остановлена задача анализа {task_info.pair} ({task_info.timeframe})")
-        
-        # Удаляем остановленные задачи из словаря
-        for task_key in tasks_to_remove:
-            del self.running_tasks[task_key]
-
-    async def _check_and_restart_failed_tasks(self):
-        """Проверка и перезапуск упавших задач"""
-        failed_tasks = []
-        
-        for task_key, task_info in self.running_tasks.items():
-            if task_info.task and task_info.task.done():
-                # Задача завершилась, проверяем причину
-                try:
-                    await task_info.task  # Получаем исключение если было
-                except asyncio.CancelledError:
-                    # Задача была отменена - это нормально
-                    continue
-                except Exception as e:
-                    logger.error(f"💥 Задача {task_key} упала с ошибкой: {e}")
-                
-                # Если количество ошибок не превышено - перезапускаем
-                if task_info.error_count < task_info.max_errors:
-                    failed_tasks.append(task_key)
-                else:
-                    logger.warning(f"🚫 Задача {task_key} не перезапускается (превышен лимит ошибок)")
+    def _apply_pairs_update(self, new_pairs_set: FrozenSet[str]):
+        """Применение нового множества пар к анализу"""
+        # Изменения определяем одним проходом по симметрической разности
+        changed_pairs = new_pairs_set ^ self.current_pairs
+        if not changed_pairs:
+            return
         
-        # Перезапускаем упавшие задачи
-        for task_key in failed_tasks:
-            task_info = self.running_tasks[task_key]
-            
-            # Создаем новую задачу
-            new_task = asyncio.create_task(
-                self.continuous_pair_analysis(task_info.pair, task_info.timeframe),
-                name=task_key
-            )
-            
-            task_info.task = new_task
-            logger.info(f"🔄 Перезапущена задача {task_key}")
+        added_pairs = changed_pairs & new_pairs_set
+        removed_pairs = changed_pairs - added_pairs
+        logger.info(f"📈 Изменения в списке пар: +{len(added_pairs)}, -{len(removed_pairs)}")
+        
+        if removed_pairs:
+            self._last_candles = {
+                key: fingerprint for key, fingerprint in self._last_candles.items()
+                if key[0] not in removed_pairs
+            }
+            # Словарь откладывания меняется на месте: его держит текущая волна анализа
+            for key in [key for key in self._pair_backoff if key[0] in removed_pairs]:
+                del self._pair_backoff[key]
+        
+        # Обновляем текущий список пар
+        self.current_pairs = new_pairs_set
+        
+        logger.info(f"✅ Обновление завершено. Пар в анализе: {len(self.current_pairs)}")
 
     async def run_async(self):
         """
@@ -596,7 +844,7 @@ class AsyncMexcAnalysisBot:
         logger.info("🚀 Запуск асинхронного мультипарного анализа...")
         
         # Отправляем уведомление о запуске
-        await asyncio.to_thread(self.telegram_notifier.send_startup_notification)
+        await self._run_io(self.telegram_notifier.send_startup_notification)
         
         # Запускаем фетчер пар в автоматическом режиме
         self.pairs_fetcher.start_auto_update()
@@ -605,13 +853,16 @@ class AsyncMexcAnalysisBot:
         await self._init_websocket_client()
         
         try:
+            # Общая HTTP-сессия создаётся в работающем цикле и закрывается в _cleanup
+            await self.async_client.open()
+            
             # Получаем начальный список пар
             initial_pairs = await self.get_dynamic_pairs()
-            self.current_pairs = set(initial_pairs)
+            self.current_pairs = frozenset(initial_pairs)
             
             logger.info(f"📊 Начальный список: {len(self.current_pairs)} торговых пар")
             logger.info(f"⏰ Анализ {len(self.timeframes)} таймфреймов: {', '.join(self.timeframes)}")
-            logger.info(f"🎯 Общее количество задач анализа: {len(self.current_pairs) * len(self.timeframes)}")
+            logger.info(f"🎯 Пар/таймфреймов в волне анализа: {len(self.current_pairs) * len(self.timeframes)}")
             
             if self.enable_websocket:
                 logger.info("🌐 Dual-mode: REST API + WebSocket real-time анализ")
@@ -622,7 +873,7 @@ class AsyncMexcAnalysisBot:
             async with TaskGroup() as tg:
                 # Запускаем задачу управления парами
                 self.pairs_update_task = tg.create_task(
-                    self.update_pairs_and_tasks(),
+                    self.update_pairs(),
                     name="pairs_updater"
                 )
                 
@@ -630,14 +881,24 @@ class AsyncMexcAnalysisBot:
                 if self.enable_websocket:
                     await self._start_websocket_client()
                 
-                # Запускаем начальные задачи анализа для всех пар
-                await self._start_tasks_for_pairs(self.current_pairs)
+                # Запускаем запись сигналов до анализа, чтобы сигналы шли в очередь
+                self._signal_writer_task = tg.create_task(
+                    self._signal_writer(),
+                    name="signal_writer"
+                )
+                
+                # Запускаем пакетный анализ всех пар
+                self.analysis_task = tg.create_task(
+                    self.batch_analysis_loop(),
+                    name="batch_analysis"
+                )
                 
                 logger.info("✅ Все задачи запущены. Система работает в асинхронном режиме")
                 logger.info("💡 Для остановки нажмите Ctrl+C")
                 
                 # Ждем сигнала завершения
                 await self.shutdown_event.wait()
+                await self._stop_signal_writer()
                 
         except* Exception as eg:
             # TaskGroup автоматически отменяет все задачи при исключении
@@ -659,21 +920,22 @@ class AsyncMexcAnalysisBot:
         if self.pairs_fetcher:
             self.pairs_fetcher.stop_auto_update()
         
-        # Отменяем все оставшиеся задачи
-        for task_key, task_info in self.running_tasks.items():
-            if task_info.task and not task_info.task.done():
-                task_info.task.cancel()
-                try:
-                    await task_info.task
-                except asyncio.CancelledError:
-                    pass
+        # Дописываем сигналы, оставшиеся в очереди (например, после ошибки в TaskGroup)
+        pending_signals = []
+        while not self._signal_queue.empty():
+            signal = self._signal_queue.get_nowait()
+            if signal is not None:
+                pending_signals.append(signal)
+        if pending_signals:
+            await self._run_io(self._deliver_signals, pending_signals)
         
         # Закрываем соединения
-        if hasattr(self.async_client, 'close'):
-            await self.async_client.close()
+        await self.async_client.close()
         
-        # Закрываем менеджер сигналов
-        await asyncio.to_thread(self.signals_manager.close)
+        # Закрываем менеджер сигналов - в том же потоке, после всех записей
+        await self._run_io(self.signals_manager.close)
+        self._io_executor.shutdown()
+        self._io_executor = None
         
         logger.info("✅ Очистка ресурсов завершена")
 
@@ -692,7 +954,9 @@ class AsyncMexcAnalysisBot:
         
         return {
             'total_pairs': len(self.current_pairs),
-            'total_tasks': len(self.running_tasks),
+            'pair_timeframes': len(self.current_pairs) * len(self.timeframes),
+            'backed_off': sum(1 for _, resume_wave in self._pair_backoff.values()
+                              if resume_wave > self._analysis_wave + 1),
             'total_analyses': self.total_analyses,
             'total_signals': self.total_signals,
             'timeframes': self.timeframes,
@@ -703,28 +967,32 @@ class AsyncMexcAnalysisBot:
         }
 
     def print_system_statistics(self):
-        """Вывод статистики системы"""
+        """Вывод статистики системы одним сообщением лога"""
         status = self.get_system_status()
         
-        logger.info("📊 === СТАТИСТИКА АСИНХРОННОЙ СИСТЕМЫ ===")
-        logger.info(f"📈 Всего торговых пар: {status['total_pairs']}")
-        logger.info(f"⚙️ Активных задач анализа: {status['total_tasks']}")
-        logger.info(f"🔍 Всего анализов: {status['total_analyses']}")
-        logger.info(f"🎯 Всего сигналов: {status['total_signals']}")
-        logger.info(f"⏰ Таймфреймы: {', '.join(status['timeframes'])}")
+        lines = [
+            "📊 === СТАТИСТИКА АСИНХРОННОЙ СИСТЕМЫ ===",
+            f"📈 Всего торговых пар: {status['total_pairs']}",
+            f"⚙️ Пар/таймфреймов в анализе: {status['pair_timeframes']} (отложено после ошибок: {status['backed_off']})",
+            f"🔍 Всего анализов: {status['total_analyses']}",
+            f"🎯 Всего сигналов: {status['total_signals']}",
+            f"⏰ Таймфреймы: {', '.join(status['timeframes'])}",
+        ]
         
         # Статистика WebSocket
         ws_status = status['websocket']
         if ws_status['enabled']:
-            logger.info(f"🌐 WebSocket: {'подключен' if ws_status['connected'] else 'отключен'}")
-            logger.info(f"📨 Real-time сообщений: {ws_status['realtime_messages']}")
+            lines.append(f"🌐 WebSocket: {'подключен' if ws_status['connected'] else 'отключен'}")
+            lines.append(f"📨 Real-time сообщений: {ws_status['realtime_messages']}")
         else:
-            logger.info("🌐 WebSocket: выключен")
+            lines.append("🌐 WebSocket: выключен")
         
         # Статистика по парам
-        if self.analysis_stats:
-            active_pairs = len([p for p in self.analysis_stats.keys() if p in self.current_pairs])
-            logger.info(f"📊 Активных пар в статистике: {active_pairs}")
+        if self._pair_analyses:
+            active_pairs = len(self._pair_analyses.keys() & self.current_pairs)
+            lines.append(f"📊 Активных пар в статистике: {active_pairs}")
+        
+        logger.info("\n".join(lines))
 
 
 # Обратная совместимость: Адаптер для старого синхронного API
@@ -744,76 +1012,209 @@ class MexcAnalysisBot:
         self.trading_pairs = pairs or TRADING_PAIRS
         self.timeframes = timeframes or TIMEFRAMES
         
-        # Старые компоненты для совместимости
-        self.rest_client = MexcRestClient()
+        # Старые компоненты для совместимости (REST клиент и Telegram создаются при первом обращении)
         self.volume_detector = VolumeSpikeDetector()
-        self.telegram_notifier = TelegramNotifier()
         self.signals_manager = SignalsManager(DATABASE_CONFIG, CACHE_CONFIG)
         
-        # Статистика
-        self.analysis_stats = {}
+        # Статистика: плоские счётчики по ключу (пара, таймфрейм) и итоги по парам
+        self._analyses: Counter = Counter()
+        self._signals: Counter = Counter()
+        self._last_signal: Dict[Tuple[str, str], VolumeSignal] = {}
+        self._pair_analyses: Counter = Counter()
+        self._pair_signals: Counter = Counter()
         self.total_analyses = 0
         self.total_signals = 0
         
+        # Ограничение одновременных REST-запросов (семафор привязан к своему event loop)
+        self._request_semaphore: Optional[asyncio.Semaphore] = None
+        self._request_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        
         self._init_statistics()
         logger.info("✅ Бот инициализирован (обратная совместимость)")
     
+    @cached_property
+    def rest_client(self) -> MexcRestClient:
+        """REST клиент MEXC (создаётся лениво)"""
+        return MexcRestClient()
+    
+    @cached_property
+    def telegram_notifier(self) -> TelegramNotifier:
+        """Telegram уведомитель (создаётся лениво)"""
+        return TelegramNotifier()
+    
     def _init_statistics(self):
         """Инициализация статистики для всех пар и таймфреймов"""
-        for pair in self.trading_pairs:
-            self.analysis_stats[pair] = {}
-            for timeframe in self.timeframes:
-                self.analysis_stats[pair][timeframe] = {
-                    'analyses': 0,
-                    'signals': 0,
-                    'last_signal': None
-                }
+        # Детекторы не хранят состояния между вызовами - создаём по одному на таймфрейм
+        default_config = {'limit': 50, 'window': 10, 'threshold': 2.0}
+        self._detectors: Dict[str, VolumeSpikeDetector] = {}
+        self._tf_limits: Dict[str, int] = {}
+        for timeframe in self.timeframes:
+            tf_config = TIMEFRAME_CONFIGS.get(timeframe, default_config)
+            self._detectors[timeframe] = VolumeSpikeDetector(
+                threshold=tf_config['threshold'], window_size=tf_config['window']
+            )
+            self._tf_limits[timeframe] = tf_config['limit']
+        
+        # Счётчики Counter не требуют предварительного заполнения нулями
+        self._analyses.clear()
+        self._signals.clear()
+        self._last_signal.clear()
+        self._pair_analyses.clear()
+        self._pair_signals.clear()
     
-    def analyze_pair_timeframe(self, pair: str, timeframe: str) -> Optional[VolumeSignal]:
+    def analyze_pair_timeframe(self, pair: str, timeframe: str,
+                               klines: Optional[List[Dict]] = None) -> Optional[VolumeSignal]:
         """Синхронный анализ пары (для обратной совместимости)"""
         try:
-            tf_config = TIMEFRAME_CONFIGS.get(timeframe, {
-                'limit': 50, 'window': 10, 'threshold': 2.0
-            })
-            
-            klines = self.rest_client.get_klines(pair=pair, interval=timeframe, limit=tf_config['limit'])
+            if klines is None:
+                klines = self.rest_client.get_klines(pair=pair, interval=timeframe,
+                                                     limit=self._tf_limits[timeframe])
             if not klines:
                 return None
             
-            detector = VolumeSpikeDetector(threshold=tf_config['threshold'], window_size=tf_config['window'])
-            signal = detector.analyze_volume_spike(klines, pair, timeframe)
+            signal = self._detect_signal(pair, timeframe, klines)
+            if signal:
+                self._record_signal(pair, timeframe, signal)
             
-            self.analysis_stats[pair][timeframe]['analyses'] += 1
-            self.total_analyses += 1
+            return signal
+        except Exception as e:
+            logger.error(f"Ошибка при анализе {pair} ({timeframe}): {e}")
+            return None
+    
+    async def analyze_pair_timeframe_async(self, pair: str, timeframe: str,
+                                           klines: Optional[List[Dict]] = None) -> Optional[VolumeSignal]:
+        """Асинхронный анализ пары: загрузка через aiohttp, запись сигнала вне event loop"""
+        try:
+            if klines is None:
+                async with self._get_request_semaphore():
+                    klines = await self.rest_client.get_klines_async(
+                        pair=pair, interval=timeframe, limit=self._tf_limits[timeframe]
+                    )
+            if not klines:
+                return None
             
+            signal = self._detect_signal(pair, timeframe, klines)
             if signal:
-                self.signals_manager.save_signal(signal)
-                self.telegram_notifier.send_volume_signal(signal)
-                self.analysis_stats[pair][timeframe]['signals'] += 1
-                self.analysis_stats[pair][timeframe]['last_signal'] = signal
-                self.total_signals += 1
+                # Запись в БД и отправка в Telegram блокирующие - выполняем в потоке,
+                # а счётчики обновляем здесь, в event loop (Counter += не атомарен между потоками)
+                await asyncio.to_thread(self._deliver_signal, signal)
+                self._update_signal_stats(pair, timeframe, signal)
             
             return signal
         except Exception as e:
             logger.error(f"Ошибка при анализе {pair} ({timeframe}): {e}")
             return None
     
+    def _get_request_semaphore(self) -> asyncio.Semaphore:
+        """Семафор REST-запросов для текущего event loop"""
+        loop = asyncio.get_running_loop()
+        if self._request_semaphore is None or self._request_semaphore_loop is not loop:
+            self._request_semaphore = asyncio.Semaphore(MEXC_API_MAX_INFLIGHT)
+            self._request_semaphore_loop = loop
+        return self._request_semaphore
+    
+    def _detect_signal(self, pair: str, timeframe: str, klines: List[Dict]) -> Optional[VolumeSignal]:
+        """Поиск спайка объёма в свечах и учёт анализа в статистике"""
+        signal = self._detectors[timeframe].analyze_volume_spike(klines, pair, timeframe)
+        
+        self._analyses[pair, timeframe] += 1
+        self._pair_analyses[pair] += 1
+        self.total_analyses += 1
+        return signal
+    
+    def _record_signal(self, pair: str, timeframe: str, signal: VolumeSignal) -> None:
+        """Сохранение сигнала, уведомление и учёт в статистике"""
+        self._deliver_signal(signal)
+        self._update_signal_stats(pair, timeframe, signal)
+    
+    def _deliver_signal(self, signal: VolumeSignal) -> None:
+        """Сохранение сигнала в БД и отправка в Telegram (блокирующие вызовы)"""
+        self.signals_manager.save_signal(signal)
+        self.telegram_notifier.send_volume_signal(signal)
+    
+    def _update_signal_stats(self, pair: str, timeframe: str, signal: VolumeSignal) -> None:
+        """Учёт сигнала в статистике"""
+        key = (pair, timeframe)
+        self._signals[key] += 1
+        self._last_signal[key] = signal
+        self._pair_signals[pair] += 1
+        self.total_signals += 1
+    
+    def get_pair_statistics(self, pair: str) -> Dict:
+        """
+        Статистика анализа по паре
+        
+        Args:
+            pair: Торговая пара
+            
+        Returns:
+            Dict: Итоги по паре и разбивка по таймфреймам
+        """
+        return {
+            'analyses': self._pair_analyses[pair],
+            'signals': self._pair_signals[pair],
+            'timeframes': {
+                timeframe: {
+                    'analyses': self._analyses[pair, timeframe],
+                    'signals': self._signals[pair, timeframe],
+                    'last_signal': self._last_signal.get((pair, timeframe))
+                }
+                for timeframe in self.timeframes
+            }
+        }
+    
     def analyze_single_iteration(self) -> List[VolumeSignal]:
         """Выполнение одной итерации анализа"""
         all_signals = []
+        
+        # Свечи по всем парам/таймфреймам загружаются конкурентно одним пакетом
+        requests_list = [
+            (pair, timeframe, self._tf_limits[timeframe])
+            for pair in self.trading_pairs
+            for timeframe in self.timeframes
+        ]
+        klines_map = self.rest_client.get_klines_many(requests_list)
+        
         for pair in self.trading_pairs:
             for timeframe in self.timeframes:
-                signal = self.analyze_pair_timeframe(pair, timeframe)
+                klines = klines_map.get((pair, timeframe))
+                if not klines:
+                    # Причину (HTTP/разбор) клиент уже залогировал - отмечаем пропуск пары
+                    logger.warning(f"❌ Нет свечей для {pair} ({timeframe}), пара пропущена в этой итерации")
+                    continue
+                signal = self.analyze_pair_timeframe(pair, timeframe, klines)
                 if signal:
                     all_signals.append(signal)
         return all_signals
     
+    async def analyze_single_iteration_async(self) -> List[VolumeSignal]:
+        """
+        Асинхронная итерация анализа
+        
+        Все пары/таймфреймы обрабатываются конкурентно, число одновременных
+        REST-запросов ограничено MEXC_API_MAX_INFLIGHT.
+        """
+        tasks = [
+            asyncio.create_task(self.analyze_pair_timeframe_async(pair, timeframe))
+            for pair in self.trading_pairs
+            for timeframe in self.timeframes
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        all_signals = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Ошибка в задаче анализа: {result}")
+            elif result:
+                all_signals.append(result)
+        return all_signals
+    
     def run_single_analysis(self):
         """Одиночный анализ для тестирования"""
         return self.analyze_single_iteration()
     
-    def run_continuous_analysis(self, interval_seconds: int = 60):
-        """Непрерывный анализ (старая версия)"""
+    async def run_continuous_analysis_async(self, interval_seconds: int = 60):
+        """Непрерывный анализ в event loop: ожидание не блокирует другие задачи"""
         logger.info(f"🔄 Запуск непрерывного анализа с интервалом {interval_seconds} секунд")
         
         try:
@@ -821,14 +1222,25 @@ class MexcAnalysisBot:
             while True:
                 iteration += 1
                 logger.info(f"🔄 Итерация анализа #{iteration}")
-                self.analyze_single_iteration()
-                time.sleep(interval_seconds)
+                await self.analyze_single_iteration_async()
+                await asyncio.sleep(interval_seconds)
+        finally:
+            if 'rest_client' in self.__dict__:
+                await self.rest_client.close_async()
+    
+    def run_continuous_analysis(self, interval_seconds: int = 60):
+        """Непрерывный анализ (старая версия, синхронная точка входа)"""
+        try:
+            run_with_uvloop(self.run_continuous_analysis_async(interval_seconds))
         except KeyboardInterrupt:
             logger.info("⏹️ Остановка по Ctrl+C")
             self.stop()
     
     def stop(self):
         """Остановка"""
+        # Не создаём REST клиент только ради его закрытия
+        if 'rest_client' in self.__dict__:
+            self.rest_client.close()
         self.signals_manager.close()
         logger.info("👋 Бот остановлен")
 
@@ -872,7 +1284,7 @@ def main():
     """
     try:
         # Запуск асинхронной главной функции
-        asyncio.run(main_async())
+        run_with_uvloop(main_async())
         return 0
     except KeyboardInterrupt:
         logger.info("👋 Бот остановлен пользователем")
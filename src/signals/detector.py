@@ -67,35 +67,30 @@ class VolumeSpikeDetector:
             return None
         
         try:
-            # Извлекаем объёмы из свечей (поле 'q')
-            volumes = []
-            for kline in klines:
-                volume = float(kline.get('q', 0))
-                volumes.append(volume)
-            
             # Берём последнюю свечу для анализа
             current_kline = klines[-1]
-            current_volume = volumes[-1]
-            
-            # Рассчитываем средний объём за предыдущие свечи (исключая текущую)
-            analysis_volumes = volumes[-(self.window_size + 1):-1]  # Берём window_size свечей перед текущей
+            current_volume = float(current_kline.get('q', 0))
             
-            if len(analysis_volumes) < self.window_size:
-                # Если не хватает данных, берём все доступные (кроме текущей)
-                analysis_volumes = volumes[:-1]
+            # Средний объём за window_size свечей перед текущей (или за все доступные, если их меньше).
+            # Объёмы суммируются по индексам прямо из klines - без промежуточных списков и срезов
+            last = len(klines) - 1
+            start = max(0, last - self.window_size)
             
-            if not analysis_volumes:
+            if last == start:
                 logger.warning(f"Нет данных для расчёта среднего объёма {pair} ({timeframe})")
                 return None
             
-            average_volume = mean(analysis_volumes)
+            total_volume = 0.0
+            for i in range(start, last):
+                total_volume += float(klines[i].get('q', 0))
+            average_volume = total_volume / (last - start)
             
             # Проверяем, есть ли спайк
             if average_volume > 0:
                 spike_ratio = current_volume / average_volume
                 
-                logger.debug(f"Анализ объёма для {pair} ({timeframe}): текущий={current_volume:.2f}, "
-                           f"средний={average_volume:.2f}, коэффициент={spike_ratio:.2f}")
+                logger.debug("Анализ объёма для %s (%s): текущий=%.2f, средний=%.2f, коэффициент=%.2f",
+                             pair, timeframe, current_volume, average_volume, spike_ratio)
                 
                 if spike_ratio >= self.threshold:
                     # Обнаружен спайк объёма!
@@ -0,0 +1,45 @@
+"""
+Быстрая (де)сериализация JSON для ответов API MEXC
+Использует orjson, если он установлен, иначе стандартный модуль json
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson является необязательной зависимостью
+    orjson = None
+
+
+HAS_ORJSON = orjson is not None
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Разбор JSON из байтов или строки
+    
+    Args:
+        data: Тело ответа (bytes предпочтительнее - без лишнего декодирования)
+    
+    Returns:
+        Any: Разобранный объект
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """
+    Сериализация объекта в JSON-строку
+    
+    Args:
+        obj (Any): Объект для сериализации
+    
+    Returns:
+        str: JSON-строка
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
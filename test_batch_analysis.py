@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Регрессионные тесты волнового анализа пар (src/main.py)
+
+Проверяет:
+1. Пара с серией ошибок загрузки откладывается на 1, 2, 4... волны
+2. Успешный анализ сбрасывает счётчик ошибок, остальные пары не затрагиваются
+3. Ошибка детектора тоже считается ошибкой пары, свечи анализируются повторно
+4. Статус системы показывает число пар/таймфреймов и отложенных пар
+5. Legacy-бот: запись сигнала идёт в потоке, а счётчики сигналов - только в event loop
+6. Запись сигналов без сигналов не просыпается по таймауту и завершается по sentinel
+
+Запуск: python -m pytest -q test_batch_analysis.py
+"""
+
+import asyncio
+import threading
+from collections import Counter
+import sys
+import os
+
+import pytest
+
+# Добавляем путь к модулям
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import AsyncMexcAnalysisBot, MexcAnalysisBot
+
+
+def _klines(volume: float = 1.0, count: int = 50):
+    """Свечи без спайка объёма"""
+    return [{'t': index, 'o': 1, 'h': 1, 'l': 1, 'c': 1, 'q': volume} for index in range(count)]
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    """Бот без WebSocket с базой сигналов во временном каталоге"""
+    monkeypatch.chdir(tmp_path)
+    bot = AsyncMexcAnalysisBot(timeframes=["Min1"], enable_websocket=False)
+    try:
+        yield bot
+    finally:
+        bot.signals_manager.close()
+
+
+def _run_waves(bot, pairs, count, fail=("ERR_USDT",)):
+    """Несколько волн анализа; возвращает пары, запрошенные в каждой волне"""
+    requested = []
+
+    async def batch(requests, workers=None):
+        requested.append({pair for pair, _, _ in requests})
+        return [RuntimeError("boom") if pair in fail else _klines(volume=bot._analysis_wave)
+                for pair, _, _ in requests]
+
+    bot.async_client.get_klines_batch_async = batch
+
+    async def scenario():
+        for _ in range(count):
+            bot._analysis_wave += 1
+            await bot.analyze_timeframe_batch("Min1", pairs)
+
+    asyncio.run(scenario())
+    return requested
+
+
+def test_failing_pair_is_backed_off_exponentially(bot):
+    """После PAIR_MAX_ERRORS ошибок подряд пара пропускает всё больше волн"""
+    requested = _run_waves(bot, ["OK_USDT", "ERR_USDT"], 12)
+
+    err_waves = [wave for wave, pairs in enumerate(requested, 1) if "ERR_USDT" in pairs]
+    # 5 ошибок подряд -> пропуск 1 волны, 6-я -> 2 волны, 7-я -> 4 волны
+    assert err_waves == [1, 2, 3, 4, 5, 7, 10]
+    assert all("OK_USDT" in pairs for pairs in requested)
+    assert bot._errors["ERR_USDT", "Min1"] == 7
+    assert bot._analyses["OK_USDT", "Min1"] == 12
+
+    status = bot.get_system_status()
+    assert status['backed_off'] == 1
+
+
+def test_success_resets_backoff(bot):
+    """Пара, снова отдающая свечи, анализируется в каждой волне"""
+    bot.current_pairs = frozenset({"OK_USDT", "ERR_USDT"})
+    _run_waves(bot, ["OK_USDT", "ERR_USDT"], 5)
+    assert bot._pair_backoff["ERR_USDT", "Min1"][0] == 5
+
+    requested = _run_waves(bot, ["OK_USDT", "ERR_USDT"], 4, fail=())
+
+    assert [("ERR_USDT" in pairs) for pairs in requested] == [False, True, True, True]
+    assert not bot._pair_backoff
+    status = bot.get_system_status()
+    assert status['pair_timeframes'] == 2 and status['backed_off'] == 0
+
+
+def test_detector_error_counts_as_pair_failure(bot):
+    """Ошибка детектора учитывается и не запоминает свечи как уже проанализированные"""
+    detector = bot._get_detector("Min1")
+    original = detector.analyze_volume_spike
+
+    def failing(klines, pair, timeframe):
+        if pair == "BAD_USDT":
+            raise ValueError("bad candles")
+        return original(klines, pair, timeframe)
+
+    detector.analyze_volume_spike = failing
+    _run_waves(bot, ["OK_USDT", "BAD_USDT"], 2, fail=())
+
+    assert bot._errors["BAD_USDT", "Min1"] == 2
+    assert ("BAD_USDT", "Min1") not in bot._last_candles
+    assert bot._pair_backoff["BAD_USDT", "Min1"][0] == 2
+    assert ("OK_USDT", "Min1") not in bot._pair_backoff
+
+
+def test_signal_writer_waits_without_polling(bot):
+    """Простаивающая запись ждёт очередь, пакеты дописываются до остановки"""
+    bot.SIGNAL_BATCH_LINGER = 0.01
+    delivered = []
+    bot._deliver_signals = lambda signals: delivered.append(list(signals))
+    queue = bot._signal_queue
+    gets = []
+    original_get = queue.get
+    queue.get = lambda: gets.append(1) or original_get()
+
+    async def scenario():
+        bot._signal_writer_task = asyncio.create_task(bot._signal_writer())
+        await asyncio.sleep(0.3)
+        idle_gets = len(gets)
+
+        for index in range(3):
+            queue.put_nowait(f"signal-{index}")
+        await bot._stop_signal_writer()
+        await asyncio.wait_for(bot._signal_writer_task, 5)
+        return idle_gets
+
+    idle_gets = asyncio.run(scenario())
+
+    # При опросе по таймауту за 0.3 с было бы около 30 вызовов get()
+    assert idle_gets == 1
+    assert [signal for batch in delivered for signal in batch] == ["signal-0", "signal-1", "signal-2"]
+    assert queue.empty()
+
+
+class _ThreadRecordingCounter(Counter):
+    """Counter, запоминающий потоки, из которых его изменяли"""
+
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def __setitem__(self, key, value):
+        self.threads.add(threading.current_thread())
+        super().__setitem__(key, value)
+
+
+def test_legacy_signal_stats_are_updated_on_event_loop(tmp_path, monkeypatch):
+    """Параллельные analyze_pair_timeframe_async не меняют счётчики из рабочих потоков"""
+    monkeypatch.chdir(tmp_path)
+    bot = MexcAnalysisBot(pairs=["A_USDT"], timeframes=["Min1"])
+    delivered = []
+    bot._deliver_signal = lambda signal: delivered.append(threading.current_thread())
+    bot._signals = _ThreadRecordingCounter()
+    bot._pair_signals = _ThreadRecordingCounter()
+    pairs = [f"P{index}_USDT" for index in range(20)]
+    spike = _klines()[:-1] + [dict(_klines()[-1], q=1000.0)]
+
+    async def scenario():
+        loop_thread = threading.current_thread()
+        signals = await asyncio.gather(*(bot.analyze_pair_timeframe_async(pair, "Min1", spike)
+                                         for pair in pairs))
+        return loop_thread, signals
+
+    try:
+        loop_thread, signals = asyncio.run(scenario())
+    finally:
+        bot.signals_manager.close()
+
+    assert all(signals)
+    assert len(delivered) == len(pairs) and loop_thread not in delivered
+    assert bot._signals.threads == bot._pair_signals.threads == {loop_thread}
+    assert bot.total_signals == len(pairs)
+    assert sum(bot._pair_signals.values()) == len(pairs)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Регрессионные тесты кэша пар MexcPairsFetcher (src/data/pairs_fetcher.py)
+
+Проверяет:
+1. Пары, индексы и версия публикуются одним согласованным снимком
+2. При пересекающихся обновлениях результат более раннего запроса отбрасывается
+3. Ответ 304 Not Modified продлевает срок жизни снимка, не меняя данных и версии
+4. stop_auto_update останавливает пул фонового обновления и без автообновления
+
+Запуск: python -m pytest -q test_pairs_fetcher.py
+"""
+
+import threading
+import sys
+import os
+
+# Добавляем путь к модулям
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.data.pairs_fetcher import MexcPairsFetcher, NOT_MODIFIED
+
+
+def _response(*symbols: str) -> dict:
+    """Ответ /contract/detail с указанными контрактами"""
+    return {'success': True, 'data': [
+        {'symbol': symbol, 'baseCoin': symbol.split('_')[0], 'quoteCoin': 'USDT', 'minVol': index + 1}
+        for index, symbol in enumerate(symbols)
+    ]}
+
+
+def test_snapshot_is_consistent():
+    """Версия, множество пар и индексы относятся к одному обновлению"""
+    fetcher = MexcPairsFetcher()
+    responses = iter([_response("BTC_USDT", "ETH_USDT"), _response("BTC_USDT", "SOL_USDT")])
+    fetcher._fetch_symbols_from_api = lambda snapshot: (next(responses), '"v"', None)
+
+    assert fetcher.get_all_pairs() == ("BTC_USDT", "ETH_USDT")
+    assert fetcher.get_pairs_snapshot() == (1, frozenset({"BTC_USDT", "ETH_USDT"}))
+
+    assert fetcher.get_all_pairs(force_update=True) == ("BTC_USDT", "SOL_USDT")
+    version, pairs = fetcher.get_pairs_snapshot()
+    assert version == 2 and pairs == {"BTC_USDT", "SOL_USDT"}
+    assert fetcher.get_pairs_by_base_coin("SOL") == ("SOL_USDT",)
+    assert fetcher.get_pairs_by_base_coin("ETH") == ()
+    assert fetcher.filter_pairs_by_volume("2") == ("SOL_USDT",)
+    assert fetcher.get_pair_info("ETH_USDT") is None
+
+
+def test_outdated_refresh_result_is_dropped():
+    """Медленный ранний запрос не перезаписывает снимок более позднего"""
+    fetcher = MexcPairsFetcher()
+    slow_started = threading.Event()
+    release_slow = threading.Event()
+
+    def fetch(snapshot):
+        if threading.current_thread().name == "slow":
+            slow_started.set()
+            release_slow.wait(5)
+            return _response("OLD_USDT"), None, None
+        return _response("NEW_USDT"), None, None
+
+    fetcher._fetch_symbols_from_api = fetch
+
+    slow = threading.Thread(target=fetcher._update_cache, name="slow")
+    slow.start()
+    assert slow_started.wait(5)
+
+    assert fetcher._update_cache()
+    release_slow.set()
+    slow.join(5)
+
+    assert fetcher.get_all_pairs() == ("NEW_USDT",)
+    assert fetcher.get_pairs_snapshot() == (1, frozenset({"NEW_USDT"}))
+    assert fetcher.stats['outdated_results'] == 1
+
+
+def test_not_modified_keeps_data_and_refreshes_ttl():
+    """304 сохраняет данные, версию и валидаторы, обновляя только время снимка"""
+    fetcher = MexcPairsFetcher()
+    seen_etags = []
+    responses = iter([(_response("BTC_USDT"), '"v1"', None), (NOT_MODIFIED, '"v1"', None)])
+
+    def fetch(snapshot):
+        seen_etags.append(snapshot.etag)
+        return next(responses)
+
+    fetcher._fetch_symbols_from_api = fetch
+    fetcher.get_all_pairs()
+    first = fetcher._snapshot
+
+    assert fetcher._update_cache()
+    second = fetcher._snapshot
+
+    assert seen_etags == [None, '"v1"']
+    assert second is not first
+    assert second.pairs_info is first.pairs_info and second.version == first.version
+    assert second.etag == '"v1"' and second.updated_ts >= first.updated_ts
+    assert fetcher.stats['not_modified'] == 1
+
+
+def test_stop_auto_update_shuts_down_refresh_executor():
+    """Пул stale-while-revalidate закрывается, даже если автообновление не запускалось"""
+    fetcher = MexcPairsFetcher(update_interval=0)
+    refreshed = threading.Event()
+
+    def fetch(snapshot):
+        if snapshot.pairs:
+            refreshed.set()
+        return _response("BTC_USDT"), None, None
+
+    fetcher._fetch_symbols_from_api = fetch
+    fetcher.get_all_pairs()
+
+    # При update_interval=0 кэш сразу устаревает: обновление уходит в фоновый пул
+    assert fetcher.get_all_pairs() == ("BTC_USDT",)
+    assert refreshed.wait(5)
+    executor = fetcher._refresh_executor
+    assert executor is not None
+
+    fetcher.stop_auto_update()
+
+    assert fetcher._refresh_executor is None
+    assert executor._shutdown
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Регрессионные тесты синхронной пакетной загрузки свечей MexcRestClient
+
+Проверяет:
+1. get_klines_many переиспользует aiohttp сессию и keep-alive соединения между вызовами
+2. Вызов синхронной обёртки из работающего event loop явно запрещён
+3. close() останавливает фоновый event loop клиента
+4. fetch_klines_many идёт тем же путём, что и get_klines_many (ключи по паре)
+5. Сессии других event loop (asyncio.run в async-режиме) не утекают
+
+Запуск: python -m pytest -q test_rest_client.py
+"""
+
+import asyncio
+import gc
+import threading
+import warnings
+import sys
+import os
+
+import pytest
+from aiohttp import web
+
+# Добавляем путь к модулям
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.data.rest_client import MexcRestClient
+
+
+class _KlineServer:
+    """Локальный сервер /contract/kline в отдельном потоке, запоминает порты клиентов"""
+
+    def __init__(self):
+        self.peer_ports = set()
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._runner = None
+        self.port = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.peer_ports.add(request.transport.get_extra_info('peername')[1])
+        return web.json_response({'success': True, 'data': {
+            'time': [1, 2], 'open': [1, 1], 'high': [1, 1], 'low': [1, 1],
+            'close': [1, 1], 'vol': [10, 20]
+        }})
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_get('/api/v1/contract/kline/{pair}', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_until_complete(self._start())
+        self._ready.set()
+        self.loop.run_forever()
+
+    def __enter__(self):
+        self._thread.start()
+        self._ready.wait(10)
+        return self
+
+    def __exit__(self, *exc):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self.loop).result(10)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(10)
+
+
+def _background_session(client: MexcRestClient):
+    """aiohttp сессия фонового event loop клиента"""
+    return client._async_sessions[client._loop]
+
+
+@pytest.fixture
+def client_and_server():
+    with _KlineServer() as server:
+        client = MexcRestClient(rate_limit=1000, rate_burst=1000)
+        client.base_url = f"http://127.0.0.1:{server.port}/api/v1"
+        try:
+            yield client, server
+        finally:
+            client.close()
+
+
+def test_get_klines_many_reuses_session_between_calls(client_and_server):
+    """Второй пакет идёт по тем же keep-alive соединениям, что и первый"""
+    client, server = client_and_server
+    requests_list = [(f"P{i}_USDT", "Min1", 2) for i in range(3)]
+
+    first = client.get_klines_many(requests_list)
+    session = _background_session(client)
+    first_ports = set(server.peer_ports)
+
+    second = client.get_klines_many(requests_list)
+
+    assert set(first) == set(second) == {(pair, "Min1") for pair, _, _ in requests_list}
+    assert all(klines and klines[-1]['q'] == 20 for klines in second.values())
+    assert _background_session(client) is session and not session.closed
+    assert server.peer_ports == first_ports
+
+
+def test_fetch_klines_many_delegates_to_batch_path(client_and_server):
+    """fetch_klines_many использует тот же event loop и сессию, что и get_klines_many"""
+    client, _ = client_and_server
+    client.get_klines_many([("BTC_USDT", "Min1", 2)])
+    session = _background_session(client)
+
+    result = client.fetch_klines_many(["BTC_USDT", "ETH_USDT"], "Min5", 2)
+
+    assert set(result) == {"BTC_USDT", "ETH_USDT"}
+    assert all(klines and klines[0]['t'] == 1000 for klines in result.values())
+    assert _background_session(client) is session
+
+
+def test_get_klines_many_refuses_running_loop(client_and_server):
+    """Из корутины нужен get_klines_many_async, а не блокирующая обёртка"""
+    client, _ = client_and_server
+
+    async def call_sync_wrapper():
+        client.get_klines_many([("BTC_USDT", "Min1", 2)])
+
+    async def call_fetch_wrapper():
+        client.fetch_klines_many(["BTC_USDT"])
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(call_sync_wrapper())
+    with pytest.raises(RuntimeError):
+        asyncio.run(call_fetch_wrapper())
+
+
+def test_close_stops_background_loop(client_and_server):
+    """close() закрывает сессию и останавливает поток фонового loop"""
+    client, _ = client_and_server
+    client.get_klines_many([("BTC_USDT", "Min1", 2)])
+    thread, session = client._loop_thread, _background_session(client)
+
+    client.close()
+
+    assert not thread.is_alive()
+    assert session.closed
+    assert client._loop is None
+
+
+def test_sessions_of_other_loops_are_closed(client_and_server):
+    """Сессия завершившегося asyncio.run закрывается, а не подменяется с утечкой"""
+    client, _ = client_and_server
+
+    async def legacy_call():
+        return await client.get_klines_async("BTC_USDT", "Min1", 2)
+
+    assert asyncio.run(legacy_call())
+    legacy_session = next(iter(client._async_sessions.values()))
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        client.get_klines_many([("BTC_USDT", "Min1", 2)])
+        assert legacy_session.closed
+        assert list(client._async_sessions) == [client._loop]
+
+        # Сессия ещё одного asyncio.run закрывается в close()
+        asyncio.run(legacy_call())
+        sessions = list(client._async_sessions.values())
+        client.close()
+        del legacy_session
+        gc.collect()
+
+    assert len(sessions) == 2 and all(session.closed for session in sessions)
+    assert not client._async_sessions
+    assert not [w for w in caught if "Unclosed" in str(w.message)]
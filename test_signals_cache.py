@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Регрессионные тесты write-back кэша сигналов (src/data/database.py)
+
+Проверяет:
+1. Ключи дедупликации запоминаются только после успешной записи пакета
+2. Дубликаты внутри буфера и среди уже записанных сигналов отбрасываются
+3. SIGTERM во время сброса буфера не подвешивает процесс и не теряет сигналы
+4. Фильтры get_signals по таймфрейму и статусу идут по индексу, а не полным сканом
+
+Запуск: python -m pytest -q test_signals_cache.py
+"""
+
+import signal
+import sqlite3
+import subprocess
+import sys
+import os
+import textwrap
+
+import pytest
+
+# Добавляем путь к модулям
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.data.database import SignalsDatabase, SignalsCache
+from src.signals.detector import VolumeSignal
+
+
+def _make_signal(timestamp: int, pair: str = "BTC_USDT") -> VolumeSignal:
+    """Тестовый сигнал"""
+    return VolumeSignal(timestamp=timestamp, pair=pair, timeframe="Min1",
+                        current_volume=300.0, average_volume=100.0, spike_ratio=3.0,
+                        price=1.0, message="test")
+
+
+def _make_cache(tmp_path):
+    """Кэш без фонового потока сброса поверх временной БД"""
+    database = SignalsDatabase({"type": "sqlite", "path": str(tmp_path / "signals.db")})
+    cache = SignalsCache(database, {"enable_cache": True, "buffer_size": 1000,
+                                    "flush_interval": 3600, "batch_size": 50})
+    return database, cache
+
+
+def _count_rows(database: SignalsDatabase) -> int:
+    return database.connection.execute("SELECT COUNT(*) FROM signals").fetchone()[0]
+
+
+def test_failed_flush_does_not_mark_signals_as_duplicates(tmp_path):
+    """Сигнал из неудачного пакета принимается при повторной отправке"""
+    database, cache = _make_cache(tmp_path)
+    original_write = database._write_rows
+    calls = []
+
+    def failing_once(rows, raise_errors=False):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        return original_write(rows, raise_errors)
+
+    database._write_rows = failing_once
+    try:
+        cache.add_signal(_make_signal(1))
+        cache.flush_buffer()
+        assert _count_rows(database) == 0
+
+        # Повтор того же сигнала не должен отсекаться как дубликат
+        cache.add_signal(_make_signal(1))
+        cache.flush_buffer()
+        assert _count_rows(database) == 1
+    finally:
+        cache.close()
+        database.close()
+
+
+def test_duplicates_are_dropped_after_successful_flush(tmp_path):
+    """Дубликаты в буфере и уже записанные сигналы не доходят до INSERT"""
+    database, cache = _make_cache(tmp_path)
+    try:
+        cache.add_signals([_make_signal(1), _make_signal(1), _make_signal(2)])
+        cache.flush_buffer()
+        assert _count_rows(database) == 2
+
+        written = []
+        original_write = database._write_rows
+        database._write_rows = lambda rows, raise_errors=False: written.append(len(rows)) or original_write(rows, raise_errors)
+
+        cache.add_signals([_make_signal(2), _make_signal(3)])
+        cache.flush_buffer()
+        assert written == [1]
+        assert _count_rows(database) == 3
+    finally:
+        cache.close()
+        database.close()
+
+
+@pytest.mark.parametrize("column, value, index", [
+    ("pair", "BTC_USDT", "idx_signals_query"),
+    ("timeframe", "Min1", "idx_signals_timeframe"),
+    ("status", "new", "idx_signals_status"),
+])
+def test_get_signals_filters_use_indexes(tmp_path, column, value, index):
+    """Фильтр без пары не должен сканировать таблицу по idx_signals_timestamp"""
+    database = SignalsDatabase({"type": "sqlite", "path": str(tmp_path / "signals.db")})
+    try:
+        plan = [row[3] for row in database.connection.execute(
+            f"EXPLAIN QUERY PLAN SELECT * FROM signals WHERE {column} = ? "
+            f"ORDER BY timestamp DESC LIMIT ?", (value, 100))]
+        assert any(f"USING INDEX {index} " in step for step in plan), plan
+    finally:
+        database.close()
+
+
+# Дочерний процесс: SIGTERM приходит, пока главный поток сбрасывает буфер
+# (mode=flush) или просто держит buffer_lock (mode=lock)
+_SIGTERM_SCRIPT = textwrap.dedent("""
+    import os, signal, sys
+    sys.path.insert(0, {root!r})
+    from src.data.database import SignalsDatabase, SignalsCache
+    from src.signals.detector import VolumeSignal
+
+    database = SignalsDatabase({{"type": "sqlite", "path": {path!r}}})
+    cache = SignalsCache(database, {{"enable_cache": True, "buffer_size": 1000,
+                                    "flush_interval": 3600, "batch_size": 2}})
+    cache.add_signals([VolumeSignal(ts, "BTC_USDT", "Min1", 300.0, 100.0, 3.0, 1.0, "test")
+                       for ts in range(5)])
+
+    if {mode!r} == "flush":
+        original_write = database._write_rows
+        def write_and_terminate(rows, raise_errors=False):
+            # Пакет записан, но SIGTERM приходит до возврата из записи - посреди сброса
+            database._write_rows = original_write
+            original_write(rows, raise_errors)
+            os.kill(os.getpid(), signal.SIGTERM)
+        database._write_rows = write_and_terminate
+        cache.flush_buffer()
+    else:
+        with cache.buffer_lock:
+            os.kill(os.getpid(), signal.SIGTERM)
+            signal.pause()
+""")
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGTERM") or sys.platform == "win32",
+                    reason="нужна POSIX-доставка SIGTERM")
+@pytest.mark.parametrize("mode", ["flush", "lock"])
+def test_sigterm_during_flush_exits_and_keeps_signals(tmp_path, mode):
+    """SIGTERM посреди сброса: процесс завершается, atexit дописывает все сигналы"""
+    db_path = str(tmp_path / "signals.db")
+    script = _SIGTERM_SCRIPT.format(root=os.path.dirname(os.path.abspath(__file__)),
+                                    path=db_path, mode=mode)
+
+    # До исправления обработчик брал buffer_lock повторно и процесс зависал
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, timeout=30)
+
+    assert result.returncode == 128 + signal.SIGTERM, result.stderr.decode(errors="replace")
+    with sqlite3.connect(db_path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM signals").fetchone()[0] == 5
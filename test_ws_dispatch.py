@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Регрессионные тесты диспетчеризации WebSocket сообщений бота (src/main.py)
+
+Проверяет:
+1. Каналы kline, ticker и deals попадают в свои обработчики
+2. Неизвестные каналы игнорируются и кэшируются как каналы без обработчика
+3. Real-time статистика ведётся по настроенным таймфреймам, а не по интервалам WebSocket
+4. Интервалы, для которых таймфрейм не настроен, в статистику не попадают
+
+Запуск: python -m pytest -q test_ws_dispatch.py
+"""
+
+import asyncio
+import sys
+import os
+
+import pytest
+
+# Добавляем путь к модулям
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.main import AsyncMexcAnalysisBot
+from src.data.ws_client import WSMessage
+
+
+def _message(channel: str, symbol: str = "BTC_USDT", data: dict = None) -> WSMessage:
+    """Тестовое WebSocket сообщение"""
+    return WSMessage(channel=channel, symbol=symbol, data=data or {"v": 10, "c": 1}, raw=b"")
+
+
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    """Бот без WebSocket с базой сигналов во временном каталоге"""
+    monkeypatch.chdir(tmp_path)
+    bot = AsyncMexcAnalysisBot(timeframes=["Min1", "Hour1"], enable_websocket=False)
+    bot.real_time_analysis_enabled = True
+    try:
+        yield bot
+    finally:
+        bot.signals_manager.close()
+
+
+def test_channels_are_routed_to_handlers(bot):
+    """Каждый вид канала вызывает свой обработчик ровно один раз"""
+    calls = []
+    for kind in ("kline", "ticker", "deals"):
+        async def record(message, kind=kind):
+            calls.append((kind, message.channel))
+        bot._ws_kind_handlers[kind] = record
+
+    channels = {
+        "kline": "spot@public.market.kline.Min1.BTCUSDT",
+        "ticker": "spot@public.market.ticker.v3.BTCUSDT",
+        "deals": "spot@public.market.deals.v3.BTCUSDT",
+    }
+
+    async def scenario():
+        for channel in channels.values():
+            await bot._handle_websocket_message(_message(channel))
+
+    asyncio.run(scenario())
+
+    assert calls == [(kind, channel) for kind, channel in channels.items()]
+    assert bot.total_realtime_messages == 3
+
+
+def test_unknown_channel_is_ignored_and_cached(bot):
+    """Канал без обработчика не ломает диспетчеризацию и не разбирается повторно"""
+    resolved = []
+    original_resolve = bot._resolve_ws_handler
+    bot._resolve_ws_handler = lambda channel: resolved.append(channel) or original_resolve(channel)
+    channel = "spot@public.market.depth.v3.BTCUSDT"
+
+    async def scenario():
+        await bot._handle_websocket_message(_message(channel))
+        await bot._handle_websocket_message(_message(channel))
+
+    asyncio.run(scenario())
+
+    assert resolved == [channel]
+    assert channel in bot._ws_channel_handlers and bot._ws_channel_handlers[channel] is None
+    assert not bot._realtime_messages
+
+
+def test_realtime_stats_use_configured_timeframes(bot):
+    """Kline-сообщения учитываются под именами таймфреймов из self.timeframes"""
+
+    async def scenario():
+        await bot._handle_websocket_message(_message("spot@public.market.kline.Min1.BTCUSDT"))
+        # Часовой интервал WebSocket соответствует настроенному таймфрейму Hour1
+        await bot._handle_websocket_message(_message("spot@public.market.kline.Min60.BTCUSDT"))
+        await bot._handle_websocket_message(_message("spot@public.market.kline.Min60.BTCUSDT"))
+        # Min5 не настроен - статистика не заводит для него отдельный ключ
+        await bot._handle_websocket_message(_message("spot@public.market.kline.Min5.BTCUSDT"))
+
+    asyncio.run(scenario())
+
+    stats = bot.get_pair_statistics("BTC_USDT")
+    assert stats["Min1"]["realtime_messages"] == 1
+    assert stats["Hour1"]["realtime_messages"] == 2
+    assert set(bot._realtime_messages) == {("BTC_USDT", "Min1"), ("BTC_USDT", "Hour1")}
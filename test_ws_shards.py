@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Регрессионные тесты жизненного цикла шардов WebSocket клиента (src/data/ws_client.py)
+
+Проверяет:
+1. Клиент с shards > 0 запускает подключения в потоках-шардах и останавливается:
+   потоки завершаются, незавершённых задач в циклах шардов не остаётся
+2. Остановка шарда не блокирует основной event loop
+
+Запуск: python -m pytest -q test_ws_shards.py
+"""
+
+import asyncio
+import logging
+import time
+import sys
+import os
+
+from aiohttp import web
+
+# Добавляем путь к модулям
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.data.ws_client import MexcWebSocketClient, _LoopShard
+
+
+class _StaticPairs:
+    """Фетчер с фиксированным списком пар"""
+
+    def __init__(self, count: int):
+        self.pairs = [f"P{i}_USDT" for i in range(count)]
+
+    def get_all_pairs(self):
+        return self.pairs
+
+
+async def _ws_handler(request: web.Request) -> web.WebSocketResponse:
+    """Сервер отвечает на подписки и шлёт тикеры, пока соединение открыто"""
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+
+    async def push():
+        while not ws.closed:
+            await ws.send_json({"c": "spot@public.market.ticker.v3.P0USDT", "d": {"p": 1}})
+            await asyncio.sleep(0.01)
+
+    pusher = asyncio.create_task(push())
+    try:
+        async for _ in ws:
+            await ws.send_json({"id": 0, "code": 0, "msg": "ok"})
+    finally:
+        pusher.cancel()
+    return ws
+
+
+async def _start_server():
+    app = web.Application()
+    app.router.add_get('/ws', _ws_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+def test_sharded_client_start_stop(monkeypatch, caplog):
+    """Подключения работают в шардах, stop() завершает потоки без висящих задач"""
+
+    async def scenario():
+        runner, port = await _start_server()
+        monkeypatch.setattr(MexcWebSocketClient, "WS_BASE_URL", f"ws://127.0.0.1:{port}/ws")
+        received = []
+        client = MexcWebSocketClient(pairs_fetcher=_StaticPairs(150), event_handler=received.append,
+                                     shards=2)
+        start_task = asyncio.create_task(client.start())
+        try:
+            await asyncio.wait_for(client.ready_event.wait(), 10)
+            await asyncio.sleep(0.3)
+
+            shards = list(client._shards)
+            assert len(shards) == 2
+            assert all(shard.thread.is_alive() for shard in shards)
+            assert len(client.connections) >= 2
+            assert {connection.shard for connection in client.connections.values()} == set(shards)
+            assert received, "сообщения из шардов должны доходить до обработчика"
+
+            await client.stop()
+            await asyncio.wait_for(start_task, 10)
+
+            assert not client._shards
+            assert not any(shard.thread.is_alive() for shard in shards)
+            assert all(shard.loop.is_closed() for shard in shards)
+        finally:
+            if not start_task.done():
+                start_task.cancel()
+            await runner.cleanup()
+
+    with caplog.at_level(logging.ERROR, logger="asyncio"):
+        asyncio.run(scenario())
+
+    assert not [record for record in caplog.records
+                if "Task was destroyed but it is pending" in record.getMessage()]
+
+
+def test_shard_stop_does_not_block_event_loop():
+    """Пока поток шарда завершается, основной цикл продолжает работу"""
+
+    async def slow_on_cancel():
+        try:
+            await asyncio.sleep(3600)
+        finally:
+            time.sleep(0.3)  # Блокирующая очистка в потоке шарда
+
+    async def scenario():
+        shard = _LoopShard(0)
+        shard.start()
+        task = shard.submit(slow_on_cancel())
+        await asyncio.sleep(0.05)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        await shard.stop()
+        ticker_task.cancel()
+
+        assert task.cancelled()
+        assert not shard.thread.is_alive()
+        # При синхронном join цикл стоял бы все 0.3 с и тиков бы не было
+        assert ticks >= 5
+
+    asyncio.run(scenario())